@@ -1,25 +1,66 @@
-from fastapi import FastAPI, Request, HTTPException
-from fastapi.staticfiles import StaticFiles
-from fastapi.templating import Jinja2Templates
+from fastapi import FastAPI, Request
 from fastapi.responses import RedirectResponse, HTMLResponse
 from starlette.middleware.sessions import SessionMiddleware
+from contextlib import asynccontextmanager
 import uvicorn
 from src.rotas.rt_login import router as login_router
 from src.rotas.rt_chamado import router as chamado_router
+from src.rotas.rt_metricas import router as metricas_router
+from src.rotas.rt_api import router as api_router
 from src.modulos.logger import logger
+from src.modulos.http_client import iniciar_cliente_http, fechar_cliente_http
+from src.modulos.jobs import gerenciador_jobs
+from src.modulos.registro_lotes import registro_lotes
+from src.modulos.idempotencia import registro_idempotencia
+from src.modulos.pool_processos import pool_processos
+from src.modulos.token_google import chaves_google
+from src.modulos.metricas import MiddlewareMetricas
+from src.modulos.correlacao import MiddlewareCorrelacao
+from src.modulos.compressao import MiddlewareCompressao
+from src.modulos.estaticos import arquivos_estaticos
 
-app = FastAPI(title="Login Google", version="1.0.0")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Inicializa e encerra os recursos compartilhados da aplicação"""
+    await iniciar_cliente_http()
+    # Lotes que estavam em execução quando a aplicação parou podem ser retomados
+    registro_lotes.marcar_interrompidos()
+    # Remoção periódica dos chamados registrados fora da janela de idempotência
+    registro_idempotencia.iniciar_limpeza()
+    pool_processos.iniciar()
+    # Chaves de assinatura do Google já em cache para o primeiro login
+    chaves_google.renovar_em_segundo_plano()
+    yield
+    await gerenciador_jobs.encerrar()
+    await registro_idempotencia.encerrar()
+    pool_processos.encerrar()
+    await fechar_cliente_http()
+
+
+app = FastAPI(title="Login Google", version="1.0.0", lifespan=lifespan)
 
 # Configurar sessões
 app.add_middleware(SessionMiddleware, secret_key="sua-chave-secreta-aqui-altere-em-producao")
 
-# Montar arquivos estáticos e templates
-app.mount("/static", StaticFiles(directory="src/static"), name="static")
-templates = Jinja2Templates(directory="src/templates")
+# Métricas de latência e erros por rota (expostas em /metrics)
+app.add_middleware(MiddlewareMetricas)
+
+# ID de correlação de cada requisição (cabeçalho X-Request-ID e logs)
+app.add_middleware(MiddlewareCorrelacao)
+
+# Compressão gzip/brotli das respostas a partir de COMPRESSAO_TAMANHO_MINIMO bytes
+app.add_middleware(MiddlewareCompressao)
+
+# Montar arquivos estáticos (nomes com hash do conteúdo e variantes
+# comprimidas, ver estaticos.py); os templates ficam em paginas.py
+app.mount("/static", arquivos_estaticos, name="static")
 
 # Incluir rotas
 app.include_router(login_router)
 app.include_router(chamado_router)
+app.include_router(metricas_router)
+app.include_router(api_router)
 
 # Configurações do Google OAuth agora são carregadas diretamente de ConfigEnvSetings nas rotas
 # Não é mais necessário armazenar no app.state
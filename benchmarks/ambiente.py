@@ -0,0 +1,31 @@
+"""
+Configuração mínima para importar os módulos da aplicação fora do servidor
+(benchmarks executados no mesmo processo). Deve ser chamada antes de qualquer
+import de `src`, pois a configuração é lida na importação.
+"""
+import os
+import sys
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Variáveis obrigatórias do ConfigEnv que os benchmarks não utilizam
+_OBRIGATORIAS = (
+    'GOOGLE_CLIENT_ID', 'GOOGLE_CLIENT_PROJECT_ID', 'GOOGLE_AUTH_URI', 'GOOGLE_TOKEN_URI',
+    'GOOGLE_AUTH_PROVIDER_X509_CERT_URL', 'GOOGLE_REDIRECT_URIS', 'GOOGLE_CLIENT_SECRET',
+    'API_ENDPOINT_FUNCIONARIO', 'API_ENDPOINT_CHAMADO', 'API_KEY', 'API_NAME',
+)
+
+
+def configurar_ambiente(**variaveis: str):
+    """
+    Define as variáveis informadas, preenche as obrigatórias ausentes e
+    disponibiliza o pacote `src` para import.
+
+    Args:
+        **variaveis: Variáveis de ambiente da aplicação (sobrescrevem as existentes)
+    """
+    os.environ.update(variaveis)
+    for variavel in _OBRIGATORIAS:
+        os.environ.setdefault(variavel, 'benchmark')
+    if RAIZ not in sys.path:
+        sys.path.insert(0, RAIZ)
@@ -0,0 +1,349 @@
+"""
+Testes de carga de ponta a ponta: sobe o servidor simulado das APIs externas
+(benchmarks/servidor_simulado.py) e a aplicação apontada para ele, executa
+os cenários com usuários simultâneos e reporta a latência p50/p95/p99 e a
+vazão de cada um.
+
+Cenários:
+    login       Login OAuth de N usuários simultâneos (id_token verificado localmente;
+                com --sem-id-token, consulta /userinfo)
+    pagina      GET /chamado (dados do funcionário + template)
+    unitario    Chamados individuais (POST /chamado sem planilha)
+    preview     Rajada de prévias paginadas sobre a planilha em cache
+    lote        Lotes de 1k e 10k linhas (CSV) acompanhados até a conclusão
+
+Uso (a partir da raiz do projeto):
+    python benchmarks/carga.py
+    python benchmarks/carga.py --cenarios preview,lote --usuarios 50 --latencia-ms 30 --taxa-erro 0.01
+    python benchmarks/carga.py --envio-agrupado --linhas-lote 10000 --json resultado.json
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from typing import Dict, List, Optional
+import httpx
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CENARIOS = ('login', 'pagina', 'unitario', 'preview', 'lote')
+_PADRAO_JOB_ID = re.compile(r'data-job-id="([^"]+)"')
+
+
+def percentil(valores: List[float], p: float) -> float:
+    """Percentil pelo método do posto mais próximo (valores em qualquer ordem)."""
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    return ordenados[max(0, math.ceil(p / 100 * len(ordenados)) - 1)]
+
+
+class Medicoes:
+    """Latências e erros de um cenário."""
+
+    def __init__(self, nome: str):
+        self.nome = nome
+        self.latencias: List[float] = []
+        self.erros = 0
+        self.chamados = 0
+        self.inicio = time.perf_counter()
+        self.segundos = 0.0
+
+    async def medir(self, requisicao, validar=None) -> Optional[httpx.Response]:
+        """
+        Executa e cronometra uma requisição.
+
+        Args:
+            requisicao: Corrotina da requisição (httpx)
+            validar: Função que recebe a resposta e indica se ela é um sucesso
+                (padrão: status < 400)
+        """
+        inicio = time.perf_counter()
+        try:
+            resposta = await requisicao
+        except httpx.HTTPError:
+            self.erros += 1
+            return None
+        self.latencias.append(time.perf_counter() - inicio)
+        if not (validar(resposta) if validar else resposta.status_code < 400):
+            self.erros += 1
+        return resposta
+
+    def concluir(self) -> 'Medicoes':
+        self.segundos = time.perf_counter() - self.inicio
+        return self
+
+    def resumo(self) -> Dict:
+        requisicoes = len(self.latencias)
+        return {
+            'cenario': self.nome,
+            'requisicoes': requisicoes,
+            'erros': self.erros,
+            'p50_ms': round(percentil(self.latencias, 50) * 1000, 1),
+            'p95_ms': round(percentil(self.latencias, 95) * 1000, 1),
+            'p99_ms': round(percentil(self.latencias, 99) * 1000, 1),
+            'requisicoes_por_segundo': round(requisicoes / self.segundos, 1) if self.segundos else 0.0,
+            'chamados_por_segundo': round(self.chamados / self.segundos, 1) if self.chamados and self.segundos else None,
+            'segundos': round(self.segundos, 2),
+        }
+
+
+def gerar_csv(linhas: int, execucao: str) -> bytes:
+    conteudo = ['codigo,descricao']
+    conteudo.extend(f'{execucao}-{linha},Valor da linha {linha}' for linha in range(1, linhas + 1))
+    return ('\n'.join(conteudo) + '\n').encode()
+
+
+def sucesso_html(resposta: httpx.Response) -> bool:
+    return resposta.status_code == 200 and 'flash error' not in resposta.text
+
+
+async def aguardar_servidor(url: str, segundos: float = 30.0):
+    limite = time.monotonic() + segundos
+    async with httpx.AsyncClient() as cliente:
+        while time.monotonic() < limite:
+            try:
+                await cliente.get(url)
+                return
+            except httpx.TransportError:
+                await asyncio.sleep(0.2)
+    raise RuntimeError(f"Servidor não respondeu em {segundos:.0f}s: {url}")
+
+
+class Carga:
+    def __init__(self, argumentos):
+        self.argumentos = argumentos
+        self.url_app = f'http://127.0.0.1:{argumentos.porta_app}'
+        self.execucao = uuid.uuid4().hex[:8]
+        self.usuarios: List[httpx.AsyncClient] = []
+        # Banco local e saída (logs) da aplicação durante o teste
+        self.diretorio = tempfile.mkdtemp(prefix='carga-')
+
+    # Processos
+
+    def iniciar_processos(self) -> List[subprocess.Popen]:
+        argumentos = self.argumentos
+        url_simulado = f'http://127.0.0.1:{argumentos.porta_simulado}'
+        simulado = subprocess.Popen([
+            sys.executable, os.path.join(RAIZ, 'benchmarks', 'servidor_simulado.py'),
+            '--porta', str(argumentos.porta_simulado),
+            '--latencia-ms', str(argumentos.latencia_ms),
+            '--latencia-item-ms', str(argumentos.latencia_item_ms),
+            '--taxa-erro', str(argumentos.taxa_erro),
+        ] + (['--sem-id-token'] if argumentos.sem_id_token else []), cwd=RAIZ)
+
+        ambiente = dict(os.environ)
+        ambiente.update({
+            'GOOGLE_CLIENT_ID': 'carga', 'GOOGLE_CLIENT_PROJECT_ID': 'carga', 'GOOGLE_CLIENT_SECRET': 'carga',
+            'GOOGLE_AUTH_URI': f'{url_simulado}/auth',
+            'GOOGLE_TOKEN_URI': f'{url_simulado}/token',
+            'GOOGLE_USERINFO_URI': f'{url_simulado}/userinfo',
+            'GOOGLE_AUTH_PROVIDER_X509_CERT_URL': f'{url_simulado}/certs',
+            'GOOGLE_REDIRECT_URIS': f'{self.url_app}/login/google/callback',
+            'API_ENDPOINT_FUNCIONARIO': f'{url_simulado}/funcionario',
+            'API_ENDPOINT_CHAMADO': f'{url_simulado}/chamado',
+            'API_ENDPOINT_CHAMADO_LOTE': f'{url_simulado}/chamado/lote' if argumentos.envio_agrupado else '',
+            'API_KEY': 'carga', 'API_NAME': 'X-API-Key',
+            'LOTE_REQUISICOES_POR_SEGUNDO': '0',
+            'BANCO_LOCAL_CAMINHO': os.path.join(self.diretorio, 'carga.db'),
+            'LOG_NIVEL': 'WARNING',
+        })
+        self.saida_app = open(os.path.join(self.diretorio, 'app.log'), 'w')
+        for par in argumentos.env:
+            chave, _, valor = par.partition('=')
+            ambiente[chave] = valor
+        app = subprocess.Popen([
+            sys.executable, '-m', 'uvicorn', 'app:app',
+            '--host', '127.0.0.1', '--port', str(argumentos.porta_app),
+            '--log-level', 'warning', '--no-access-log',
+        ], cwd=RAIZ, env=ambiente, stdout=self.saida_app, stderr=subprocess.STDOUT)
+        return [simulado, app]
+
+    async def entrar(self, medicoes: Medicoes):
+        """Cria os usuários virtuais e faz o login de todos ao mesmo tempo."""
+        async def entrar_usuario(indice: int):
+            cliente = httpx.AsyncClient(base_url=self.url_app, timeout=120)
+            self.usuarios.append(cliente)
+            await medicoes.medir(
+                cliente.get('/login/google/callback', params={'code': f'carga{indice}@uisa.com.br'}),
+                lambda resposta: resposta.status_code == 303
+            )
+
+        await asyncio.gather(*[entrar_usuario(indice) for indice in range(self.argumentos.usuarios)])
+
+    async def por_usuario(self, tarefa):
+        await asyncio.gather(*[tarefa(indice, cliente) for indice, cliente in enumerate(self.usuarios)])
+
+    # Cenários
+
+    async def cenario_pagina(self) -> List[Medicoes]:
+        medicoes = Medicoes('pagina')
+
+        async def tarefa(_, cliente):
+            for _ in range(self.argumentos.requisicoes):
+                await medicoes.medir(cliente.get('/chamado'), sucesso_html)
+
+        await self.por_usuario(tarefa)
+        return [medicoes.concluir()]
+
+    async def cenario_unitario(self) -> List[Medicoes]:
+        medicoes = Medicoes('unitario')
+
+        async def tarefa(indice, cliente):
+            for requisicao in range(self.argumentos.requisicoes):
+                resposta = await medicoes.medir(cliente.post('/chamado', data={
+                    'ds_titulo': f'Carga {self.execucao} {indice}-{requisicao}',
+                    'ds_chamado': 'Chamado de teste de carga',
+                }), sucesso_html)
+                if resposta is not None and sucesso_html(resposta):
+                    medicoes.chamados += 1
+
+        await self.por_usuario(tarefa)
+        return [medicoes.concluir()]
+
+    async def cenario_preview(self) -> List[Medicoes]:
+        linhas = self.argumentos.linhas_preview
+        conteudo = gerar_csv(linhas, self.execucao)
+        carregamento = Medicoes('preview_carregar_planilha')
+        medicoes = Medicoes('preview')
+
+        async def tarefa(indice, cliente):
+            # Todos enviam o mesmo arquivo: só o primeiro é processado, os demais usam o cache
+            await carregamento.medir(cliente.post(
+                '/chamado/carregar-planilha',
+                files={'planilha': ('carga.csv', conteudo, 'text/csv')}
+            ))
+            for requisicao in range(self.argumentos.requisicoes):
+                offset = (indice * 997 + requisicao * 131) % max(linhas - 20, 1)
+                await medicoes.medir(cliente.post('/chamado/preview', json={
+                    'titulo': 'Chamado <A>',
+                    'descricao': '<B> (linha <A>)',
+                    'offset': offset,
+                    'limit': 20,
+                }))
+
+        await self.por_usuario(tarefa)
+        return [carregamento.concluir(), medicoes.concluir()]
+
+    async def cenario_lote(self) -> List[Medicoes]:
+        resultados = []
+        cliente = self.usuarios[0]
+        for linhas in self.argumentos.linhas_lote:
+            medicoes = Medicoes(f'lote_{linhas}')
+            resposta = await medicoes.medir(cliente.post(
+                '/chamado/carregar-planilha',
+                files={'planilha': (f'lote_{linhas}.csv', gerar_csv(linhas, f'{self.execucao}-{linhas}'), 'text/csv')}
+            ))
+            if resposta is None or resposta.status_code >= 400:
+                resultados.append(medicoes.concluir())
+                continue
+
+            resposta = await medicoes.medir(cliente.post('/chamado', data={
+                'ds_titulo': 'Carga <A>',
+                'ds_chamado': '<B>',
+                'dataset_id': resposta.json()['dataset_id'],
+                'qtd_chamados': str(linhas),
+            }), sucesso_html)
+            encontrado = _PADRAO_JOB_ID.search(resposta.text) if resposta is not None else None
+            if encontrado is None:
+                resultados.append(medicoes.concluir())
+                continue
+
+            while True:
+                await asyncio.sleep(0.2)
+                resposta = await medicoes.medir(cliente.get(f'/chamado/lote/{encontrado.group(1)}'))
+                if resposta is not None and resposta.json().get('status') in ('concluido', 'erro'):
+                    estado = resposta.json()
+                    medicoes.chamados = estado.get('sucessos', 0)
+                    medicoes.erros += estado.get('erros', 0)
+                    break
+            resultados.append(medicoes.concluir())
+        return resultados
+
+    async def executar(self) -> List[Dict]:
+        await aguardar_servidor(f'{self.url_app}/login')
+        resumos = []
+        try:
+            login = Medicoes('login')
+            await self.entrar(login)
+            if 'login' in self.argumentos.cenarios:
+                resumos.append(login.concluir().resumo())
+                imprimir_linha(resumos[-1])
+            for cenario in self.argumentos.cenarios:
+                if cenario == 'login':
+                    continue
+                for medicoes in await getattr(self, f'cenario_{cenario}')():
+                    resumos.append(medicoes.resumo())
+                    imprimir_linha(resumos[-1])
+        finally:
+            await asyncio.gather(*[cliente.aclose() for cliente in self.usuarios])
+        return resumos
+
+
+COLUNAS = (
+    ('cenario', 26), ('requisicoes', 11), ('erros', 7), ('p50_ms', 9), ('p95_ms', 9),
+    ('p99_ms', 9), ('requisicoes_por_segundo', 10), ('chamados_por_segundo', 12), ('segundos', 9)
+)
+TITULOS = {'requisicoes_por_segundo': 'req/s', 'chamados_por_segundo': 'chamados/s', 'requisicoes': 'req'}
+
+
+def imprimir_linha(resumo: Dict):
+    print(''.join(
+        str('-' if resumo[chave] is None else resumo[chave]).ljust(largura)
+        for chave, largura in COLUNAS
+    ), flush=True)
+
+
+def principal():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--cenarios', default=','.join(CENARIOS), help=f"Lista separada por vírgula: {','.join(CENARIOS)}")
+    parser.add_argument('--usuarios', type=int, default=20, help="Usuários simultâneos")
+    parser.add_argument('--requisicoes', type=int, default=20, help="Requisições por usuário em cada cenário")
+    parser.add_argument('--linhas-lote', default='1000,10000', help="Tamanhos dos lotes (linhas)")
+    parser.add_argument('--linhas-preview', type=int, default=10000, help="Linhas da planilha usada nas prévias")
+    parser.add_argument('--latencia-ms', type=float, default=20.0, help="Latência das APIs simuladas")
+    parser.add_argument('--latencia-item-ms', type=float, default=1.0, help="Latência por chamado criado")
+    parser.add_argument('--taxa-erro', type=float, default=0.0, help="Fração de respostas 503 das APIs simuladas")
+    parser.add_argument('--sem-id-token', action='store_true', help="Login sem id_token (via /userinfo)")
+    parser.add_argument('--envio-agrupado', action='store_true', help="Configura API_ENDPOINT_CHAMADO_LOTE")
+    parser.add_argument('--porta-app', type=int, default=3100)
+    parser.add_argument('--porta-simulado', type=int, default=9100)
+    parser.add_argument('--env', action='append', default=[], help="Variável extra da aplicação (CHAVE=VALOR)")
+    parser.add_argument('--json', help="Grava o resultado neste arquivo")
+    argumentos = parser.parse_args()
+    argumentos.cenarios = [cenario.strip() for cenario in argumentos.cenarios.split(',') if cenario.strip()]
+    argumentos.linhas_lote = [int(linhas) for linhas in argumentos.linhas_lote.split(',') if linhas.strip()]
+    desconhecidos = set(argumentos.cenarios) - set(CENARIOS)
+    if desconhecidos:
+        parser.error(f"Cenário(s) desconhecido(s): {', '.join(sorted(desconhecidos))}")
+
+    carga = Carga(argumentos)
+    processos = carga.iniciar_processos()
+    try:
+        print(''.join(TITULOS.get(chave, chave).ljust(largura) for chave, largura in COLUNAS))
+        resumos = asyncio.run(carga.executar())
+    finally:
+        for processo in processos:
+            processo.terminate()
+        for processo in processos:
+            processo.wait(timeout=10)
+        carga.saida_app.close()
+        print(f"Logs da aplicação: {carga.saida_app.name}")
+
+    if argumentos.json:
+        with open(argumentos.json, 'w', encoding='utf-8') as arquivo:
+            json.dump({
+                'execucao': carga.execucao,
+                'parametros': {chave: valor for chave, valor in vars(argumentos).items() if chave != 'json'},
+                'resultados': resumos,
+            }, arquivo, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    principal()
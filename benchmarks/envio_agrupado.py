@@ -0,0 +1,73 @@
+"""
+Compara o envio de um lote de chamados um a um e em grupos contra o servidor
+simulado (benchmarks/servidor_simulado.py), que deve estar em execução.
+
+Uso (a partir da raiz do projeto):
+    python benchmarks/servidor_simulado.py --porta 9100 &
+    python benchmarks/envio_agrupado.py --url http://127.0.0.1:9100 --linhas 1000 --tamanho-grupo 50
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from ambiente import configurar_ambiente
+
+parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+parser.add_argument('--url', default='http://127.0.0.1:9100')
+parser.add_argument('--linhas', type=int, default=1000)
+parser.add_argument('--tamanho-grupo', type=int, default=50)
+parser.add_argument('--simultaneos', type=int, default=10)
+argumentos = parser.parse_args()
+
+# A configuração é lida na importação dos módulos da aplicação
+configurar_ambiente(
+    API_ENDPOINT_CHAMADO=f'{argumentos.url}/chamado',
+    API_ENDPOINT_CHAMADO_LOTE=f'{argumentos.url}/chamado/lote',
+    LOTE_ENVIO_AGRUPADO_TAMANHO=str(argumentos.tamanho_grupo),
+    LOTE_REQUISICOES_POR_SEGUNDO='0',
+    BANCO_LOCAL_CAMINHO=os.path.join(tempfile.mkdtemp(), 'benchmark.db'),
+    LOG_NIVEL='WARNING',
+)
+
+from src.classes.tipos import ConfigEnvSetings  # noqa: E402
+from src.modulos.abrir_chamados import AbrirChamados  # noqa: E402
+from src.modulos.dataset import DadosPlanilha  # noqa: E402
+from src.modulos.http_client import fechar_cliente_http, iniciar_cliente_http  # noqa: E402
+
+
+async def executar(modo: str, agrupado: bool) -> float:
+    ConfigEnvSetings.API_ENDPOINT_CHAMADO_LOTE = f'{argumentos.url}/chamado/lote' if agrupado else ''
+
+    dados = DadosPlanilha()
+    for linha in range(1, argumentos.linhas + 1):
+        dados.adicionar_linha(linha, {'A': f'{modo}-{time.time_ns()}-{linha}', 'B': str(linha)})
+
+    abrir_chamados = AbrirChamados('benchmark@example.com', dados)
+    itens = abrir_chamados.preparar_chamados('Chamado <A>', 'Linha <B>', list(dados.linhas))
+
+    inicio = time.perf_counter()
+    resultado = await abrir_chamados.enviar_chamados(itens, max_simultaneos=argumentos.simultaneos)
+    segundos = time.perf_counter() - inicio
+
+    print(
+        f"{modo:<10} {argumentos.linhas} linha(s) em {segundos:.2f}s "
+        f"({argumentos.linhas / segundos:.0f} chamados/s) - "
+        f"{resultado['sucessos']} sucesso(s), {resultado['erros']} erro(s)"
+    )
+    return segundos
+
+
+async def principal():
+    await iniciar_cliente_http()
+    try:
+        unitario = await executar('unitario', agrupado=False)
+        agrupado = await executar('agrupado', agrupado=True)
+        print(f"Envio agrupado {unitario / agrupado:.1f}x mais rápido (grupos de {argumentos.tamanho_grupo})")
+    finally:
+        await fechar_cliente_http()
+
+
+if __name__ == "__main__":
+    asyncio.run(principal())
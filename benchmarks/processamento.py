@@ -0,0 +1,252 @@
+"""
+Microbenchmarks dos caminhos de CPU do processamento de planilhas: leitura
+(.xlsx e CSV), renderização dos placeholders e preparação do lote. As
+planilhas são geradas de forma determinística (linhas x colunas) e os
+templates referenciam uma fração das colunas (densidade de placeholders).
+
+Para cada caso e etapa são registrados o tempo (mediana das repetições) e o
+pico de memória alocada (tracemalloc, em uma execução separada). O resultado
+é comparado com a baseline gravada em benchmarks/baseline_processamento.json.
+
+Uso (a partir da raiz do projeto):
+    python benchmarks/processamento.py                       # compara com a baseline
+    python benchmarks/processamento.py --salvar-baseline     # grava a nova baseline
+    python benchmarks/processamento.py --linhas 50000 --colunas 10 --densidades 0.5 --etapas leitura_csv
+"""
+import argparse
+import csv
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Dict, List
+
+from ambiente import RAIZ, configurar_ambiente
+
+configurar_ambiente(LOG_NIVEL='WARNING', DATASET_MAX_MB='0')
+
+import openpyxl  # noqa: E402
+from src.modulos.abrir_chamados import AbrirChamados  # noqa: E402
+from src.modulos.planilha import Planilha  # noqa: E402
+from src.modulos.template import obter_template  # noqa: E402
+from openpyxl.utils import get_column_letter  # noqa: E402
+
+ARQUIVO_BASELINE = os.path.join(RAIZ, 'benchmarks', 'baseline_processamento.json')
+DIRETORIO_PLANILHAS = os.path.join(tempfile.gettempdir(), 'benchmarks-planilhas')
+EMAIL = 'benchmark@example.com'
+
+# Diferenças abaixo deste valor (segundos) são ruído e não contam como regressão
+TOLERANCIA_ABSOLUTA = 0.005
+
+
+class Caso:
+    """Planilha sintética e templates de um caso do benchmark."""
+
+    def __init__(self, linhas: int, colunas: int, densidade: float):
+        self.linhas = linhas
+        self.colunas = colunas
+        self.densidade = densidade
+        self.chave = f'linhas={linhas},colunas={colunas},densidade={densidade:g}'
+
+        letras = [get_column_letter(indice) for indice in range(1, colunas + 1)]
+        referenciadas = letras[:max(1, round(colunas * densidade))]
+        self.titulo = 'Chamado ' + ' - '.join(f'<{letra}>' for letra in referenciadas[:3])
+        self.descricao = '\n'.join(f'Campo {letra}: <{letra}>' for letra in referenciadas)
+
+        self.caminho_xlsx = os.path.join(DIRETORIO_PLANILHAS, f'{linhas}x{colunas}.xlsx')
+        self.caminho_csv = os.path.join(DIRETORIO_PLANILHAS, f'{linhas}x{colunas}.csv')
+        self.dados = None
+
+    def gerar_arquivos(self):
+        """Gera as planilhas (uma vez; ficam no diretório temporário entre execuções)."""
+        if os.path.exists(self.caminho_xlsx) and os.path.exists(self.caminho_csv):
+            return
+        os.makedirs(DIRETORIO_PLANILHAS, exist_ok=True)
+        aleatorio = random.Random(f'{self.linhas}x{self.colunas}')
+        alfabeto = 'abcdefghijklmnopqrstuvwxyz0123456789 '
+
+        workbook = openpyxl.Workbook(write_only=True)
+        planilha = workbook.create_sheet()
+        with open(self.caminho_csv, 'w', newline='', encoding='utf-8') as arquivo_csv:
+            escritor = csv.writer(arquivo_csv)
+            cabecalho = [f'Coluna {get_column_letter(indice)}' for indice in range(1, self.colunas + 1)]
+            planilha.append(cabecalho)
+            escritor.writerow(cabecalho)
+            for _ in range(self.linhas - 1):
+                linha = [
+                    ''.join(aleatorio.choices(alfabeto, k=aleatorio.randint(5, 30)))
+                    if aleatorio.random() > 0.1 else None
+                    for _ in range(self.colunas)
+                ]
+                planilha.append(linha)
+                escritor.writerow(['' if valor is None else valor for valor in linha])
+        workbook.save(self.caminho_xlsx)
+
+    def carregar_dados(self):
+        planilha = Planilha(self.caminho_csv)
+        planilha.criar_base_chamados()
+        self.dados = planilha.dados
+
+
+# Etapas: recebem o caso e executam a operação medida
+
+def etapa_leitura_xlsx(caso: Caso):
+    Planilha(caso.caminho_xlsx).criar_base_chamados()
+
+
+def etapa_leitura_csv(caso: Caso):
+    Planilha(caso.caminho_csv).criar_base_chamados()
+
+
+def etapa_substituir_placeholders(caso: Caso):
+    obter_template.cache_clear()
+    abrir_chamados = AbrirChamados(EMAIL, caso.dados)
+    for numero_linha in caso.dados.linhas:
+        abrir_chamados.substituir_placeholders(caso.titulo, numero_linha)
+        abrir_chamados.substituir_placeholders(caso.descricao, numero_linha)
+
+
+def etapa_processar_chamado(caso: Caso):
+    obter_template.cache_clear()
+    abrir_chamados = AbrirChamados(EMAIL, caso.dados)
+    for numero_linha in caso.dados.linhas:
+        abrir_chamados.processar_chamado(caso.titulo, caso.descricao, numero_linha)
+
+
+def etapa_preparar_chamados(caso: Caso):
+    obter_template.cache_clear()
+    AbrirChamados(EMAIL, caso.dados).preparar_chamados(caso.titulo, caso.descricao, caso.dados.linhas)
+
+
+ETAPAS: Dict[str, Callable[[Caso], None]] = {
+    'leitura_xlsx': etapa_leitura_xlsx,
+    'leitura_csv': etapa_leitura_csv,
+    'substituir_placeholders': etapa_substituir_placeholders,
+    'processar_chamado': etapa_processar_chamado,
+    'preparar_chamados': etapa_preparar_chamados,
+}
+
+
+def medir(etapa: Callable[[Caso], None], caso: Caso, repeticoes: int) -> Dict:
+    """
+    Mede uma etapa: mediana do tempo em `repeticoes` execuções e pico de
+    memória alocada em uma execução adicional sob tracemalloc.
+    """
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        etapa(caso)
+        tempos.append(time.perf_counter() - inicio)
+
+    tracemalloc.start()
+    try:
+        etapa(caso)
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    segundos = statistics.median(tempos)
+    return {
+        'segundos': round(segundos, 5),
+        'linhas_por_segundo': round(caso.linhas / segundos) if segundos else None,
+        'pico_mb': round(pico / (1024 * 1024), 2),
+    }
+
+
+def comparar(atual: Dict, baseline: Dict, limite: float) -> str:
+    """Variação de tempo em relação à baseline (marca regressões acima do limite)."""
+    if not baseline:
+        return 'sem baseline'
+    variacao = atual['segundos'] / baseline['segundos'] - 1 if baseline['segundos'] else 0.0
+    texto = f'{variacao:+.1%}'
+    if variacao > limite and atual['segundos'] - baseline['segundos'] > TOLERANCIA_ABSOLUTA:
+        texto += ' REGRESSÃO'
+    return texto
+
+
+def principal() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--linhas', default='1000,10000', help="Quantidades de linhas")
+    parser.add_argument('--colunas', default='5,20', help="Quantidades de colunas")
+    parser.add_argument('--densidades', default='0.2,1', help="Fração das colunas referenciadas nos templates")
+    parser.add_argument('--etapas', default=','.join(ETAPAS), help=f"Etapas: {','.join(ETAPAS)}")
+    parser.add_argument('--repeticoes', type=int, default=3)
+    parser.add_argument('--limite-regressao', type=float, default=0.25,
+                        help="Variação de tempo (fração) acima da qual a etapa é uma regressão")
+    parser.add_argument('--baseline', default=ARQUIVO_BASELINE)
+    parser.add_argument('--salvar-baseline', action='store_true', help="Grava o resultado como nova baseline")
+    argumentos = parser.parse_args()
+
+    etapas = [etapa.strip() for etapa in argumentos.etapas.split(',') if etapa.strip()]
+    desconhecidas = set(etapas) - set(ETAPAS)
+    if desconhecidas:
+        parser.error(f"Etapa(s) desconhecida(s): {', '.join(sorted(desconhecidas))}")
+
+    casos = [
+        Caso(int(linhas), int(colunas), float(densidade))
+        for linhas in argumentos.linhas.split(',')
+        for colunas in argumentos.colunas.split(',')
+        for densidade in argumentos.densidades.split(',')
+    ]
+
+    baseline = {}
+    if os.path.exists(argumentos.baseline) and not argumentos.salvar_baseline:
+        with open(argumentos.baseline, encoding='utf-8') as arquivo:
+            baseline = json.load(arquivo).get('resultados', {})
+
+    resultados: Dict[str, Dict[str, Dict]] = {}
+    regressoes: List[str] = []
+    print(f"{'caso':<40}{'etapa':<26}{'ms':>10}{'linhas/s':>12}{'pico MB':>10}  baseline")
+    for caso in casos:
+        caso.gerar_arquivos()
+        caso.carregar_dados()
+        resultados[caso.chave] = {}
+        for nome in etapas:
+            # A leitura não depende da densidade: medida só uma vez por planilha
+            if nome.startswith('leitura_') and caso.densidade != float(argumentos.densidades.split(',')[0]):
+                continue
+            resultado = medir(ETAPAS[nome], caso, argumentos.repeticoes)
+            resultados[caso.chave][nome] = resultado
+            comparacao = '' if argumentos.salvar_baseline else comparar(
+                resultado, baseline.get(caso.chave, {}).get(nome), argumentos.limite_regressao
+            )
+            if 'REGRESSÃO' in comparacao:
+                regressoes.append(f'{caso.chave} {nome}')
+            print(
+                f"{caso.chave:<40}{nome:<26}{resultado['segundos'] * 1000:>10.1f}"
+                f"{resultado['linhas_por_segundo'] or 0:>12}{resultado['pico_mb']:>10.2f}  {comparacao}",
+                flush=True
+            )
+
+    if argumentos.salvar_baseline:
+        with open(argumentos.baseline, 'w', encoding='utf-8') as arquivo:
+            json.dump({
+                'ambiente': {
+                    'python': platform.python_version(),
+                    'plataforma': platform.platform(),
+                    'processador': platform.processor() or platform.machine(),
+                    'data': datetime.now().strftime('%Y-%m-%dT%H:%M:%S'),
+                    'repeticoes': argumentos.repeticoes,
+                },
+                'resultados': resultados,
+            }, arquivo, ensure_ascii=False, indent=2)
+            arquivo.write('\n')
+        print(f"Baseline gravada em {argumentos.baseline}")
+        return 0
+
+    if regressoes:
+        print(f"{len(regressoes)} regressão(ões) acima de {argumentos.limite_regressao:.0%}:")
+        for regressao in regressoes:
+            print(f"  {regressao}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(principal())
@@ -0,0 +1,216 @@
+"""
+Servidor local que simula as APIs externas da aplicação (Fluig e Google
+OAuth), para testar e medir a aplicação sem acessar os ambientes reais.
+
+Endpoints:
+    POST /chamado          Cria um chamado (DadosChamado)                    API_ENDPOINT_CHAMADO
+    POST /chamado/lote     Cria vários chamados: {"chamados": [...]}         API_ENDPOINT_CHAMADO_LOTE
+                           -> {"resultados": [...]}
+    POST /funcionario      Dados do funcionário (PayloadFuncionario)         API_ENDPOINT_FUNCIONARIO
+    POST /token            Troca o código OAuth por access_token e id_token  GOOGLE_TOKEN_URI
+    GET  /certs            Chaves de assinatura do id_token (JWK Set)        GOOGLE_AUTH_PROVIDER_X509_CERT_URL
+    GET  /userinfo         Usuário do access_token                           GOOGLE_USERINFO_URI
+    GET  /estatisticas     Requisições e chamados recebidos desde o início
+    POST /estatisticas/zerar
+
+O código OAuth é o próprio email do usuário (ex: /login/google/callback?code=usuario1@uisa.com.br).
+O id_token é assinado (RS256) com uma chave RSA gerada na inicialização; com
+--sem-id-token, /token devolve apenas o access_token (login via /userinfo).
+Chamados cujo título contém "FALHA" são recusados (HTTP 502 no envio
+unitário; sucesso=False no envio agrupado). Com --taxa-erro, essa fração das
+requisições responde HTTP 503 (falha transitória, sujeita a retentativa).
+
+Uso:
+    python benchmarks/servidor_simulado.py --porta 9100 --latencia-ms 20 --latencia-item-ms 1
+    python benchmarks/servidor_simulado.py --taxa-erro 0.05   # 5% de respostas 503
+    python benchmarks/servidor_simulado.py --sem-lote         # /chamado/lote responde 404
+    python benchmarks/servidor_simulado.py --sem-id-token     # login sem id_token (consulta /userinfo)
+"""
+import argparse
+import asyncio
+import itertools
+import random
+import time
+from typing import Dict, List, Tuple
+import jwt
+import uvicorn
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jwt.algorithms import RSAAlgorithm
+from fastapi import FastAPI, Form, HTTPException, Request
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+
+class Chamado(BaseModel):
+    Usuario: str
+    Titulo: str
+    Descricao: str
+
+
+class GrupoChamados(BaseModel):
+    chamados: List[Chamado]
+
+
+class BuscaFuncionario(BaseModel):
+    Email: str
+
+
+ID_CHAVE = 'simulado-1'
+
+
+def gerar_chave_rsa() -> rsa.RSAPrivateKey:
+    """
+    Gera a chave RSA que assina os id_tokens simulados (não usar fora dos testes).
+
+    Returns:
+        Chave privada RSA de 2048 bits
+    """
+    return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+
+def assinar_jwt(claims: Dict, chave: rsa.RSAPrivateKey) -> str:
+    """Assina as claims com RS256, com o kid da chave no cabeçalho (como o Google)."""
+    return jwt.encode(claims, chave, algorithm='RS256', headers={'kid': ID_CHAVE})
+
+
+def criar_app(
+    latencia_ms: float = 20.0,
+    latencia_item_ms: float = 1.0,
+    sem_lote: bool = False,
+    taxa_erro: float = 0.0,
+    sem_id_token: bool = False
+) -> FastAPI:
+    """
+    Cria a aplicação simulada.
+
+    Args:
+        latencia_ms: Custo fixo de cada requisição (transação, autenticação)
+        latencia_item_ms: Custo de cada chamado criado
+        sem_lote: Se True, o endpoint de envio agrupado responde 404
+        taxa_erro: Fração das requisições (0 a 1) que responde HTTP 503
+        sem_id_token: Se True, /token não devolve id_token
+    """
+    app = FastAPI(title="APIs externas simuladas")
+    ids = itertools.count(1)
+    chave = gerar_chave_rsa()
+    # (código, client_id) -> id_token, reaproveitado enquanto faltar mais de 1 min para expirar
+    id_tokens: Dict[Tuple[str, str], Tuple[str, int]] = {}
+    estatisticas: Dict[str, int] = {
+        'requisicoes': 0, 'requisicoes_lote': 0, 'chamados': 0, 'recusados': 0,
+        'funcionarios': 0, 'logins': 0, 'userinfo': 0, 'certs': 0, 'erros_simulados': 0
+    }
+
+    async def simular_latencia(quantidade: int):
+        await asyncio.sleep((latencia_ms + latencia_item_ms * quantidade) / 1000)
+        if taxa_erro and random.random() < taxa_erro:
+            estatisticas['erros_simulados'] += 1
+            raise HTTPException(status_code=503, detail="Erro simulado")
+
+    def criar(chamado: Chamado) -> Dict:
+        if 'FALHA' in chamado.Titulo:
+            estatisticas['recusados'] += 1
+            return {'sucesso': False, 'mensagem': 'Chamado recusado pelo servidor simulado'}
+        estatisticas['chamados'] += 1
+        return {'sucesso': True, 'mensagem': 'Chamado criado com sucesso', 'dados': {'id': next(ids)}}
+
+    @app.post("/chamado")
+    async def chamado(dados: Chamado):
+        estatisticas['requisicoes'] += 1
+        await simular_latencia(1)
+        resultado = criar(dados)
+        if not resultado['sucesso']:
+            raise HTTPException(status_code=502, detail=resultado['mensagem'])
+        return resultado['dados']
+
+    @app.post("/chamado/lote")
+    async def chamado_lote(grupo: GrupoChamados):
+        if sem_lote:
+            raise HTTPException(status_code=404, detail="Not Found")
+        estatisticas['requisicoes'] += 1
+        estatisticas['requisicoes_lote'] += 1
+        await simular_latencia(len(grupo.chamados))
+        return {'resultados': [criar(dados) for dados in grupo.chamados]}
+
+    @app.post("/funcionario")
+    async def funcionario(dados: BuscaFuncionario):
+        estatisticas['funcionarios'] += 1
+        await simular_latencia(0)
+        nome = dados.Email.split('@')[0]
+        return {
+            'Nome': nome.title(), 'Email': dados.Email, 'Telefone': '(00) 0000-0000',
+            'Função': 'Analista', 'Seção': 'TI', 'Empresa': 'Simulada', 'Centro_Custo': '0000',
+            'Chapa': nome, 'Gerencia': 'TI'
+        }
+
+    @app.post("/token")
+    async def token(code: str = Form(...), client_id: str = Form('')):
+        estatisticas['logins'] += 1
+        await simular_latencia(0)
+        resposta = {'access_token': f'simulado:{code}', 'token_type': 'Bearer', 'expires_in': 3600}
+        if not sem_id_token:
+            agora = int(time.time())
+            id_token, expira = id_tokens.get((code, client_id), ('', 0))
+            if expira - agora < 60:
+                expira = agora + 3600
+                id_token = assinar_jwt({
+                    'iss': 'https://accounts.google.com', 'aud': client_id, 'sub': code,
+                    'email': code, 'email_verified': True, 'name': code.split('@')[0].title(),
+                    'picture': '', 'iat': agora, 'exp': expira
+                }, chave)
+                id_tokens[(code, client_id)] = (id_token, expira)
+            resposta['id_token'] = id_token
+        return resposta
+
+    @app.get("/certs")
+    async def certs():
+        estatisticas['certs'] += 1
+        await simular_latencia(0)
+        jwk = {
+            **RSAAlgorithm.to_jwk(chave.public_key(), as_dict=True),
+            'kid': ID_CHAVE, 'alg': 'RS256', 'use': 'sig'
+        }
+        return JSONResponse({'keys': [jwk]}, headers={'Cache-Control': 'public, max-age=3600'})
+
+    @app.get("/userinfo")
+    async def userinfo(request: Request):
+        estatisticas['userinfo'] += 1
+        await simular_latencia(0)
+        token = request.headers.get('authorization', '')[len('Bearer '):]
+        if not token.startswith('simulado:'):
+            raise HTTPException(status_code=401, detail="Token inválido")
+        email = token[len('simulado:'):]
+        return {'email': email, 'name': email.split('@')[0].title(), 'picture': ''}
+
+    @app.get("/estatisticas")
+    async def obter_estatisticas():
+        return JSONResponse(estatisticas)
+
+    @app.post("/estatisticas/zerar")
+    async def zerar_estatisticas():
+        for chave in estatisticas:
+            estatisticas[chave] = 0
+        return JSONResponse(estatisticas)
+
+    return app
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--porta', type=int, default=9100)
+    parser.add_argument('--latencia-ms', type=float, default=20.0)
+    parser.add_argument('--latencia-item-ms', type=float, default=1.0)
+    parser.add_argument('--sem-lote', action='store_true')
+    parser.add_argument('--taxa-erro', type=float, default=0.0)
+    parser.add_argument('--sem-id-token', action='store_true')
+    argumentos = parser.parse_args()
+
+    uvicorn.run(
+        criar_app(
+            argumentos.latencia_ms, argumentos.latencia_item_ms, argumentos.sem_lote,
+            argumentos.taxa_erro, argumentos.sem_id_token
+        ),
+        host=argumentos.host,
+        port=argumentos.porta,
+        log_level='warning'
+    )
@@ -14,6 +14,7 @@ class ConfigEnv(BaseSettings):
     GOOGLE_AUTH_PROVIDER_X509_CERT_URL:str
     GOOGLE_REDIRECT_URIS:str
     GOOGLE_CLIENT_SECRET:str
+    GOOGLE_USERINFO_URI:str = 'https://www.googleapis.com/oauth2/v2/userinfo'
 
 
     API_ENDPOINT_FUNCIONARIO:str
@@ -21,6 +22,79 @@ class ConfigEnv(BaseSettings):
     API_NAME:str
     API_ENDPOINT_CHAMADO:str
 
+    # Cliente HTTP (pool de conexões e timeouts, em segundos)
+    HTTP_MAX_CONEXOES:int = 100
+    HTTP_MAX_CONEXOES_KEEPALIVE:int = 20
+    HTTP_KEEPALIVE_EXPIRACAO:float = 30.0
+    HTTP_TIMEOUT:float = 30.0
+    HTTP_TIMEOUT_CONEXAO:float = 5.0
+
+    # Criação de chamados em lote (0 desativa o limite de taxa)
+    LOTE_MAX_SIMULTANEOS:int = 10
+    LOTE_REQUISICOES_POR_SEGUNDO:float = 5.0
+
+    # Envio agrupado de chamados (vários por requisição); vazio desativa e, se o
+    # endpoint não existir (404/405/501), o lote volta ao envio unitário
+    API_ENDPOINT_CHAMADO_LOTE:str = ''
+    LOTE_ENVIO_AGRUPADO_TAMANHO:int = 50
+
+    # API JSON de chamados (/api/v1, protegida por API_KEY): máximo de chamados por requisição
+    API_MAX_CHAMADOS_POR_REQUISICAO:int = 500
+    # Tamanho máximo (caracteres) de cada valor das linhas do template
+    API_VALOR_MAX_CARACTERES:int = 2000
+
+    # Tamanho máximo (caracteres) do título e da descrição enviados à API de chamados
+    # (formulário, lotes e API JSON; nos lotes vale após a substituição dos placeholders)
+    CHAMADO_TITULO_MAX_CARACTERES:int = 255
+    CHAMADO_DESCRICAO_MAX_CARACTERES:int = 20000
+
+    # Respostas a partir deste tamanho (bytes) são comprimidas com gzip/brotli; 0 desativa
+    COMPRESSAO_TAMANHO_MINIMO:int = 1024
+
+    # Jobs de lote em segundo plano (tempo que um job finalizado fica consultável)
+    JOBS_RETENCAO_SEGUNDOS:float = 3600.0
+
+    # Datasets de planilha em memória (por sessão)
+    DATASET_MAX_ENTRADAS:int = 100
+    DATASET_TTL_SEGUNDOS:float = 3600.0
+    DATASET_MAX_MB:float = 50.0
+    DATASET_CACHE_MAX_MB:float = 500.0
+    UPLOAD_TAMANHO_MAXIMO_MB:float = 20.0
+
+    # Processos para leitura de planilhas e renderização de lotes grandes, fora
+    # do event loop (0 usa uma thread do próprio processo); tarefas além de
+    # PROCESSAMENTO_FILA_MAXIMA (em execução + aguardando) são recusadas
+    PROCESSAMENTO_PROCESSOS:int = 2
+    PROCESSAMENTO_FILA_MAXIMA:int = 8
+    PROCESSAMENTO_LINHAS_MINIMAS_RENDERIZACAO:int = 5000
+
+    # Cache de dados de funcionário
+    CACHE_FUNCIONARIO_TTL_SEGUNDOS:float = 300.0
+    CACHE_FUNCIONARIO_MAX_ENTRADAS:int = 1000
+
+    # Retentativas e disjuntor (circuit breaker) das APIs Fluig/funcionário
+    RETENTATIVA_MAX_TENTATIVAS:int = 3
+    RETENTATIVA_ATRASO_BASE:float = 0.5
+    RETENTATIVA_ATRASO_MAXIMO:float = 10.0
+    DISJUNTOR_LIMITE_FALHAS:int = 5
+    DISJUNTOR_TEMPO_RECUPERACAO:float = 30.0
+
+    # Banco local (SQLite) e janela de idempotência dos chamados (0 desativa)
+    BANCO_LOCAL_CAMINHO:Optional[str] = None
+    IDEMPOTENCIA_JANELA_SEGUNDOS:float = 86400.0
+    # Reserva de um chamado em envio que não foi concluído (ex: reinício durante o
+    # envio) bloqueia cópias idênticas até expirar
+    IDEMPOTENCIA_RESERVA_SEGUNDOS:float = 3600.0
+
+    # Checkpoint dos lotes: resultados gravados a cada N linhas (e ao fim de cada grupo)
+    LOTE_CHECKPOINT_LINHAS:int = 50
+
+    # Logs (mensagens repetitivas de progresso: no máximo LOG_AMOSTRAGEM_LIMITE por janela; 0 desativa)
+    LOG_NIVEL:str = 'INFO'
+    LOG_FORMATO:str = 'json'  # 'json' ou 'texto'
+    LOG_AMOSTRAGEM_LIMITE:int = 20
+    LOG_AMOSTRAGEM_JANELA_SEGUNDOS:float = 10.0
+
 
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
     
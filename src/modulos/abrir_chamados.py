@@ -1,64 +1,155 @@
-import configparser
-import re
-import os
-import requests
-from typing import Dict, List, Optional
+import asyncio
+import time
+import uuid
+import httpx
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Set, Tuple
 from src.modulos.logger import logger
-from src.modulos.planilha import PATH_TO_TEMP
+from src.modulos.http_client import obter_cliente_http
+from src.modulos.limitador import LimitadorTaxa
+from src.modulos.correlacao import contexto_lote
+from src.modulos.metricas import lote_duracao, lote_linhas, lote_linhas_por_segundo
+from src.modulos.resiliencia import CircuitoAberto, disjuntor_chamados, executar_com_resiliencia, resultado_incerto
+from src.modulos.dataset import DadosPlanilha
+from src.modulos.template import TemplateChamado, obter_template
+from src.modulos.idempotencia import ESTADO_RESERVADO, calcular_hash_chamado, registro_idempotencia
+from src.modulos.registro_lotes import LOTE_CONCLUIDO, LOTE_EXECUTANDO, LOTE_INTERROMPIDO, CheckpointLote, registro_lotes
+from src.modulos.banco_local import executar_banco
+from src.modulos.pool_processos import FilaProcessamentoCheia, pool_processos
+from src.modulos.compressao import serializar_json
 from src.classes.tipos import DadosChamado, ConfigEnvSetings
 
 
+# Respostas do endpoint de envio agrupado que indicam que ele não é suportado
+STATUS_SEM_ENVIO_AGRUPADO = {404, 405, 501}
+
+# Mensagem das linhas cujo envio teve resultado incerto (status 'indeterminado')
+MENSAGEM_INDETERMINADO = 'Não foi possível confirmar se o chamado foi criado; verifique no Fluig antes de reenviar'
+
+# Endpoints de envio agrupado que responderam como não suportados (por URL)
+_envio_agrupado_indisponivel: Dict[str, bool] = {}
+
+
+def _milissegundos_desde(inicio: float) -> float:
+    return round((time.perf_counter() - inicio) * 1000, 1)
+
+
+def erro_tamanho_chamado(titulo: str, descricao: str) -> Optional[str]:
+    """
+    Verifica o título e a descrição (já renderizados) contra os tamanhos máximos
+    aceitos (CHAMADO_TITULO_MAX_CARACTERES e CHAMADO_DESCRICAO_MAX_CARACTERES).
+
+    Returns:
+        Mensagem de erro ou None se estiverem dentro dos limites
+    """
+    if len(titulo) > ConfigEnvSetings.CHAMADO_TITULO_MAX_CARACTERES:
+        return f'Título excede {ConfigEnvSetings.CHAMADO_TITULO_MAX_CARACTERES} caracteres ({len(titulo)})'
+    if len(descricao) > ConfigEnvSetings.CHAMADO_DESCRICAO_MAX_CARACTERES:
+        return f'Descrição excede {ConfigEnvSetings.CHAMADO_DESCRICAO_MAX_CARACTERES} caracteres ({len(descricao)})'
+    return None
+
+
+def mensagem_chamado_existente(estado: str, momento: float) -> str:
+    """
+    Mensagem de um chamado não enviado por já existir um idêntico no registro de
+    idempotência (ver RegistroIdempotencia.reservar).
+
+    Args:
+        estado: Estado do registro ('criado' ou 'reservado')
+        momento: Timestamp da criação ou da reserva
+    """
+    quando = datetime.fromtimestamp(momento).strftime('%d/%m/%Y %H:%M')
+    if estado == ESTADO_RESERVADO:
+        return f'Chamado idêntico em envio por outra submissão (desde {quando})'
+    return f'Chamado idêntico já criado em {quando}'
+
+
+def envio_agrupado_disponivel() -> bool:
+    """
+    Verifica se o envio agrupado está configurado e não foi recusado pelo endpoint.
+
+    Returns:
+        True se os lotes devem ser enviados em grupos
+    """
+    endpoint = ConfigEnvSetings.API_ENDPOINT_CHAMADO_LOTE
+    return (
+        bool(endpoint)
+        and ConfigEnvSetings.LOTE_ENVIO_AGRUPADO_TAMANHO > 1
+        and not _envio_agrupado_indisponivel.get(endpoint)
+    )
+
+
 class AbrirChamados:
     """
     Classe para abrir chamados em sequência usando dados processados de planilha.
     Processa placeholders como <A>, <B>, etc. no título e descrição.
     """
     
-    def __init__(self, email_usuario: str):
+    def __init__(self, email_usuario: str, dados: Optional[DadosPlanilha] = None):
         """
         Inicializa a classe para abrir chamados.
         
         Args:
             email_usuario: Email do usuário que está criando os chamados
+            dados: Dataset da planilha processada (ver Planilha.criar_base_chamados)
         """
         self.email_usuario = email_usuario
-        self.config_planilha = configparser.ConfigParser()
+        self.dados = dados
+        self._templates: Dict[str, TemplateChamado] = {}
+        self.disjuntor = disjuntor_chamados
         self.headers = {
             ConfigEnvSetings.API_NAME: ConfigEnvSetings.API_KEY
         }
+        # Corpo JSON já serializado (ver _payload_chamado)
+        self.headers_json = {**self.headers, 'Content-Type': 'application/json'}
+        self._usuario_validado: Optional[str] = None
     
-    def carregar_dados_temp(self) -> bool:
+    def possui_dados(self) -> bool:
         """
-        Carrega os dados processados do arquivo temp.txt.
+        Verifica se há dados de planilha carregados.
         
         Returns:
-            True se carregou com sucesso, False caso contrário
+            True se há ao menos uma linha, False caso contrário
         """
-        try:
-            if not os.path.exists(PATH_TO_TEMP):
-                logger.error(f"Arquivo temp.txt não encontrado: {PATH_TO_TEMP}")
-                return False
-            
-            self.config_planilha.read(PATH_TO_TEMP, encoding='utf-8')
-            
-            if not self.config_planilha.sections():
-                logger.warning("Nenhuma seção encontrada no arquivo temp.txt")
-                return False
-            
-            logger.info(f"Dados carregados: {len(self.config_planilha.sections())} linhas encontradas")
-            return True
-            
-        except Exception as e:
-            logger.error(f"Erro ao carregar dados do temp.txt: {str(e)}")
+        if self.dados is None or not len(self.dados):
+            logger.warning("Nenhum dado de planilha carregado")
             return False
+        return True
+    
+    def compilar_template(self, texto: str) -> TemplateChamado:
+        """
+        Compila um texto com placeholders (a compilação é compartilhada entre
+        instâncias, ver obter_template). Colunas referenciadas que não existem
+        na planilha são registradas no log uma vez por template.
+        
+        Args:
+            texto: Texto com placeholders (ex: "Chamado <A> - <B>")
+        
+        Returns:
+            Template compilado
+        """
+        template = self._templates.get(texto)
+        if template is None:
+            template = obter_template(texto)
+            self._templates[texto] = template
+            
+            if self.dados is not None:
+                ausentes = template.colunas_ausentes(self.dados)
+                if ausentes:
+                    logger.warning(
+                        f"Coluna(s) {', '.join(ausentes)} não encontrada(s) na planilha. "
+                        f"Placeholder(s) {', '.join(f'<{c}>' for c in ausentes)} não será(ão) substituído(s).",
+                        extra={'amostragem': 'colunas_ausentes'}
+                    )
+        return template
     
-    def substituir_placeholders(self, texto: str, numero_linha: str) -> str:
+    def substituir_placeholders(self, texto: str, numero_linha: int) -> str:
         """
         Substitui placeholders como <A>, <B>, etc. pelos valores da planilha.
         
         Args:
             texto: Texto com placeholders (ex: "Chamado <A> - <B>")
-            numero_linha: Número da linha/seção no config (ex: "1", "2", etc.)
+            numero_linha: Número da linha na planilha
         
         Returns:
             Texto com placeholders substituídos
@@ -66,118 +157,691 @@ class AbrirChamados:
         if not texto:
             return texto
         
-        # Encontrar todos os placeholders no formato <LETRA>
-        placeholders = re.findall(r'<([A-Z]+)>', texto.upper())
-        texto_processado = texto
-        
-        for letra in placeholders:
-            letra_lower = letra.lower()
-            
-            # Verificar se a coluna existe na seção
-            if self.config_planilha.has_option(numero_linha, letra_lower):
-                valor = self.config_planilha.get(numero_linha, letra_lower)
-                # Substituir placeholder (case-insensitive)
-                texto_processado = re.sub(
-                    f'<{letra}>', 
-                    valor, 
-                    texto_processado, 
-                    flags=re.IGNORECASE
-                )
-            else:
-                logger.warning(
-                    f"Coluna '{letra_lower}' não encontrada na linha {numero_linha}. "
-                    f"Placeholder <{letra}> não será substituído."
-                )
-        
-        return texto_processado
+        texto_processado = self.compilar_template(texto).renderizar(self.dados, int(numero_linha))
+        return texto if texto_processado is None else texto_processado
     
-    def processar_chamado(self, titulo: str, descricao: str, numero_linha: str) -> Dict:
+    def processar_chamado(self, titulo: str, descricao: str, numero_linha: int) -> Dict:
         """
         Processa um chamado substituindo placeholders pelos valores da planilha.
         
         Args:
             titulo: Título do chamado com placeholders
             descricao: Descrição do chamado com placeholders
-            numero_linha: Número da linha/seção no config
+            numero_linha: Número da linha na planilha
         
         Returns:
             Dicionário com título e descrição processados, ou erro se linha não encontrada
         """
-        secao = str(numero_linha)
+        numero_linha = int(numero_linha)
         
-        if secao not in self.config_planilha.sections():
+        if self.dados is None or not self.dados.contem(numero_linha):
             return {
                 'titulo': titulo,
                 'descricao': descricao,
-                'erro': f'Linha {secao} não encontrada'
+                'erro': f'Linha {numero_linha} não encontrada'
             }
         
-        titulo_processado = self.substituir_placeholders(titulo, secao)
-        desc_processada = self.substituir_placeholders(descricao, secao)
-        
         return {
-            'titulo': titulo_processado,
-            'descricao': desc_processada,
+            'titulo': self.compilar_template(titulo).renderizar(self.dados, numero_linha),
+            'descricao': self.compilar_template(descricao).renderizar(self.dados, numero_linha),
         }
     
-    def criar_chamado_api(self, titulo: str, descricao: str) -> Dict:
+    def _payload_chamado(self, titulo: str, descricao: str) -> Dict[str, str]:
+        """
+        Campos de DadosChamado para envio à API sem construir o modelo a cada
+        chamado: o email (único campo com validação além do tipo) é validado uma
+        vez por instância; título e descrição já chegam renderizados.
+        
+        Raises:
+            ValidationError: Se o email do usuário for inválido
+        """
+        if self._usuario_validado is None:
+            self._usuario_validado = DadosChamado(Usuario=self.email_usuario, Titulo='', Descricao='').Usuario
+        return {'Usuario': self._usuario_validado, 'Titulo': titulo, 'Descricao': descricao}
+    
+    async def criar_chamado_api(
+        self,
+        titulo: str,
+        descricao: str,
+        numero_linha: Optional[int] = None,
+        limitador: Optional[LimitadorTaxa] = None
+    ) -> Dict:
         """
         Cria um chamado via API.
         
         Args:
             titulo: Título do chamado
             descricao: Descrição do chamado
+            numero_linha: Linha da planilha que gerou o chamado (registrada nos logs)
+            limitador: Limitador de requisições por segundo, aguardado antes de
+                cada tentativa (inclusive retentativas)
         
         Returns:
-            Dicionário com resultado: {'sucesso': bool, 'mensagem': str, 'dados': dict}
+            Dicionário com resultado: {'sucesso': bool, 'mensagem': str, 'dados': dict};
+            'indeterminado': True se a requisição pode ter criado o chamado apesar do erro
         """
+        inicio = time.perf_counter()
+        campos_log = {'linha': numero_linha} if numero_linha is not None else {}
         try:
-            payload_chamado = DadosChamado(
-                Usuario=self.email_usuario,
-                Titulo=titulo,
-                Descricao=descricao
-            )
+            corpo = serializar_json(self._payload_chamado(titulo, descricao))
+            
+            async def enviar() -> httpx.Response:
+                response = await obter_cliente_http().post(
+                    ConfigEnvSetings.API_ENDPOINT_CHAMADO,
+                    content=corpo,
+                    headers=self.headers_json
+                )
+                response.raise_for_status()
+                return response
             
-            response = requests.post(
-                ConfigEnvSetings.API_ENDPOINT_CHAMADO,
-                json=payload_chamado.model_dump(),
-                headers=self.headers,
-                timeout=30
+            # Retentativas com backoff e disjuntor da API de chamados (criação não é
+            # idempotente: só repete se a requisição certamente não foi processada)
+            response = await executar_com_resiliencia(
+                enviar,
+                self.disjuntor,
+                antes_de_tentar=limitador.aguardar if limitador else None
             )
-            response.raise_for_status()
             
-            logger.info(f"Chamado criado com sucesso: {titulo}")
+            logger.info(f"Chamado criado com sucesso: {titulo}", extra={
+                **campos_log,
+                'status': 'sucesso',
+                'latencia_ms': _milissegundos_desde(inicio)
+            })
             return {
                 'sucesso': True,
                 'mensagem': 'Chamado criado com sucesso',
                 'dados': response.json() if response.content else {}
             }
             
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Erro ao criar chamado via API: {str(e)}")
+        except CircuitoAberto as e:
+            logger.warning(f"Chamado não enviado: {str(e)}", extra={
+                **campos_log,
+                'status': 'erro'
+            })
+            return {
+                'sucesso': False,
+                'mensagem': f'Erro ao criar chamado: {str(e)}',
+                'dados': {}
+            }
+        except httpx.HTTPError as e:
+            indeterminado = resultado_incerto(e)
+            logger.error(f"Erro ao criar chamado via API: {str(e)}", extra={
+                **campos_log,
+                'status': 'indeterminado' if indeterminado else 'erro',
+                'status_http': e.response.status_code if isinstance(e, httpx.HTTPStatusError) else None,
+                'latencia_ms': _milissegundos_desde(inicio)
+            })
+            if indeterminado:
+                return {
+                    'sucesso': False,
+                    'indeterminado': True,
+                    'mensagem': f'{MENSAGEM_INDETERMINADO} ({str(e) or type(e).__name__})',
+                    'dados': {}
+                }
             return {
                 'sucesso': False,
                 'mensagem': f'Erro ao criar chamado: {str(e)}',
                 'dados': {}
             }
         except Exception as e:
-            logger.error(f"Erro inesperado ao criar chamado: {str(e)}")
+            logger.error(f"Erro inesperado ao criar chamado: {str(e)}", extra={**campos_log, 'status': 'erro'})
             return {
                 'sucesso': False,
                 'mensagem': f'Erro inesperado: {str(e)}',
                 'dados': {}
             }
     
-    def abrir_chamados_sequencia(
+    async def criar_chamados_api_agrupado(
+        self,
+        itens: List[Dict],
+        limitador: Optional[LimitadorTaxa] = None
+    ) -> Optional[List[Dict]]:
+        """
+        Cria vários chamados em uma única requisição ao endpoint de envio agrupado
+        (API_ENDPOINT_CHAMADO_LOTE). O corpo é {"chamados": [DadosChamado, ...]} e a
+        resposta deve trazer {"resultados": [{"sucesso", "mensagem", "dados"}, ...]}
+        na mesma ordem dos chamados enviados.
+        
+        O grupo nunca é reenviado automaticamente depois de chegar ao servidor
+        (ver executar_com_resiliencia). Se não for possível saber o resultado de
+        cada chamado (timeout, 5xx incerto ou resposta sem os resultados), as
+        linhas ficam com status 'indeterminado' e não são reenviadas pelo
+        reprocessamento de falhas.
+        
+        Args:
+            itens: Itens preparados (ver preparar_chamados) com título e descrição renderizados
+            limitador: Limitador de requisições por segundo, aguardado antes de cada tentativa
+        
+        Returns:
+            Resultado de cada item, na mesma ordem (formato de criar_chamado_api), ou
+            None se o endpoint não suportar envio agrupado
+        """
+        endpoint = ConfigEnvSetings.API_ENDPOINT_CHAMADO_LOTE
+        inicio = time.perf_counter()
+        linhas = [item['linha'] for item in itens]
+        
+        def falha_grupo(mensagem: str, indeterminado: bool = False) -> List[Dict]:
+            if indeterminado:
+                return [
+                    {'sucesso': False, 'indeterminado': True, 'mensagem': mensagem, 'dados': {}}
+                    for _ in itens
+                ]
+            return [{'sucesso': False, 'mensagem': mensagem, 'dados': {}} for _ in itens]
+        
+        try:
+            corpo = serializar_json({
+                'chamados': [self._payload_chamado(item['titulo'], item['descricao']) for item in itens]
+            })
+            
+            async def enviar() -> httpx.Response:
+                response = await obter_cliente_http().post(
+                    endpoint,
+                    content=corpo,
+                    headers=self.headers_json
+                )
+                response.raise_for_status()
+                return response
+            
+            response = await executar_com_resiliencia(
+                enviar,
+                self.disjuntor,
+                antes_de_tentar=limitador.aguardar if limitador else None
+            )
+            
+        except CircuitoAberto as e:
+            logger.warning(f"Grupo de {len(itens)} chamado(s) não enviado: {str(e)}", extra={
+                'linhas': linhas,
+                'status': 'erro'
+            })
+            return falha_grupo(f'Erro ao criar chamado: {str(e)}')
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code in STATUS_SEM_ENVIO_AGRUPADO:
+                if not _envio_agrupado_indisponivel.get(endpoint):
+                    _envio_agrupado_indisponivel[endpoint] = True
+                    logger.warning(
+                        f"Endpoint de envio agrupado não suportado (HTTP {e.response.status_code}); "
+                        f"usando envio unitário"
+                    )
+                return None
+            indeterminado = resultado_incerto(e)
+            logger.error(f"Erro ao criar grupo de chamados via API: {str(e)}", extra={
+                'linhas': linhas,
+                'status': 'indeterminado' if indeterminado else 'erro',
+                'status_http': e.response.status_code,
+                'latencia_ms': _milissegundos_desde(inicio)
+            })
+            if indeterminado:
+                return falha_grupo(f'{MENSAGEM_INDETERMINADO} ({str(e)})', indeterminado=True)
+            return falha_grupo(f'Erro ao criar chamado: {str(e)}')
+        except httpx.HTTPError as e:
+            indeterminado = resultado_incerto(e)
+            logger.error(f"Erro ao criar grupo de chamados via API: {str(e)}", extra={
+                'linhas': linhas,
+                'status': 'indeterminado' if indeterminado else 'erro',
+                'latencia_ms': _milissegundos_desde(inicio)
+            })
+            if indeterminado:
+                return falha_grupo(f'{MENSAGEM_INDETERMINADO} ({str(e) or type(e).__name__})', indeterminado=True)
+            return falha_grupo(f'Erro ao criar chamado: {str(e)}')
+        except Exception as e:
+            logger.error(f"Erro inesperado ao criar grupo de chamados: {str(e)}", extra={'linhas': linhas, 'status': 'erro'})
+            return falha_grupo(f'Erro inesperado: {str(e)}')
+        
+        try:
+            corpo_resposta = response.json()
+        except ValueError:
+            corpo_resposta = None
+        resultados = corpo_resposta.get('resultados') if isinstance(corpo_resposta, dict) else None
+        if not isinstance(resultados, list) or len(resultados) != len(itens):
+            # A API aceitou o grupo, mas não é possível saber o resultado de cada linha
+            logger.error(
+                f"Resposta inválida do envio agrupado ({len(itens)} chamado(s)): "
+                f"corpo inesperado, resultados ausentes ou em quantidade diferente",
+                extra={'linhas': linhas, 'status': 'indeterminado', 'latencia_ms': _milissegundos_desde(inicio)}
+            )
+            return falha_grupo(f'{MENSAGEM_INDETERMINADO} (resposta inválida do envio agrupado)', indeterminado=True)
+        
+        logger.info(f"Grupo de {len(itens)} chamado(s) enviado", extra={
+            'linhas': linhas,
+            'latencia_ms': _milissegundos_desde(inicio)
+        })
+        return [
+            {
+                'sucesso': bool(resultado.get('sucesso')),
+                'mensagem': resultado.get('mensagem') or (
+                    'Chamado criado com sucesso' if resultado.get('sucesso') else 'Erro ao criar chamado'
+                ),
+                'dados': resultado.get('dados') or {}
+            }
+            if isinstance(resultado, dict) and 'sucesso' in resultado else
+            {
+                'sucesso': False,
+                'indeterminado': True,
+                'mensagem': f'{MENSAGEM_INDETERMINADO} (resposta inválida do envio agrupado)',
+                'dados': {}
+            }
+            for resultado in resultados
+        ]
+    
+    def preparar_chamados(self, titulo: str, descricao: str, linhas: List[int]) -> List[Dict]:
+        """
+        Renderiza os chamados das linhas informadas antes de qualquer chamada à API,
+        marcando as linhas com erro (inclusive título ou descrição acima do tamanho
+        máximo) e os chamados repetidos dentro do próprio lote.
+        
+        Args:
+            titulo: Título do chamado com placeholders
+            descricao: Descrição do chamado com placeholders
+            linhas: Números das linhas a processar, na ordem do lote
+        
+        Returns:
+            Lista de itens {'linha', 'titulo', 'descricao', 'hash', 'status', 'mensagem'},
+            com status 'pendente', 'erro' ou 'duplicado'
+        """
+        # Compilar os templates uma única vez para todo o lote
+        self.compilar_template(titulo)
+        self.compilar_template(descricao)
+        
+        itens: List[Dict] = []
+        linha_por_hash: Dict[str, int] = {}
+        for numero_linha in linhas:
+            chamado = self.processar_chamado(titulo, descricao, numero_linha)
+            if 'erro' not in chamado:
+                erro_tamanho = erro_tamanho_chamado(chamado['titulo'], chamado['descricao'])
+                if erro_tamanho:
+                    chamado = {'erro': f'{erro_tamanho} após a substituição dos placeholders'}
+            
+            if 'erro' in chamado:
+                logger.warning(f"Linha {numero_linha}: {chamado['erro']}", extra={
+                    'linha': numero_linha,
+                    'status': 'erro'
+                })
+                itens.append({
+                    'linha': numero_linha,
+                    'titulo': None,
+                    'descricao': None,
+                    'hash': None,
+                    'status': 'erro',
+                    'mensagem': chamado['erro']
+                })
+                continue
+            
+            hash_chamado = calcular_hash_chamado(self.email_usuario, chamado['titulo'], chamado['descricao'])
+            item = {
+                'linha': numero_linha,
+                'titulo': chamado['titulo'],
+                'descricao': chamado['descricao'],
+                'hash': hash_chamado,
+                'status': 'pendente',
+                'mensagem': None
+            }
+            if hash_chamado in linha_por_hash:
+                item['status'] = 'duplicado'
+                item['mensagem'] = f'Chamado idêntico ao da linha {linha_por_hash[hash_chamado]}'
+            else:
+                linha_por_hash[hash_chamado] = numero_linha
+            itens.append(item)
+        
+        return itens
+    
+    async def preparar_chamados_em_processo(self, titulo: str, descricao: str, linhas: List[int]) -> List[Dict]:
+        """
+        Igual a preparar_chamados, mas lotes com pelo menos
+        PROCESSAMENTO_LINHAS_MINIMAS_RENDERIZACAO linhas são renderizados em um
+        processo do pool, enviando apenas as colunas usadas nos templates. Com a
+        fila do pool cheia, renderiza no processo atual.
+        
+        Args:
+            titulo: Título do chamado com placeholders
+            descricao: Descrição do chamado com placeholders
+            linhas: Números das linhas a processar, na ordem do lote
+        
+        Returns:
+            Lista de itens (ver preparar_chamados)
+        """
+        if len(linhas) < ConfigEnvSetings.PROCESSAMENTO_LINHAS_MINIMAS_RENDERIZACAO or pool_processos.processos <= 0:
+            return self.preparar_chamados(titulo, descricao, linhas)
+        
+        colunas = self.compilar_template(titulo).colunas + self.compilar_template(descricao).colunas
+        try:
+            return await pool_processos.executar(
+                preparar_chamados_processo,
+                self.email_usuario,
+                self.dados.recorte(colunas),
+                titulo,
+                descricao,
+                linhas
+            )
+        except FilaProcessamentoCheia:
+            logger.warning("Fila de processamento cheia; renderizando o lote no processo atual")
+            return self.preparar_chamados(titulo, descricao, linhas)
+    
+    @staticmethod
+    def _detalhe(item: Dict) -> Dict:
+        detalhe = {
+            'linha': item['linha'],
+            'sucesso': item['status'] == 'sucesso',
+            'status': item['status'],
+            'mensagem': item['mensagem']
+        }
+        if item['titulo'] is not None:
+            detalhe['titulo'] = item['titulo']
+        return detalhe
+    
+    async def _enviar_item(
+        self,
+        item: Dict,
+        semaforo: asyncio.Semaphore,
+        limitador: LimitadorTaxa,
+        dono: str,
+        enviados: Set[str]
+    ):
+        """
+        Cria via API o chamado já renderizado de um item, atualizando seu status e
+        concluindo sua reserva no registro de idempotência.
+        
+        Args:
+            item: Item preparado (ver preparar_chamados), com o hash já reservado
+            semaforo: Semáforo que limita as chamadas simultâneas
+            limitador: Limitador de requisições por segundo
+            dono: Dono da reserva (ver RegistroIdempotencia.reservar)
+            enviados: Hashes cujo envio foi iniciado (a reserva não é liberada se
+                o lote for interrompido)
+        """
+        # Criar chamado via API (o limitador é aguardado a cada tentativa; com o
+        # disjuntor aberto a falha é imediata, sem aguardar o limitador)
+        async with semaforo:
+            enviados.add(item['hash'])
+            resultado_api = await self.criar_chamado_api(
+                item['titulo'],
+                item['descricao'],
+                item['linha'],
+                limitador
+            )
+        
+        self._aplicar_resultado(item, resultado_api)
+        await self._concluir_reservas([item], dono)
+    
+    async def _enviar_grupo(
+        self,
+        itens: List[Dict],
+        semaforo: asyncio.Semaphore,
+        limitador: LimitadorTaxa,
+        dono: str,
+        enviados: Set[str]
+    ) -> bool:
+        """
+        Cria em uma única requisição os chamados de um grupo de itens, atualizando
+        o status de cada um (ver _enviar_item).
+        
+        Args:
+            itens: Itens preparados do grupo
+            semaforo: Semáforo que limita as chamadas simultâneas
+            limitador: Limitador de requisições por segundo (uma requisição por grupo)
+            dono: Dono das reservas (ver _enviar_item)
+            enviados: Hashes cujo envio foi iniciado (ver _enviar_item)
+        
+        Returns:
+            False se o endpoint não suportar envio agrupado (itens continuam pendentes)
+        """
+        async with semaforo:
+            if not envio_agrupado_disponivel():
+                return False
+            enviados.update(item['hash'] for item in itens)
+            resultados = await self.criar_chamados_api_agrupado(itens, limitador)
+        
+        if resultados is None:
+            return False
+        for item, resultado_api in zip(itens, resultados):
+            self._aplicar_resultado(item, resultado_api)
+        # Uma única gravação no registro de idempotência por grupo
+        await self._concluir_reservas(itens, dono)
+        return True
+    
+    async def _concluir_reservas(self, itens: List[Dict], dono: str):
+        """
+        Confirma as reservas dos itens criados e libera as dos que falharam; as dos
+        itens com resultado incerto são mantidas (o chamado pode ter sido criado).
+        """
+        await executar_banco(
+            registro_idempotencia.concluir,
+            [item['hash'] for item in itens if item['status'] == 'sucesso'],
+            [item['hash'] for item in itens if item['status'] == 'erro'],
+            self.email_usuario,
+            dono
+        )
+    
+    @staticmethod
+    def _aplicar_resultado(item: Dict, resultado_api: Dict):
+        if resultado_api['sucesso']:
+            item['status'] = 'sucesso'
+        elif resultado_api.get('indeterminado'):
+            # Pode ter sido criado: fica fora do reprocessamento de falhas
+            item['status'] = 'indeterminado'
+        else:
+            item['status'] = 'erro'
+        item['mensagem'] = resultado_api['mensagem']
+        if resultado_api.get('dados'):
+            item['dados'] = resultado_api['dados']
+    
+    async def enviar_chamados(
+        self,
+        itens: List[Dict],
+        lote_id: Optional[str] = None,
+        max_simultaneos: Optional[int] = None,
+        requisicoes_por_segundo: Optional[float] = None,
+        ao_iniciar: Optional[Callable[[int], None]] = None,
+        ao_concluir_linha: Optional[Callable[[Dict], None]] = None,
+        semaforo: Optional[asyncio.Semaphore] = None,
+        limitador: Optional[LimitadorTaxa] = None
+    ) -> Dict:
+        """
+        Envia à API os itens pendentes de um lote, reservando-os antes no registro
+        de idempotência. Itens já criados dentro da janela ou em envio por outra
+        submissão são marcados como duplicados sem chamada à API.
+        
+        Args:
+            itens: Itens do lote (ver preparar_chamados); os que não estão pendentes
+                entram apenas no resultado
+            lote_id: Se informado, o resultado das linhas é gravado no checkpoint do lote
+                (em blocos de LOTE_CHECKPOINT_LINHAS linhas e ao fim de cada grupo) e
+                as reservas ficam em nome do lote (retomá-lo reassume as reservas)
+            max_simultaneos: Máximo de chamadas simultâneas à API (padrão: LOTE_MAX_SIMULTANEOS)
+            requisicoes_por_segundo: Limite de requisições por segundo à API; 0 desativa
+                (padrão: LOTE_REQUISICOES_POR_SEGUNDO)
+            ao_iniciar: Callback chamado com o total de linhas antes de iniciar o envio
+            ao_concluir_linha: Callback chamado com o detalhe de cada linha concluída
+            semaforo: Semáforo compartilhado entre envios simultâneos (ex: de vários
+                usuários); se informado, substitui max_simultaneos
+            limitador: Limitador compartilhado entre envios simultâneos; se informado,
+                substitui requisicoes_por_segundo
+        
+        Returns:
+            Dicionário com estatísticas (ver abrir_chamados_sequencia)
+        """
+        if semaforo is None:
+            semaforo = asyncio.Semaphore(max(1, max_simultaneos or ConfigEnvSetings.LOTE_MAX_SIMULTANEOS))
+        if limitador is None:
+            limitador = LimitadorTaxa(
+                requisicoes_por_segundo
+                if requisicoes_por_segundo is not None
+                else ConfigEnvSetings.LOTE_REQUISICOES_POR_SEGUNDO
+            )
+        
+        checkpoint = CheckpointLote(lote_id) if lote_id else None
+        
+        # Reservar os chamados a enviar; os já criados dentro da janela de idempotência
+        # ou em envio por outra submissão são descartados
+        dono = lote_id or uuid.uuid4().hex
+        pendentes = [(posicao, item) for posicao, item in enumerate(itens) if item['status'] == 'pendente']
+        indisponiveis = await executar_banco(
+            registro_idempotencia.reservar, [item['hash'] for _, item in pendentes], self.email_usuario, dono
+        )
+        if indisponiveis:
+            a_enviar = []
+            for posicao, item in pendentes:
+                if item['hash'] in indisponiveis:
+                    item['status'] = 'duplicado'
+                    item['mensagem'] = mensagem_chamado_existente(*indisponiveis[item['hash']])
+                    if checkpoint:
+                        checkpoint.adicionar(posicao, item['status'], item['mensagem'])
+                else:
+                    a_enviar.append((posicao, item))
+            pendentes = a_enviar
+        
+        if ao_iniciar:
+            ao_iniciar(len(itens))
+        if ao_concluir_linha:
+            for item in itens:
+                if item['status'] != 'pendente':
+                    ao_concluir_linha(self._detalhe(item))
+        
+        async def concluir(posicao: int, item: Dict):
+            if ao_concluir_linha:
+                ao_concluir_linha(self._detalhe(item))
+            if checkpoint:
+                checkpoint.adicionar(posicao, item['status'], item['mensagem'])
+                if checkpoint.cheio:
+                    await checkpoint.gravar()
+        
+        enviados: Set[str] = set()
+        
+        async def enviar(posicao: int, item: Dict):
+            await self._enviar_item(item, semaforo, limitador, dono, enviados)
+            await concluir(posicao, item)
+        
+        async def enviar_grupo(grupo: List[Tuple[int, Dict]]):
+            if not await self._enviar_grupo([item for _, item in grupo], semaforo, limitador, dono, enviados):
+                # Endpoint sem suporte a envio agrupado: um chamado por requisição
+                await asyncio.gather(*[enviar(posicao, item) for posicao, item in grupo])
+                return
+            for posicao, item in grupo:
+                await concluir(posicao, item)
+            if checkpoint:
+                await checkpoint.gravar()
+        
+        # Enviar os chamados em paralelo (individualmente ou em grupos de
+        # LOTE_ENVIO_AGRUPADO_TAMANHO); cada item mantém sua posição (ordem das linhas)
+        inicio = time.perf_counter()
+        try:
+            if len(pendentes) > 1 and envio_agrupado_disponivel():
+                tamanho = ConfigEnvSetings.LOTE_ENVIO_AGRUPADO_TAMANHO
+                await asyncio.gather(*[
+                    enviar_grupo(pendentes[indice:indice + tamanho])
+                    for indice in range(0, len(pendentes), tamanho)
+                ])
+            else:
+                await asyncio.gather(*[enviar(posicao, item) for posicao, item in pendentes])
+        except BaseException:
+            # Lote cancelado ou com erro: não perder as linhas já concluídas (a gravação
+            # roda em uma thread e termina mesmo que esta espera seja cancelada)
+            if checkpoint:
+                await checkpoint.gravar()
+            # Liberar as reservas dos chamados que não chegaram a ser enviados
+            await executar_banco(
+                registro_idempotencia.concluir,
+                [],
+                [item['hash'] for _, item in pendentes if item['status'] == 'pendente' and item['hash'] not in enviados],
+                self.email_usuario,
+                dono
+            )
+            raise
+        segundos_envio = time.perf_counter() - inicio
+        
+        detalhes = [self._detalhe(item) for item in itens]
+        sucessos = sum(1 for d in detalhes if d['status'] == 'sucesso')
+        duplicados = sum(1 for d in detalhes if d['status'] == 'duplicado')
+        indeterminados = sum(1 for d in detalhes if d['status'] == 'indeterminado')
+        erros = len(detalhes) - sucessos - duplicados - indeterminados
+        
+        if checkpoint:
+            await checkpoint.gravar()
+            await executar_banco(registro_lotes.atualizar_status, lote_id, LOTE_CONCLUIDO)
+        
+        lote_duracao.observar(segundos_envio)
+        lote_linhas.incrementar(sucessos, status='sucesso')
+        lote_linhas.incrementar(erros, status='erro')
+        lote_linhas.incrementar(duplicados, status='duplicado')
+        lote_linhas.incrementar(indeterminados, status='indeterminado')
+        if pendentes:
+            lote_linhas_por_segundo.definir(len(pendentes) / max(segundos_envio, 1e-9))
+        
+        logger.info(
+            f"Processamento concluído: {sucessos} sucesso(s), {erros} erro(s), "
+            f"{duplicados} duplicado(s), {indeterminados} indeterminado(s)"
+        )
+        
+        return {
+            'total_processados': len(itens),
+            'sucessos': sucessos,
+            'erros': erros,
+            'duplicados': duplicados,
+            'indeterminados': indeterminados,
+            'detalhes': detalhes,
+            'circuito_api': self.disjuntor.para_dict()
+        }
+    
+    async def retomar_lote(
+        self,
+        lote_id: str,
+        somente_falhas: bool = False,
+        ao_iniciar: Optional[Callable[[int], None]] = None,
+        ao_concluir_linha: Optional[Callable[[Dict], None]] = None
+    ) -> Dict:
+        """
+        Retoma um lote a partir do checkpoint, enviando apenas as linhas pendentes
+        com os chamados já renderizados (sem reprocessar a planilha).
+        
+        Args:
+            lote_id: ID do lote
+            somente_falhas: Se True, reenvia também as linhas que falharam no envio
+            ao_iniciar: Callback chamado com o total de linhas antes de iniciar o envio
+            ao_concluir_linha: Callback chamado com o detalhe de cada linha concluída
+        
+        Returns:
+            Dicionário com estatísticas (ver abrir_chamados_sequencia)
+        """
+        with contexto_lote(lote_id):
+            if somente_falhas:
+                reabertas = await executar_banco(registro_lotes.reabrir_falhas, lote_id)
+                logger.info(f"Lote {lote_id}: {reabertas} linha(s) com erro reaberta(s) para reprocessamento")
+            
+            await executar_banco(registro_lotes.atualizar_status, lote_id, LOTE_EXECUTANDO)
+            itens = await executar_banco(registro_lotes.itens, lote_id)
+            logger.info(
+                f"Retomando lote {lote_id}: "
+                f"{sum(1 for item in itens if item['status'] == 'pendente')} linha(s) pendente(s)"
+            )
+            try:
+                return await self.enviar_chamados(
+                    itens,
+                    lote_id=lote_id,
+                    ao_iniciar=ao_iniciar,
+                    ao_concluir_linha=ao_concluir_linha
+                )
+            except BaseException:
+                await executar_banco(registro_lotes.atualizar_status, lote_id, LOTE_INTERROMPIDO)
+                raise
+    
+    async def abrir_chamados_sequencia(
         self, 
         titulo: str, 
         descricao: str, 
         qtd_chamados: int,
         inicio_linha: int = 1,
-        ignorar_primeira_linha: bool = True
+        ignorar_primeira_linha: bool = True,
+        max_simultaneos: Optional[int] = None,
+        requisicoes_por_segundo: Optional[float] = None,
+        ao_iniciar: Optional[Callable[[int], None]] = None,
+        ao_concluir_linha: Optional[Callable[[Dict], None]] = None,
+        lote_id: Optional[str] = None
     ) -> Dict:
         """
-        Abre múltiplos chamados em sequência usando dados da planilha processada.
+        Abre múltiplos chamados usando dados da planilha processada.
+        As chamadas à API são feitas em paralelo, limitadas por max_simultaneos
+        e requisicoes_por_segundo. Linhas que geram um chamado idêntico a outra
+        linha do lote, ou a um chamado já criado dentro da janela de idempotência,
+        não são enviadas e aparecem com status 'duplicado'.
         
         Args:
             titulo: Título do chamado com placeholders (ex: "Chamado <A> - <B>")
@@ -185,44 +849,44 @@ class AbrirChamados:
             qtd_chamados: Quantidade de chamados a abrir
             inicio_linha: Linha inicial para começar a processar (padrão: 1)
             ignorar_primeira_linha: Se True, ignora a primeira seção (cabeçalho) (padrão: True)
+            max_simultaneos: Máximo de chamadas simultâneas à API (padrão: LOTE_MAX_SIMULTANEOS)
+            requisicoes_por_segundo: Limite de requisições por segundo à API; 0 desativa
+                (padrão: LOTE_REQUISICOES_POR_SEGUNDO)
+            ao_iniciar: Callback chamado com o total de linhas antes de iniciar o envio
+            ao_concluir_linha: Callback chamado com o detalhe de cada linha concluída
+            lote_id: Se informado, os chamados renderizados e o resultado de cada linha
+                são gravados no checkpoint local, permitindo retomar o lote (ver retomar_lote)
         
         Returns:
             Dicionário com estatísticas: {
                 'total_processados': int,
                 'sucessos': int,
                 'erros': int,
-                'detalhes': List[Dict]
+                'duplicados': int,
+                'indeterminados': int (envio sem confirmação de criação),
+                'detalhes': List[Dict] (status de cada linha: 'sucesso', 'erro', 'duplicado'
+                    ou 'indeterminado'),
+                'circuito_api': Dict (estado do disjuntor da API de chamados)
             }
         """
-        # Carregar dados do temp.txt
-        if not self.carregar_dados_temp():
+        # Verificar dados da planilha
+        if not self.possui_dados():
             return {
                 'total_processados': 0,
                 'sucessos': 0,
                 'erros': 1,
+                'duplicados': 0,
+                'indeterminados': 0,
                 'detalhes': [{
                     'linha': 0,
                     'sucesso': False,
-                    'mensagem': 'Erro ao carregar dados do temp.txt'
+                    'status': 'erro',
+                    'mensagem': 'Nenhum dado de planilha carregado'
                 }]
             }
         
-        secoes = sorted(
-            [int(s) for s in self.config_planilha.sections() if s.isdigit()],
-            key=int
-        )
-        
-        if not secoes:
-            return {
-                'total_processados': 0,
-                'sucessos': 0,
-                'erros': 1,
-                'detalhes': [{
-                    'linha': 0,
-                    'sucesso': False,
-                    'mensagem': 'Nenhuma linha válida encontrada no temp.txt'
-                }]
-            }
+        # Linhas já estão em ordem crescente no dataset
+        secoes = list(self.dados.linhas)
         
         # Se ignorar_primeira_linha for True, remover a primeira seção (geralmente é o cabeçalho)
         if ignorar_primeira_linha and secoes:
@@ -241,9 +905,12 @@ class AbrirChamados:
                 'total_processados': 0,
                 'sucessos': 0,
                 'erros': 1,
+                'duplicados': 0,
+                'indeterminados': 0,
                 'detalhes': [{
                     'linha': inicio_linha,
                     'sucesso': False,
+                    'status': 'erro',
                     'mensagem': f'Nenhuma linha encontrada a partir da linha {inicio_linha}'
                 }]
             }
@@ -253,64 +920,34 @@ class AbrirChamados:
             f"a partir da linha {inicio_linha}"
         )
         
-        sucessos = 0
-        erros = 0
-        detalhes = []
-        
-        # Processar cada linha
-        for numero_linha in secoes_processar:
-            linha_str = str(numero_linha)
+        with contexto_lote(lote_id):
+            # Renderizar todas as linhas antes de qualquer chamada à API
+            itens = await self.preparar_chamados_em_processo(titulo, descricao, secoes_processar)
             
-            # Processar placeholders
-            resultado_processamento = self.processar_chamado(
-                titulo, 
-                descricao, 
-                linha_str
-            )
+            if lote_id:
+                await executar_banco(registro_lotes.criar_lote, lote_id, self.email_usuario, titulo, descricao, itens)
             
-            if 'erro' in resultado_processamento:
-                erros += 1
-                detalhes.append({
-                    'linha': numero_linha,
-                    'sucesso': False,
-                    'mensagem': resultado_processamento['erro']
-                })
-                logger.warning(
-                    f"Linha {numero_linha}: {resultado_processamento['erro']}"
+            try:
+                return await self.enviar_chamados(
+                    itens,
+                    lote_id=lote_id,
+                    max_simultaneos=max_simultaneos,
+                    requisicoes_por_segundo=requisicoes_por_segundo,
+                    ao_iniciar=ao_iniciar,
+                    ao_concluir_linha=ao_concluir_linha
                 )
-                continue
-            
-            # Criar chamado via API
-            resultado_api = self.criar_chamado_api(
-                resultado_processamento['titulo'],
-                resultado_processamento['descricao']
-            )
-            
-            if resultado_api['sucesso']:
-                sucessos += 1
-                detalhes.append({
-                    'linha': numero_linha,
-                    'sucesso': True,
-                    'mensagem': resultado_api['mensagem'],
-                    'titulo': resultado_processamento['titulo']
-                })
-            else:
-                erros += 1
-                detalhes.append({
-                    'linha': numero_linha,
-                    'sucesso': False,
-                    'mensagem': resultado_api['mensagem'],
-                    'titulo': resultado_processamento['titulo']
-                })
-        
-        logger.info(
-            f"Processamento concluído: {sucessos} sucesso(s), {erros} erro(s)"
-        )
-        
-        return {
-            'total_processados': len(secoes_processar),
-            'sucessos': sucessos,
-            'erros': erros,
-            'detalhes': detalhes
-        }
+            except BaseException:
+                if lote_id:
+                    await executar_banco(registro_lotes.atualizar_status, lote_id, LOTE_INTERROMPIDO)
+                raise
+
 
+def preparar_chamados_processo(
+    email_usuario: str,
+    dados: DadosPlanilha,
+    titulo: str,
+    descricao: str,
+    linhas: List[int]
+) -> List[Dict]:
+    """Renderiza os itens de um lote em um processo do pool (ver AbrirChamados.preparar_chamados)."""
+    return AbrirChamados(email_usuario, dados).preparar_chamados(titulo, descricao, linhas)
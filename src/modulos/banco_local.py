@@ -0,0 +1,67 @@
+import asyncio
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, TypeVar
+from src.classes.tipos import ConfigEnvSetings
+
+PATH_TO_DB = ConfigEnvSetings.BANCO_LOCAL_CAMINHO or os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'dados', 'chamados.db'
+)
+
+_conexao = None
+_lock = threading.Lock()
+
+T = TypeVar('T')
+
+
+def _abrir_conexao() -> sqlite3.Connection:
+    os.makedirs(os.path.dirname(PATH_TO_DB) or '.', exist_ok=True)
+    conexao = sqlite3.connect(PATH_TO_DB, check_same_thread=False, isolation_level=None)
+    conexao.row_factory = sqlite3.Row
+    # WAL permite leituras concorrentes com a escrita (vários workers)
+    conexao.execute('PRAGMA journal_mode=WAL')
+    conexao.execute('PRAGMA synchronous=NORMAL')
+    conexao.execute('PRAGMA busy_timeout=5000')
+    return conexao
+
+
+@contextmanager
+def banco_local() -> Iterator[sqlite3.Connection]:
+    """
+    Fornece a conexão SQLite local compartilhada, com acesso serializado
+    entre threads. Cada bloco roda em uma transação (commit ao final,
+    rollback em caso de erro).
+
+    Yields:
+        Conexão SQLite
+    """
+    global _conexao
+    with _lock:
+        if _conexao is None:
+            _conexao = _abrir_conexao()
+        _conexao.execute('BEGIN')
+        try:
+            yield _conexao
+        except Exception:
+            _conexao.execute('ROLLBACK')
+            raise
+        else:
+            _conexao.execute('COMMIT')
+
+
+async def executar_banco(funcao: Callable[..., T], *args: Any) -> T:
+    """
+    Executa uma função que usa o banco local em uma thread, fora do event loop:
+    a espera pela trava (ou por outro processo escrevendo, até o busy_timeout)
+    não bloqueia as demais requisições.
+
+    Args:
+        funcao: Função síncrona que usa banco_local()
+        *args: Argumentos da função
+
+    Returns:
+        Retorno da função
+    """
+    return await asyncio.get_running_loop().run_in_executor(None, funcao, *args)
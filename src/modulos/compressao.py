@@ -0,0 +1,145 @@
+import gzip
+import json
+from typing import Any, List
+from starlette.responses import JSONResponse
+from src.modulos.logger import logger
+from src.classes.tipos import ConfigEnvSetings
+
+try:
+    import brotli
+except ImportError:  # sem o pacote (requirements.txt), apenas gzip
+    brotli = None
+
+try:
+    import orjson
+except ImportError:  # sem o pacote (requirements.txt), json da biblioteca padrão
+    orjson = None
+
+_ausentes = [nome for nome, modulo in (('brotli', brotli), ('orjson', orjson)) if modulo is None]
+if _ausentes:
+    logger.warning(
+        f"Pacote(s) {', '.join(_ausentes)} não instalado(s) (ver requirements.txt): "
+        f"respostas sem brotli e/ou JSON serializado com a biblioteca padrão"
+    )
+
+# Tipos de conteúdo que compensam comprimir (imagens, zip etc. já são comprimidos)
+TIPOS_COMPRIMIVEIS = ('text/', 'application/javascript', 'application/json', 'image/svg+xml')
+
+# Fluxos (Server-Sent Events) não são comprimidos: cada evento precisa chegar na hora
+TIPOS_NAO_COMPRIMIVEIS = ('text/event-stream',)
+
+
+def serializar_json(dados: Any) -> bytes:
+    """
+    Serializa em JSON compacto (UTF-8), com orjson se estiver instalado.
+
+    Args:
+        dados: Objeto serializável (dict, list, str, números, None)
+
+    Returns:
+        JSON em bytes
+    """
+    if orjson is not None:
+        # OPT_NON_STR_KEYS: aceita chaves numéricas, como o json da biblioteca padrão
+        return orjson.dumps(dados, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(dados, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+class RespostaJSON(JSONResponse):
+    """JSONResponse com serialização rápida (ver serializar_json)."""
+
+    def render(self, content: Any) -> bytes:
+        return serializar_json(content)
+
+
+def codificacoes_aceitas(accept_encoding: str) -> List[str]:
+    """Codificações do cabeçalho Accept-Encoding, ignorando as recusadas (q=0)."""
+    aceitas = []
+    for parte in accept_encoding.split(','):
+        nome, _, parametros = parte.strip().partition(';')
+        parametros = parametros.replace(' ', '')
+        if nome and parametros not in ('q=0', 'q=0.0', 'q=0.00', 'q=0.000'):
+            aceitas.append(nome.lower())
+    return aceitas
+
+
+def comprimir(conteudo: bytes, codificacao: str, maxima: bool = False) -> bytes:
+    """
+    Comprime o conteúdo em gzip ou brotli.
+
+    Args:
+        conteudo: Bytes a comprimir
+        codificacao: 'gzip' ou 'br'
+        maxima: Compressão máxima (arquivos preparados uma única vez); senão,
+            um nível mais rápido, adequado a respostas geradas a cada requisição
+    """
+    if codificacao == 'br':
+        return brotli.compress(conteudo, quality=11 if maxima else 4)
+    return gzip.compress(conteudo, compresslevel=9 if maxima else 6, mtime=0)
+
+
+class MiddlewareCompressao:
+    """
+    Middleware ASGI que comprime (brotli, se disponível, ou gzip) as respostas
+    de texto/JSON com pelo menos COMPRESSAO_TAMANHO_MINIMO bytes, conforme o
+    Accept-Encoding do cliente. Respostas já codificadas (ex: arquivos
+    estáticos pré-comprimidos) e respostas em fluxo (corpo em várias partes,
+    como os eventos de progresso do lote) passam sem alteração.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http' or ConfigEnvSetings.COMPRESSAO_TAMANHO_MINIMO <= 0:
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = ''
+        for nome, valor in scope['headers']:
+            if nome == b'accept-encoding':
+                accept_encoding = valor.decode('latin-1')
+                break
+        aceitas = codificacoes_aceitas(accept_encoding)
+        codificacao = 'br' if brotli is not None and 'br' in aceitas else 'gzip' if 'gzip' in aceitas else None
+
+        inicio_resposta = None
+
+        async def enviar(mensagem):
+            nonlocal inicio_resposta
+            if mensagem['type'] == 'http.response.start':
+                cabecalhos = {nome.lower(): valor for nome, valor in mensagem.get('headers', [])}
+                tipo = cabecalhos.get(b'content-type', b'').decode('latin-1')
+                if (
+                    b'content-encoding' in cabecalhos
+                    or not tipo.startswith(TIPOS_COMPRIMIVEIS)
+                    or tipo.startswith(TIPOS_NAO_COMPRIMIVEIS)
+                ):
+                    await send(mensagem)
+                    return
+                # Aguardar o corpo para decidir se comprime
+                inicio_resposta = mensagem
+                return
+
+            if mensagem['type'] != 'http.response.body' or inicio_resposta is None:
+                await send(mensagem)
+                return
+
+            inicio, inicio_resposta = inicio_resposta, None
+            corpo = mensagem.get('body', b'')
+            if mensagem.get('more_body', False) or len(corpo) < ConfigEnvSetings.COMPRESSAO_TAMANHO_MINIMO:
+                await send(inicio)
+                await send(mensagem)
+                return
+
+            cabecalhos = [(nome, valor) for nome, valor in inicio.get('headers', []) if nome.lower() != b'content-length']
+            cabecalhos.append((b'vary', b'Accept-Encoding'))
+            if codificacao is not None:
+                corpo = comprimir(corpo, codificacao)
+                cabecalhos.append((b'content-encoding', codificacao.encode('latin-1')))
+            cabecalhos.append((b'content-length', str(len(corpo)).encode('latin-1')))
+
+            await send({**inicio, 'headers': cabecalhos})
+            await send({'type': 'http.response.body', 'body': corpo, 'more_body': False})
+
+        await self.app(scope, receive, enviar)
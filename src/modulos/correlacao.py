@@ -0,0 +1,69 @@
+import re
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+# IDs de correlação da requisição e do lote em andamento (propagados para
+# tarefas criadas a partir do contexto atual, ex: jobs de lote)
+id_requisicao: ContextVar[Optional[str]] = ContextVar('id_requisicao', default=None)
+id_lote: ContextVar[Optional[str]] = ContextVar('id_lote', default=None)
+
+CABECALHO_ID_REQUISICAO = 'X-Request-ID'
+
+# IDs recebidos do cliente/proxy só são aceitos se forem curtos e simples
+_ID_VALIDO = re.compile(r'^[A-Za-z0-9._-]{1,64}$')
+
+
+@contextmanager
+def contexto_lote(lote: Optional[str]) -> Iterator[None]:
+    """
+    Associa os logs do bloco (e das tarefas criadas nele) ao lote informado.
+
+    Args:
+        lote: ID do lote; se None, mantém o contexto atual
+    """
+    if lote is None:
+        yield
+        return
+    token = id_lote.set(lote)
+    try:
+        yield
+    finally:
+        id_lote.reset(token)
+
+
+class MiddlewareCorrelacao:
+    """
+    Middleware ASGI que atribui um ID a cada requisição (reaproveitando o
+    cabeçalho X-Request-ID, se válido), disponibiliza-o para os logs e o
+    devolve no cabeçalho da resposta.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        recebido = None
+        for nome, valor in scope['headers']:
+            if nome == b'x-request-id':
+                recebido = valor.decode('latin-1')
+                break
+        identificador = recebido if recebido and _ID_VALIDO.match(recebido) else uuid.uuid4().hex
+
+        async def enviar(mensagem):
+            if mensagem['type'] == 'http.response.start':
+                mensagem['headers'] = list(mensagem.get('headers', [])) + [
+                    (CABECALHO_ID_REQUISICAO.lower().encode('latin-1'), identificador.encode('latin-1'))
+                ]
+            await send(mensagem)
+
+        token = id_requisicao.set(identificador)
+        try:
+            await self.app(scope, receive, enviar)
+        finally:
+            id_requisicao.reset(token)
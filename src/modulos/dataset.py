@@ -0,0 +1,246 @@
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+from src.modulos.logger import logger
+from src.classes.tipos import ConfigEnvSetings
+
+# Custo estimado de uma referência em lista (bytes)
+_TAMANHO_REFERENCIA = 8
+
+
+class LimiteDatasetExcedido(Exception):
+    """Erro lançado quando uma planilha excede o limite de memória por dataset."""
+
+
+class DadosPlanilha:
+    """
+    Linhas de uma planilha em formato colunar, indexadas pelo número da linha.
+
+    Cada coluna (letra: A, B, ...) é uma lista de valores alinhada com `linhas`;
+    células vazias ficam como None. O índice `linha -> posição` permite buscar
+    qualquer linha em O(1).
+    """
+
+    def __init__(self, limite_bytes: Optional[int] = None):
+        """
+        Inicializa o dataset vazio.
+
+        Args:
+            limite_bytes: Tamanho máximo estimado em memória; None desativa o limite
+        """
+        self.limite_bytes = limite_bytes
+        self.linhas: List[int] = []
+        self.colunas: Dict[str, List[Optional[str]]] = {}
+        self.tamanho_bytes = 0
+        # SHA-256 do arquivo de origem (identidade do conteúdo), quando conhecido
+        self.sha256: Optional[str] = None
+        self._indice: Dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.linhas)
+
+    def __getstate__(self) -> Dict:
+        # Serialização compacta (ex: envio entre processos): o índice é
+        # reconstruído a partir de `linhas` no destino
+        estado = self.__dict__.copy()
+        del estado['_indice']
+        return estado
+
+    def __setstate__(self, estado: Dict):
+        self.__dict__.update(estado)
+        self._indice = {numero_linha: posicao for posicao, numero_linha in enumerate(self.linhas)}
+
+    def recorte(self, colunas: List[str]) -> 'DadosPlanilha':
+        """
+        Retorna um dataset com todas as linhas e apenas as colunas informadas
+        (as listas de valores são compartilhadas, sem cópia).
+
+        Args:
+            colunas: Letras das colunas a manter (as inexistentes são ignoradas)
+
+        Returns:
+            Novo dataset
+        """
+        recorte = DadosPlanilha(self.limite_bytes)
+        recorte.linhas = self.linhas
+        recorte.colunas = {letra: self.colunas[letra] for letra in colunas if letra in self.colunas}
+        recorte.tamanho_bytes = self.tamanho_bytes
+        recorte.sha256 = self.sha256
+        recorte._indice = self._indice
+        return recorte
+
+    def adicionar_linha(self, numero_linha: int, valores: Dict[str, str]):
+        """
+        Adiciona uma linha ao dataset.
+
+        Args:
+            numero_linha: Número da linha na planilha
+            valores: Valores da linha por letra de coluna (somente células preenchidas)
+
+        Raises:
+            LimiteDatasetExcedido: Se o tamanho estimado ultrapassar o limite
+        """
+        posicao = len(self.linhas)
+        self.linhas.append(numero_linha)
+        self._indice[numero_linha] = posicao
+
+        for letra, valor in valores.items():
+            coluna = self.colunas.get(letra)
+            if coluna is None:
+                coluna = [None] * posicao
+                self.colunas[letra] = coluna
+                self.tamanho_bytes += posicao * _TAMANHO_REFERENCIA
+            coluna.append(valor)
+            self.tamanho_bytes += sys.getsizeof(valor)
+
+        # Completar as colunas sem valor nesta linha
+        for coluna in self.colunas.values():
+            if len(coluna) <= posicao:
+                coluna.append(None)
+        self.tamanho_bytes += (len(self.colunas) + 2) * _TAMANHO_REFERENCIA
+
+        if self.limite_bytes and self.tamanho_bytes > self.limite_bytes:
+            raise LimiteDatasetExcedido(
+                f"Planilha excede o limite de {self.limite_bytes // (1024 * 1024)} MB em memória"
+            )
+
+    def contem(self, numero_linha: int) -> bool:
+        """Verifica se a linha existe no dataset."""
+        return numero_linha in self._indice
+
+    def posicao(self, numero_linha: int) -> Optional[int]:
+        """Retorna a posição da linha nas listas de colunas, ou None se não existir."""
+        return self._indice.get(numero_linha)
+
+    def valor(self, numero_linha: int, coluna: str) -> Optional[str]:
+        """
+        Retorna o valor de uma célula.
+
+        Args:
+            numero_linha: Número da linha na planilha
+            coluna: Letra da coluna (ex: "A")
+
+        Returns:
+            Valor da célula ou None se a linha/coluna não existir ou estiver vazia
+        """
+        posicao = self._indice.get(numero_linha)
+        valores_coluna = self.colunas.get(coluna)
+        if posicao is None or valores_coluna is None:
+            return None
+        return valores_coluna[posicao]
+
+    def obter_linha(self, numero_linha: int) -> Dict[str, str]:
+        """Retorna os valores preenchidos de uma linha por letra de coluna."""
+        posicao = self._indice.get(numero_linha)
+        if posicao is None:
+            return {}
+        return {
+            letra: valores[posicao]
+            for letra, valores in self.colunas.items()
+            if valores[posicao] is not None
+        }
+
+
+class ArmazemDatasets:
+    """
+    Armazena em memória os datasets de planilha processados por chave (o SHA-256
+    do arquivo, de modo que a mesma planilha não é processada duas vezes), com
+    expiração por inatividade (TTL) e descarte dos menos usados (LRU) quando
+    o limite de entradas ou de memória total é atingido.
+    """
+
+    def __init__(self, max_entradas: int, ttl_segundos: float, max_bytes: Optional[int] = None):
+        """
+        Inicializa o armazém.
+
+        Args:
+            max_entradas: Quantidade máxima de datasets mantidos
+            ttl_segundos: Tempo sem acesso após o qual um dataset expira
+            max_bytes: Tamanho total estimado máximo dos datasets; None desativa o limite
+        """
+        self.max_entradas = max_entradas
+        self.ttl_segundos = ttl_segundos
+        self.max_bytes = max_bytes
+        self.tamanho_bytes = 0
+        self._entradas: "OrderedDict[str, Tuple[DadosPlanilha, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def salvar(self, chave: str, dados: DadosPlanilha):
+        """
+        Salva (ou substitui) o dataset de uma chave.
+
+        Args:
+            chave: Chave do dataset
+            dados: Dataset da planilha
+        """
+        with self._lock:
+            anterior = self._entradas.pop(chave, None)
+            if anterior is not None:
+                self.tamanho_bytes -= anterior[0].tamanho_bytes
+            self._entradas[chave] = (dados, time.monotonic() + self.ttl_segundos)
+            self.tamanho_bytes += dados.tamanho_bytes
+            self._limpar(preservar=chave)
+
+    def obter(self, chave: str) -> Optional[DadosPlanilha]:
+        """
+        Retorna o dataset de uma chave, renovando sua expiração.
+
+        Args:
+            chave: Chave do dataset
+
+        Returns:
+            Dataset ou None se não existir/expirado
+        """
+        with self._lock:
+            entrada = self._entradas.get(chave)
+            if entrada is None:
+                return None
+            dados, expira_em = entrada
+            agora = time.monotonic()
+            if expira_em < agora:
+                self._descartar(chave)
+                return None
+            self._entradas[chave] = (dados, agora + self.ttl_segundos)
+            self._entradas.move_to_end(chave)
+            return dados
+
+    def remover(self, chave: str):
+        """Remove o dataset de uma chave, se existir."""
+        with self._lock:
+            if chave in self._entradas:
+                self._descartar(chave)
+
+    def _descartar(self, chave: str):
+        dados, _ = self._entradas.pop(chave)
+        self.tamanho_bytes -= dados.tamanho_bytes
+
+    def _limpar(self, preservar: str):
+        agora = time.monotonic()
+        expirados = [chave for chave, (_, expira_em) in self._entradas.items() if expira_em < agora]
+        for chave in expirados:
+            self._descartar(chave)
+        while len(self._entradas) > self.max_entradas:
+            chave = next(iter(self._entradas))
+            self._descartar(chave)
+            logger.info(f"Dataset '{chave}' descartado (limite de {self.max_entradas} entradas)")
+        # O dataset recém-salvo é mantido mesmo que sozinho ultrapasse o limite de memória
+        while self.max_bytes and self.tamanho_bytes > self.max_bytes and len(self._entradas) > 1:
+            chave = next(iter(self._entradas))
+            if chave == preservar:
+                break
+            self._descartar(chave)
+            logger.info(f"Dataset '{chave}' descartado (limite de memória dos datasets)")
+
+
+def novo_dataset() -> DadosPlanilha:
+    """Cria um dataset vazio com o limite de memória configurado."""
+    return DadosPlanilha(limite_bytes=int(ConfigEnvSetings.DATASET_MAX_MB * 1024 * 1024))
+
+
+armazem_datasets = ArmazemDatasets(
+    max_entradas=ConfigEnvSetings.DATASET_MAX_ENTRADAS,
+    ttl_segundos=ConfigEnvSetings.DATASET_TTL_SEGUNDOS,
+    max_bytes=int(ConfigEnvSetings.DATASET_CACHE_MAX_MB * 1024 * 1024)
+)
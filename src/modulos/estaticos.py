@@ -0,0 +1,175 @@
+import hashlib
+import mimetypes
+import os
+from typing import Dict, List
+from starlette.responses import Response
+from src.modulos.logger import logger
+from src.modulos.compressao import TIPOS_COMPRIMIVEIS, brotli, codificacoes_aceitas, comprimir
+
+# URLs com hash no nome nunca mudam de conteúdo: o navegador não precisa revalidar
+CACHE_IMUTAVEL = 'public, max-age=31536000, immutable'
+
+# Nome original (sem hash): revalidado a cada uso pelo ETag
+CACHE_REVALIDAR = 'no-cache'
+
+# Arquivos menores que isso (ou de tipos já comprimidos, ex: imagens) são servidos sem compressão
+TAMANHO_MINIMO_COMPRESSAO = 1024
+
+
+class ArquivoEstatico:
+    """Conteúdo de um arquivo estático com as variantes comprimidas (por codificação)."""
+
+    __slots__ = ('media_type', 'hash', 'variantes')
+
+    def __init__(self, conteudo: bytes, media_type: str, hash_conteudo: str):
+        self.media_type = media_type
+        self.hash = hash_conteudo
+        # Codificação (Content-Encoding) -> corpo; 'identity' é o original
+        self.variantes: Dict[str, bytes] = {'identity': conteudo}
+
+        if len(conteudo) >= TAMANHO_MINIMO_COMPRESSAO and media_type.startswith(TIPOS_COMPRIMIVEIS):
+            for codificacao in ('gzip', 'br') if brotli is not None else ('gzip',):
+                corpo = comprimir(conteudo, codificacao, maxima=True)
+                if len(corpo) < len(conteudo):
+                    self.variantes[codificacao] = corpo
+
+    def etag(self, codificacao: str) -> str:
+        # Cada representação tem seu próprio ETag (forte)
+        return f'"{self.hash}"' if codificacao == 'identity' else f'"{self.hash}-{codificacao}"'
+
+
+def _etags(if_none_match: str) -> List[str]:
+    """ETags do cabeçalho If-None-Match (comparação fraca: ignora o prefixo W/)."""
+    etags = []
+    for valor in if_none_match.split(','):
+        valor = valor.strip()
+        etags.append(valor[2:] if valor.startswith('W/') else valor)
+    return etags
+
+
+class ArquivosEstaticos:
+    """
+    Aplicação ASGI que serve os arquivos de um diretório a partir da memória.
+
+    Na inicialização, cada arquivo é lido uma vez e ganha um nome com o hash do
+    conteúdo (css/style.css -> css/style.<hash>.css) e variantes gzip (e brotli,
+    se o pacote estiver instalado). URLs com hash são servidas com cache
+    imutável; o nome original continua disponível, revalidado pelo ETag. As
+    páginas referenciam os nomes com hash pela função url_estatico.
+    """
+
+    def __init__(self, diretorio: str, prefixo: str = '/static'):
+        """
+        Lê e prepara os arquivos do diretório.
+
+        Args:
+            diretorio: Diretório dos arquivos estáticos
+            prefixo: Caminho em que a aplicação é montada
+        """
+        self.diretorio = diretorio
+        self.prefixo = prefixo
+        # Caminho relativo (original ou com hash) -> (arquivo, caminho tem hash)
+        self.arquivos: Dict[str, tuple] = {}
+        # Caminho original -> caminho com hash
+        self.versoes: Dict[str, str] = {}
+        self.construir()
+
+    def construir(self):
+        """Lê todos os arquivos do diretório e gera os nomes com hash e as variantes comprimidas."""
+        self.arquivos.clear()
+        self.versoes.clear()
+        total_original = total_comprimido = 0
+
+        for raiz, _, nomes in os.walk(self.diretorio):
+            for nome in sorted(nomes):
+                completo = os.path.join(raiz, nome)
+                relativo = os.path.relpath(completo, self.diretorio).replace(os.sep, '/')
+                with open(completo, 'rb') as arquivo:
+                    conteudo = arquivo.read()
+
+                hash_conteudo = hashlib.sha256(conteudo).hexdigest()[:12]
+                media_type = mimetypes.guess_type(nome)[0] or 'application/octet-stream'
+                estatico = ArquivoEstatico(conteudo, media_type, hash_conteudo)
+
+                base, extensao = os.path.splitext(relativo)
+                versionado = f'{base}.{hash_conteudo}{extensao}'
+                self.arquivos[relativo] = (estatico, False)
+                self.arquivos[versionado] = (estatico, True)
+                self.versoes[relativo] = versionado
+
+                total_original += len(conteudo)
+                total_comprimido += min(len(corpo) for corpo in estatico.variantes.values())
+
+        logger.info(
+            f"Arquivos estáticos preparados: {len(self.versoes)} arquivo(s), "
+            f"{total_original} bytes ({total_comprimido} comprimidos)"
+        )
+
+    def url(self, caminho: str) -> str:
+        """
+        URL com hash de um arquivo estático (ex: 'css/style.css').
+
+        Args:
+            caminho: Caminho relativo ao diretório de estáticos
+
+        Returns:
+            URL versionada; arquivos desconhecidos mantêm o caminho original
+        """
+        return f"{self.prefixo}/{self.versoes.get(caminho, caminho)}"
+
+    @staticmethod
+    def _caminho_relativo(scope) -> str:
+        """
+        Caminho do arquivo dentro da montagem. Conforme a versão do Starlette,
+        o Mount remove o prefixo de scope['path'] ou mantém o caminho completo
+        e informa o prefixo em scope['root_path'].
+        """
+        caminho = scope['path']
+        root_path = scope.get('root_path', '')
+        if root_path and caminho.startswith(root_path + '/'):
+            caminho = caminho[len(root_path):]
+        return caminho.lstrip('/')
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            return
+        if scope['method'] not in ('GET', 'HEAD'):
+            await Response(status_code=405, headers={'Allow': 'GET, HEAD'})(scope, receive, send)
+            return
+
+        encontrado = self.arquivos.get(self._caminho_relativo(scope))
+        if encontrado is None:
+            await Response('Not Found', status_code=404, media_type='text/plain')(scope, receive, send)
+            return
+        estatico, versionado = encontrado
+
+        cabecalhos_requisicao = {nome: valor for nome, valor in scope['headers']}
+        aceitas = codificacoes_aceitas(cabecalhos_requisicao.get(b'accept-encoding', b'').decode('latin-1'))
+        codificacao = next((c for c in ('br', 'gzip') if c in aceitas and c in estatico.variantes), 'identity')
+
+        etag = estatico.etag(codificacao)
+        headers = {
+            'Cache-Control': CACHE_IMUTAVEL if versionado else CACHE_REVALIDAR,
+            'ETag': etag,
+            'Vary': 'Accept-Encoding',
+        }
+        if_none_match = cabecalhos_requisicao.get(b'if-none-match', b'').decode('latin-1')
+        if if_none_match and (if_none_match.strip() == '*' or etag in _etags(if_none_match)):
+            await Response(status_code=304, headers=headers)(scope, receive, send)
+            return
+
+        if codificacao != 'identity':
+            headers['Content-Encoding'] = codificacao
+        corpo = estatico.variantes[codificacao]
+        if scope['method'] == 'HEAD':
+            headers['Content-Length'] = str(len(corpo))
+            corpo = b''
+        await Response(corpo, headers=headers, media_type=estatico.media_type)(scope, receive, send)
+
+
+arquivos_estaticos = ArquivosEstaticos("src/static")
+
+
+def url_estatico(caminho: str) -> str:
+    """Função disponível nos templates: {{ url_estatico('css/style.css') }}."""
+    return arquivos_estaticos.url(caminho)
@@ -0,0 +1,183 @@
+import asyncio
+import time
+import httpx
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+from src.modulos.logger import logger
+from src.modulos.http_client import obter_cliente_http
+from src.modulos.compressao import serializar_json
+from src.modulos.metricas import registro_metricas
+from src.modulos.resiliencia import disjuntor_funcionarios, executar_com_resiliencia
+from src.classes.tipos import ConfigEnvSetings, DadosFuncionario, PayloadFuncionario
+
+
+class CacheFuncionarios:
+    """
+    Cache em memória dos dados de funcionário por email, com expiração (TTL),
+    limite de entradas (LRU) e agrupamento de buscas simultâneas: várias
+    requisições pelo mesmo email aguardam uma única chamada à API.
+    """
+
+    def __init__(self, ttl_segundos: float, max_entradas: int):
+        """
+        Inicializa o cache.
+
+        Args:
+            ttl_segundos: Tempo de validade de cada entrada
+            max_entradas: Quantidade máxima de funcionários mantidos
+        """
+        self.ttl_segundos = ttl_segundos
+        self.max_entradas = max_entradas
+        self.acertos = 0
+        self.falhas = 0
+        self.agrupadas = 0
+        self._entradas: "OrderedDict[str, Tuple[DadosFuncionario, float]]" = OrderedDict()
+        self._em_andamento: Dict[str, asyncio.Task] = {}
+
+    async def obter(
+        self,
+        email: str,
+        buscar: Callable[[str], Awaitable[DadosFuncionario]]
+    ) -> DadosFuncionario:
+        """
+        Retorna os dados do funcionário, buscando na API apenas se necessário.
+
+        Args:
+            email: Email do funcionário
+            buscar: Função assíncrona que busca os dados na API
+
+        Returns:
+            Dados do funcionário
+
+        Raises:
+            Exceções da função de busca (erros não são armazenados no cache)
+        """
+        chave = email.lower()
+
+        entrada = self._entradas.get(chave)
+        if entrada is not None:
+            funcionario, expira_em = entrada
+            if expira_em >= time.monotonic():
+                self.acertos += 1
+                self._entradas.move_to_end(chave)
+                return funcionario
+            del self._entradas[chave]
+
+        tarefa = self._em_andamento.get(chave)
+        if tarefa is not None:
+            self.agrupadas += 1
+        else:
+            self.falhas += 1
+            tarefa = asyncio.ensure_future(buscar(email))
+            self._em_andamento[chave] = tarefa
+            tarefa.add_done_callback(lambda t: self._concluir_busca(chave, t))
+
+        # shield: o cancelamento de um chamador não cancela a busca dos demais
+        return await asyncio.shield(tarefa)
+
+    def _concluir_busca(self, chave: str, tarefa: asyncio.Task):
+        self._em_andamento.pop(chave, None)
+        if tarefa.cancelled() or tarefa.exception() is not None:
+            return
+        self._entradas[chave] = (tarefa.result(), time.monotonic() + self.ttl_segundos)
+        self._entradas.move_to_end(chave)
+        while len(self._entradas) > self.max_entradas:
+            self._entradas.popitem(last=False)
+
+    def invalidar(self, email: Optional[str] = None):
+        """
+        Remove um funcionário do cache, ou todos se email não for informado.
+
+        Args:
+            email: Email do funcionário
+        """
+        if email is None:
+            self._entradas.clear()
+        else:
+            self._entradas.pop(email.lower(), None)
+
+    def estatisticas(self) -> Dict:
+        """
+        Retorna contadores e o tamanho atual do cache. Buscas agrupadas
+        (que aguardaram uma chamada já em andamento) não contam como falha.
+        """
+        total = self.acertos + self.falhas + self.agrupadas
+        return {
+            'acertos': self.acertos,
+            'falhas': self.falhas,
+            'agrupadas': self.agrupadas,
+            'taxa_acerto': round((self.acertos + self.agrupadas) / total, 4) if total else 0.0,
+            'entradas': len(self._entradas),
+            'buscas_em_andamento': len(self._em_andamento),
+        }
+
+
+async def buscar_funcionario_api(email: str) -> DadosFuncionario:
+    """
+    Busca os dados do funcionário na API de funcionários.
+
+    Args:
+        email: Email do funcionário
+
+    Returns:
+        Dados do funcionário
+
+    Raises:
+        httpx.HTTPError: Em caso de falha na requisição (após as retentativas)
+        CircuitoAberto: Se a API de funcionários estiver indisponível
+    """
+    corpo = serializar_json(PayloadFuncionario(Email=email).model_dump())
+    headers = {
+        ConfigEnvSetings.API_NAME: ConfigEnvSetings.API_KEY,
+        'Content-Type': 'application/json'
+    }
+    
+    async def enviar() -> httpx.Response:
+        response = await obter_cliente_http().post(
+            ConfigEnvSetings.API_ENDPOINT_FUNCIONARIO,
+            content=corpo,
+            headers=headers
+        )
+        response.raise_for_status()
+        return response
+    
+    # Consulta sem efeito colateral: pode ser repetida após qualquer falha transitória
+    response = await executar_com_resiliencia(enviar, disjuntor_funcionarios, idempotente=True)
+    logger.info(f"Dados do funcionário obtidos da API para: {email}")
+    return DadosFuncionario(**response.json())
+
+
+cache_funcionarios = CacheFuncionarios(
+    ttl_segundos=ConfigEnvSetings.CACHE_FUNCIONARIO_TTL_SEGUNDOS,
+    max_entradas=ConfigEnvSetings.CACHE_FUNCIONARIO_MAX_ENTRADAS
+)
+
+registro_metricas.contador(
+    'cache_funcionarios_buscas_total', 'Buscas no cache de funcionários por resultado', ('resultado',),
+    funcao=lambda: {
+        ('acerto',): cache_funcionarios.acertos,
+        ('falha',): cache_funcionarios.falhas,
+        ('agrupada',): cache_funcionarios.agrupadas,
+    }
+)
+registro_metricas.medidor(
+    'cache_funcionarios_taxa_acerto', 'Taxa de acerto do cache de funcionários',
+    funcao=lambda: {(): cache_funcionarios.estatisticas()['taxa_acerto']}
+)
+registro_metricas.medidor(
+    'cache_funcionarios_entradas', 'Entradas no cache de funcionários',
+    funcao=lambda: {(): len(cache_funcionarios._entradas)}
+)
+
+
+async def obter_funcionario(email: str) -> DadosFuncionario:
+    """
+    Retorna os dados do funcionário usando o cache compartilhado.
+
+    Args:
+        email: Email do funcionário
+
+    Returns:
+        Dados do funcionário
+    """
+    return await cache_funcionarios.obter(email, buscar_funcionario_api)
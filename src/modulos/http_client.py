@@ -0,0 +1,66 @@
+import httpx
+from typing import Optional
+from src.modulos.logger import logger
+from src.classes.tipos import ConfigEnvSetings
+
+# Cliente HTTP compartilhado por todo o processo (pool de conexões keep-alive)
+_cliente: Optional[httpx.AsyncClient] = None
+
+
+def criar_cliente_http() -> httpx.AsyncClient:
+    """
+    Cria um cliente HTTP assíncrono com pool de conexões configurado via ConfigEnv.
+
+    Returns:
+        Instância de httpx.AsyncClient
+    """
+    limites = httpx.Limits(
+        max_connections=ConfigEnvSetings.HTTP_MAX_CONEXOES,
+        max_keepalive_connections=ConfigEnvSetings.HTTP_MAX_CONEXOES_KEEPALIVE,
+        keepalive_expiry=ConfigEnvSetings.HTTP_KEEPALIVE_EXPIRACAO
+    )
+    timeout = httpx.Timeout(
+        ConfigEnvSetings.HTTP_TIMEOUT,
+        connect=ConfigEnvSetings.HTTP_TIMEOUT_CONEXAO
+    )
+    return httpx.AsyncClient(limits=limites, timeout=timeout)
+
+
+async def iniciar_cliente_http() -> httpx.AsyncClient:
+    """
+    Inicializa o cliente HTTP compartilhado (chamado no lifespan da aplicação).
+
+    Returns:
+        Cliente HTTP compartilhado
+    """
+    global _cliente
+    if _cliente is None or _cliente.is_closed:
+        _cliente = criar_cliente_http()
+        logger.info(
+            f"Cliente HTTP iniciado (max_conexoes={ConfigEnvSetings.HTTP_MAX_CONEXOES}, "
+            f"keepalive={ConfigEnvSetings.HTTP_MAX_CONEXOES_KEEPALIVE})"
+        )
+    return _cliente
+
+
+async def fechar_cliente_http():
+    """Fecha o cliente HTTP compartilhado e libera as conexões do pool."""
+    global _cliente
+    if _cliente is not None:
+        await _cliente.aclose()
+        _cliente = None
+        logger.info("Cliente HTTP encerrado")
+
+
+def obter_cliente_http() -> httpx.AsyncClient:
+    """
+    Retorna o cliente HTTP compartilhado, criando-o se ainda não existir
+    (ex: uso fora do lifespan da aplicação, em scripts).
+
+    Returns:
+        Cliente HTTP compartilhado
+    """
+    global _cliente
+    if _cliente is None or _cliente.is_closed:
+        _cliente = criar_cliente_http()
+    return _cliente
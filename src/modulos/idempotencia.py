@@ -0,0 +1,215 @@
+import asyncio
+import hashlib
+import time
+from typing import Dict, List, Optional, Tuple
+from src.modulos.logger import logger
+from src.modulos.banco_local import banco_local, executar_banco
+from src.classes.tipos import ConfigEnvSetings
+
+# Limite de parâmetros por consulta IN (SQLite)
+_TAMANHO_CONSULTA = 500
+
+# Intervalo entre as limpezas dos registros fora da janela
+INTERVALO_LIMPEZA_SEGUNDOS = 3600.0
+
+# Estados de um hash no registro
+ESTADO_RESERVADO = 'reservado'
+ESTADO_CRIADO = 'criado'
+
+
+def calcular_hash_chamado(usuario: str, titulo: str, descricao: str) -> str:
+    """
+    Calcula o hash de conteúdo de um chamado renderizado.
+
+    Args:
+        usuario: Email do usuário
+        titulo: Título já com placeholders substituídos
+        descricao: Descrição já com placeholders substituídos
+
+    Returns:
+        Hash SHA-256 em hexadecimal
+    """
+    conteudo = '\x1f'.join((usuario.lower(), titulo, descricao))
+    return hashlib.sha256(conteudo.encode('utf-8')).hexdigest()
+
+
+class RegistroIdempotencia:
+    """
+    Registro local (SQLite, indexado por hash) dos chamados criados, usado para
+    não criar novamente um chamado idêntico dentro da janela configurada.
+
+    Antes do envio cada hash é reservado atomicamente (estado 'reservado', com o
+    dono da reserva); após o envio a reserva é confirmada (estado 'criado') ou,
+    em falha definitiva, liberada. Assim duas submissões simultâneas do mesmo
+    chamado não passam ambas pela verificação.
+    """
+
+    def __init__(self, janela_segundos: float, reserva_segundos: float):
+        """
+        Inicializa o registro e cria a tabela se necessário.
+
+        Args:
+            janela_segundos: Período em que um chamado idêntico é considerado duplicado;
+                0 desativa o registro
+            reserva_segundos: Período após o qual a reserva de um envio que não foi
+                concluído (ex: processo encerrado durante o envio) pode ser retomada
+                por outra submissão
+        """
+        self.janela_segundos = janela_segundos
+        self.reserva_segundos = reserva_segundos
+        self._tabela_criada = False
+        self._limpeza: Optional[asyncio.Task] = None
+
+    @property
+    def ativo(self) -> bool:
+        return self.janela_segundos > 0
+
+    def _criar_tabela(self, conexao):
+        if self._tabela_criada:
+            return
+        conexao.execute(
+            'CREATE TABLE IF NOT EXISTS chamados_criados ('
+            ' hash TEXT PRIMARY KEY,'
+            ' usuario TEXT NOT NULL,'
+            ' criado_em REAL NOT NULL,'
+            f" estado TEXT NOT NULL DEFAULT '{ESTADO_CRIADO}',"
+            ' dono TEXT)'
+        )
+        # Bancos criados antes das reservas
+        colunas = {linha['name'] for linha in conexao.execute('PRAGMA table_info(chamados_criados)')}
+        if 'estado' not in colunas:
+            conexao.execute(
+                f"ALTER TABLE chamados_criados ADD COLUMN estado TEXT NOT NULL DEFAULT '{ESTADO_CRIADO}'"
+            )
+        if 'dono' not in colunas:
+            conexao.execute('ALTER TABLE chamados_criados ADD COLUMN dono TEXT')
+        conexao.execute(
+            'CREATE INDEX IF NOT EXISTS idx_chamados_criados_criado_em ON chamados_criados (criado_em)'
+        )
+        self._tabela_criada = True
+
+    def reservar(self, hashes: List[str], usuario: str, dono: str) -> Dict[str, Tuple[str, float]]:
+        """
+        Reserva atomicamente os hashes a enviar (uma única transação). Um hash não
+        é reservado se já foi criado dentro da janela ou se está reservado por outro
+        dono; reservas expiradas e as do próprio dono (ex: lote retomado) são
+        assumidas.
+
+        Args:
+            hashes: Hashes de chamados (ver calcular_hash_chamado)
+            usuario: Email do usuário
+            dono: Identificador de quem envia (ex: ID do lote)
+
+        Returns:
+            Hashes não reservados -> (estado, timestamp da criação ou da reserva)
+        """
+        if not self.ativo or not hashes:
+            return {}
+        agora = time.time()
+        indisponiveis: Dict[str, Tuple[str, float]] = {}
+        with banco_local() as conexao:
+            self._criar_tabela(conexao)
+            conexao.executemany(
+                'INSERT INTO chamados_criados (hash, usuario, criado_em, estado, dono) VALUES (?, ?, ?, ?, ?) '
+                'ON CONFLICT (hash) DO UPDATE SET usuario = excluded.usuario, criado_em = excluded.criado_em, '
+                'estado = excluded.estado, dono = excluded.dono '
+                'WHERE chamados_criados.criado_em < ? OR (chamados_criados.estado = ? AND '
+                '(chamados_criados.criado_em < ? OR chamados_criados.dono = excluded.dono))',
+                [
+                    (hash_chamado, usuario, agora, ESTADO_RESERVADO, dono,
+                     agora - self.janela_segundos, ESTADO_RESERVADO, agora - self.reserva_segundos)
+                    for hash_chamado in hashes
+                ]
+            )
+            for inicio in range(0, len(hashes), _TAMANHO_CONSULTA):
+                parte = hashes[inicio:inicio + _TAMANHO_CONSULTA]
+                marcadores = ','.join('?' * len(parte))
+                for linha in conexao.execute(
+                    f'SELECT hash, criado_em, estado, dono FROM chamados_criados WHERE hash IN ({marcadores})',
+                    parte
+                ):
+                    if linha['estado'] != ESTADO_RESERVADO or linha['dono'] != dono:
+                        indisponiveis[linha['hash']] = (linha['estado'], linha['criado_em'])
+        return indisponiveis
+
+    def concluir(self, criados: List[str], falhos: List[str], usuario: str, dono: str):
+        """
+        Confirma as reservas dos chamados criados com sucesso e libera as dos que
+        falharam de forma definitiva (uma única transação). Reservas de envios com
+        resultado incerto não devem ser concluídas: ficam até expirar.
+
+        Args:
+            criados: Hashes dos chamados criados
+            falhos: Hashes dos chamados que certamente não foram criados
+            usuario: Email do usuário
+            dono: Identificador usado na reserva
+        """
+        if not self.ativo or not (criados or falhos):
+            return
+        agora = time.time()
+        try:
+            with banco_local() as conexao:
+                self._criar_tabela(conexao)
+                conexao.executemany(
+                    'INSERT OR REPLACE INTO chamados_criados (hash, usuario, criado_em, estado, dono) '
+                    'VALUES (?, ?, ?, ?, ?)',
+                    [(hash_chamado, usuario, agora, ESTADO_CRIADO, dono) for hash_chamado in criados]
+                )
+                conexao.executemany(
+                    'DELETE FROM chamados_criados WHERE hash = ? AND estado = ? AND dono = ?',
+                    [(hash_chamado, ESTADO_RESERVADO, dono) for hash_chamado in falhos]
+                )
+        except Exception as e:
+            logger.error(f"Erro ao concluir reserva(s) no registro de idempotência: {str(e)}")
+
+    def limpar_expirados(self) -> int:
+        """
+        Remove os registros fora da janela e as reservas expiradas.
+
+        Returns:
+            Quantidade de registros removidos
+        """
+        if not self.ativo:
+            return 0
+        with banco_local() as conexao:
+            self._criar_tabela(conexao)
+            agora = time.time()
+            cursor = conexao.execute(
+                'DELETE FROM chamados_criados WHERE criado_em < ? OR (estado = ? AND criado_em < ?)',
+                (agora - self.janela_segundos, ESTADO_RESERVADO, agora - self.reserva_segundos)
+            )
+            return cursor.rowcount
+
+    async def _limpar_periodicamente(self):
+        while True:
+            try:
+                removidos = await executar_banco(self.limpar_expirados)
+                if removidos:
+                    logger.info(f"Registro de idempotência: {removidos} registro(s) expirado(s) removido(s)")
+            except Exception as e:
+                logger.error(f"Erro ao limpar o registro de idempotência: {str(e)}")
+            await asyncio.sleep(INTERVALO_LIMPEZA_SEGUNDOS)
+
+    def iniciar_limpeza(self):
+        """
+        Inicia a remoção periódica (a cada INTERVALO_LIMPEZA_SEGUNDOS, a primeira
+        imediatamente) dos registros fora da janela. Chamado no lifespan da aplicação.
+        """
+        if self.ativo and (self._limpeza is None or self._limpeza.done()):
+            self._limpeza = asyncio.create_task(self._limpar_periodicamente())
+
+    async def encerrar(self):
+        """Interrompe a limpeza periódica."""
+        if self._limpeza is not None:
+            self._limpeza.cancel()
+            try:
+                await self._limpeza
+            except asyncio.CancelledError:
+                pass
+            self._limpeza = None
+
+
+registro_idempotencia = RegistroIdempotencia(
+    ConfigEnvSetings.IDEMPOTENCIA_JANELA_SEGUNDOS,
+    ConfigEnvSetings.IDEMPOTENCIA_RESERVA_SEGUNDOS
+)
@@ -0,0 +1,226 @@
+import asyncio
+import time
+import uuid
+from typing import Awaitable, Callable, Dict, Optional
+from src.modulos.logger import logger
+from src.modulos.correlacao import id_lote
+from src.modulos.metricas import registro_metricas
+from src.classes.tipos import ConfigEnvSetings
+
+
+class JobLote:
+    """
+    Representa um processamento de chamados em lote executado em segundo plano.
+    Mantém o progresso (linhas processadas, sucessos, erros) e notifica os
+    interessados (ex: stream SSE) a cada atualização.
+    """
+
+    def __init__(self, usuario: str, job_id: Optional[str] = None):
+        """
+        Inicializa o job.
+
+        Args:
+            usuario: Email do usuário dono do job
+            job_id: ID do job (padrão: gerado automaticamente)
+        """
+        self.id = job_id or uuid.uuid4().hex
+        self.usuario = usuario
+        self.status = 'pendente'
+        self.total = 0
+        self.processados = 0
+        self.sucessos = 0
+        self.erros = 0
+        self.duplicados = 0
+        self.indeterminados = 0
+        self.mensagem = ''
+        self.criado_em = time.time()
+        self.iniciado_em: Optional[float] = None
+        self.finalizado_em: Optional[float] = None
+        self.resultado: Optional[Dict] = None
+        self._atualizado = asyncio.Event()
+
+    @property
+    def finalizado(self) -> bool:
+        return self.status in ('concluido', 'erro')
+
+    def iniciar(self, total: int):
+        """Registra o total de linhas a processar."""
+        self.total = total
+        self.notificar()
+
+    def registrar_linha(self, detalhe: Dict):
+        """Registra o resultado de uma linha processada."""
+        self.processados += 1
+        status = detalhe.get('status') or ('sucesso' if detalhe.get('sucesso') else 'erro')
+        if status == 'sucesso':
+            self.sucessos += 1
+        elif status == 'duplicado':
+            self.duplicados += 1
+        elif status == 'indeterminado':
+            self.indeterminados += 1
+        else:
+            self.erros += 1
+        self.notificar()
+
+    def notificar(self):
+        """Acorda quem está aguardando atualizações deste job."""
+        self._atualizado.set()
+        self._atualizado = asyncio.Event()
+
+    async def aguardar_atualizacao(self, timeout: float):
+        """
+        Aguarda a próxima atualização do job.
+
+        Args:
+            timeout: Tempo máximo de espera em segundos
+        """
+        evento = self._atualizado
+        try:
+            await asyncio.wait_for(evento.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    def eta_segundos(self) -> Optional[float]:
+        """Estimativa de tempo restante em segundos, baseada na vazão até agora."""
+        if self.finalizado:
+            return 0.0
+        if not self.iniciado_em or not self.processados or not self.total:
+            return None
+        decorrido = time.time() - self.iniciado_em
+        return round(decorrido / self.processados * (self.total - self.processados), 1)
+
+    def para_dict(self) -> Dict:
+        """Representação serializável do estado do job."""
+        return {
+            'job_id': self.id,
+            'status': self.status,
+            'total': self.total,
+            'processados': self.processados,
+            'sucessos': self.sucessos,
+            'erros': self.erros,
+            'duplicados': self.duplicados,
+            'indeterminados': self.indeterminados,
+            'eta_segundos': self.eta_segundos(),
+            'mensagem': self.mensagem,
+        }
+
+
+class GerenciadorJobs:
+    """
+    Gerencia os jobs de lote em memória: criação, execução em segundo plano,
+    consulta e limpeza dos jobs finalizados.
+    """
+
+    def __init__(self, retencao_segundos: float):
+        """
+        Inicializa o gerenciador.
+
+        Args:
+            retencao_segundos: Tempo que um job finalizado fica disponível para consulta
+        """
+        self.retencao_segundos = retencao_segundos
+        self._jobs: Dict[str, JobLote] = {}
+        self._tarefas: Dict[str, asyncio.Task] = {}
+
+    def criar(
+        self,
+        usuario: str,
+        executar: Callable[[JobLote], Awaitable[Dict]],
+        job_id: Optional[str] = None
+    ) -> JobLote:
+        """
+        Cria um job e inicia sua execução em segundo plano.
+
+        Args:
+            usuario: Email do usuário dono do job
+            executar: Função assíncrona que recebe o job, atualiza seu progresso
+                e retorna o resultado final do lote
+            job_id: ID do job (ex: ID de um lote retomado); padrão: gerado automaticamente
+
+        Returns:
+            Job criado
+        """
+        self._limpar_expirados()
+        job = JobLote(usuario, job_id)
+        self._jobs[job.id] = job
+        self._tarefas[job.id] = asyncio.create_task(self._executar(job, executar))
+        logger.info(f"Job de lote {job.id} criado para {usuario}")
+        return job
+
+    def obter(self, job_id: str, usuario: Optional[str] = None) -> Optional[JobLote]:
+        """
+        Retorna um job pelo ID.
+
+        Args:
+            job_id: ID do job
+            usuario: Se informado, só retorna o job se pertencer a este usuário
+
+        Returns:
+            Job encontrado ou None
+        """
+        job = self._jobs.get(job_id)
+        if job is None or (usuario is not None and job.usuario != usuario):
+            return None
+        return job
+
+    def em_execucao(self, job_id: str) -> bool:
+        """Verifica se o job está em execução neste processo."""
+        return job_id in self._tarefas
+
+    async def _executar(self, job: JobLote, executar: Callable[[JobLote], Awaitable[Dict]]):
+        # A tarefa tem sua própria cópia do contexto: o ID vale só para os logs deste job
+        id_lote.set(job.id)
+        job.status = 'executando'
+        job.iniciado_em = time.time()
+        job.notificar()
+        try:
+            job.resultado = await executar(job)
+            job.status = 'concluido'
+            job.mensagem = f"{job.sucessos} chamado(s) criado(s) com sucesso!"
+            if job.erros > 0:
+                job.mensagem += f" {job.erros} chamado(s) falharam."
+            if job.duplicados > 0:
+                job.mensagem += f" {job.duplicados} chamado(s) duplicado(s) ignorado(s)."
+            if job.indeterminados > 0:
+                job.mensagem += (
+                    f" {job.indeterminados} chamado(s) sem confirmação de criação "
+                    f"(verifique no Fluig; não são reenviados ao reprocessar falhas)."
+                )
+        except asyncio.CancelledError:
+            job.status = 'erro'
+            job.mensagem = 'Processamento cancelado'
+            raise
+        except Exception as e:
+            logger.error(f"Erro no job de lote {job.id}: {str(e)}")
+            job.status = 'erro'
+            job.mensagem = f"Erro ao processar lote: {str(e)}"
+        finally:
+            job.finalizado_em = time.time()
+            self._tarefas.pop(job.id, None)
+            job.notificar()
+            logger.info(f"Job de lote {job.id} finalizado: {job.status}")
+
+    def _limpar_expirados(self):
+        agora = time.time()
+        expirados = [
+            job_id for job_id, job in self._jobs.items()
+            if job.finalizado and job.finalizado_em and agora - job.finalizado_em > self.retencao_segundos
+        ]
+        for job_id in expirados:
+            del self._jobs[job_id]
+
+    async def encerrar(self):
+        """Cancela os jobs em execução (chamado no encerramento da aplicação)."""
+        tarefas = list(self._tarefas.values())
+        for tarefa in tarefas:
+            tarefa.cancel()
+        if tarefas:
+            await asyncio.gather(*tarefas, return_exceptions=True)
+
+
+gerenciador_jobs = GerenciadorJobs(ConfigEnvSetings.JOBS_RETENCAO_SEGUNDOS)
+
+registro_metricas.medidor(
+    'jobs_lote_em_execucao', 'Jobs de lote em execução',
+    funcao=lambda: {(): len(gerenciador_jobs._tarefas)}
+)
@@ -0,0 +1,35 @@
+import asyncio
+import time
+from typing import Optional
+
+
+class LimitadorTaxa:
+    """
+    Limita a taxa de requisições (requisições por segundo) de forma assíncrona.
+    As requisições são espaçadas uniformemente; taxa 0 ou None desativa o limite.
+    """
+
+    def __init__(self, requisicoes_por_segundo: Optional[float]):
+        """
+        Inicializa o limitador.
+
+        Args:
+            requisicoes_por_segundo: Quantidade máxima de requisições por segundo
+        """
+        self.requisicoes_por_segundo = requisicoes_por_segundo or 0
+        self.intervalo = 1.0 / requisicoes_por_segundo if requisicoes_por_segundo and requisicoes_por_segundo > 0 else 0.0
+        self._proxima_liberacao = 0.0
+        self._lock = asyncio.Lock()
+
+    async def aguardar(self):
+        """Aguarda até que a próxima requisição possa ser enviada."""
+        if not self.intervalo:
+            return
+
+        async with self._lock:
+            agora = time.monotonic()
+            espera = self._proxima_liberacao - agora
+            self._proxima_liberacao = max(agora, self._proxima_liberacao) + self.intervalo
+
+        if espera > 0:
+            await asyncio.sleep(espera)
@@ -1,42 +1,310 @@
+import atexit
+import json
 import logging
+import os
+import queue
+import threading
+import time
 from pathlib import Path
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Dict, Optional, Tuple
+from src.classes.tipos import ConfigEnvSetings
+from src.modulos.correlacao import id_lote, id_requisicao
+
+try:
+    import fcntl
+except ImportError:  # Windows: sem trava entre processos
+    fcntl = None
 
 # Criar diretório de logs se não existir
 log_dir = Path("logs")
 log_dir.mkdir(exist_ok=True)
 
+# Atributos padrão do LogRecord (o que sobrar veio de `extra` e vai para o JSON)
+_ATRIBUTOS_PADRAO = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {
+    'message', 'asctime', 'amostragem', 'id_requisicao', 'id_lote', 'taskName'
+}
+
+
+class FormatadorJSON(logging.Formatter):
+    """
+    Formata cada registro como uma linha JSON com data, nível, mensagem, IDs
+    de correlação (requisição e lote) e os campos passados em `extra`
+    (ex: linha, status, latencia_ms).
+    """
+
+    def format(self, record) -> str:
+        dados = {
+            'data': self.formatTime(record, '%Y-%m-%dT%H:%M:%S') + f'.{int(record.msecs):03d}',
+            'nivel': record.levelname,
+            'logger': record.name,
+            'mensagem': record.getMessage(),
+        }
+        if getattr(record, 'id_requisicao', None):
+            dados['id_requisicao'] = record.id_requisicao
+        if getattr(record, 'id_lote', None):
+            dados['id_lote'] = record.id_lote
+        for chave, valor in vars(record).items():
+            if chave not in _ATRIBUTOS_PADRAO and not chave.startswith('_'):
+                dados[chave] = valor
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            dados['excecao'] = record.exc_text
+        return json.dumps(dados, ensure_ascii=False, default=str)
+
+
+class FiltroCorrelacao(logging.Filter):
+    """
+    Copia os IDs de correlação do contexto atual para o registro. Fica no
+    QueueHandler, ou seja, roda no momento do log (na thread/tarefa que
+    gerou o registro), e não na thread que grava os logs.
+    """
+
+    def filter(self, record) -> bool:
+        record.id_requisicao = id_requisicao.get()
+        record.id_lote = id_lote.get()
+        return True
+
+
 # Configurar formato de log
-log_format = logging.Formatter(
-    '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    datefmt='%Y-%m-%d %H:%M:%S'
-)
+if ConfigEnvSetings.LOG_FORMATO.lower() == 'json':
+    log_format = FormatadorJSON()
+else:
+    log_format = logging.Formatter(
+        '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S'
+    )
 
-# Configurar logger raiz
-logger = logging.getLogger("api_fluig")
-logger.setLevel(logging.INFO)
 
-# Evitar duplicação de handlers
-if not logger.handlers:
+class RotatingFileHandlerMultiprocesso(RotatingFileHandler):
+    """
+    RotatingFileHandler seguro para vários processos (workers) escrevendo no
+    mesmo arquivo: cada escrita é feita sob uma trava de arquivo (fcntl), o
+    tamanho é lido do disco e o arquivo é reaberto quando outro processo já
+    fez a rotação.
+    """
+
+    def __init__(self, filename, *args, **kwargs):
+        super().__init__(filename, *args, **kwargs)
+        self._arquivo_trava = open(f"{self.baseFilename}.lock", 'a')
+
+    def _arquivo_rotacionado(self) -> bool:
+        if self.stream is None:
+            return False
+        try:
+            atual = os.stat(self.baseFilename)
+        except FileNotFoundError:
+            return True
+        aberto = os.fstat(self.stream.fileno())
+        return (atual.st_ino, atual.st_dev) != (aberto.st_ino, aberto.st_dev)
+
+    def shouldRollover(self, record) -> bool:
+        if self.maxBytes <= 0:
+            return False
+        try:
+            tamanho = os.path.getsize(self.baseFilename)
+        except OSError:
+            return False
+        return tamanho + len(self.format(record)) + 1 >= self.maxBytes
+
+    def emit(self, record):
+        if fcntl is None:
+            super().emit(record)
+            return
+        try:
+            fcntl.flock(self._arquivo_trava, fcntl.LOCK_EX)
+            try:
+                if self._arquivo_rotacionado():
+                    self.stream.close()
+                    self.stream = self._open()
+                super().emit(record)
+            finally:
+                fcntl.flock(self._arquivo_trava, fcntl.LOCK_UN)
+        except Exception:
+            self.handleError(record)
+
+    def close(self):
+        super().close()
+        self._arquivo_trava.close()
+
+
+class FiltroAmostragem(logging.Filter):
+    """
+    Limita mensagens repetitivas de progresso/diagnóstico (ex: retentativas,
+    colunas ausentes). Registros com o atributo `amostragem` (passado em `extra`)
+    são agrupados por essa chave: dentro de cada janela só os primeiros `limite`
+    são emitidos e, quando a janela termina (ou no encerramento dos logs), um
+    resumo informa quantos foram suprimidos. Registros sem a chave (ex: o
+    resultado de cada chamado) nunca são suprimidos.
+    """
+
+    def __init__(self, limite: int, janela_segundos: float):
+        """
+        Inicializa o filtro.
+
+        Args:
+            limite: Mensagens emitidas por chave a cada janela; 0 desativa o filtro
+            janela_segundos: Duração da janela em segundos
+        """
+        super().__init__()
+        self.limite = limite
+        self.janela_segundos = janela_segundos
+        # Handler que recebe os resumos (o mesmo em que o filtro está instalado)
+        self.destino: Optional[logging.Handler] = None
+        # chave -> [início da janela, emitidas, suprimidas, primeiro registro suprimido]
+        self._janelas: Dict[str, list] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record) -> bool:
+        chave = getattr(record, 'amostragem', None)
+        if chave is None or self.limite <= 0:
+            return True
+
+        agora = time.monotonic()
+        resumo = None
+        with self._lock:
+            janela = self._janelas.get(chave)
+            if janela is not None and agora - janela[0] >= self.janela_segundos:
+                # Janela encerrada antes do temporizador: resumo emitido aqui
+                resumo = self._encerrar_janela(chave)
+                janela = None
+            if janela is None:
+                self._janelas[chave] = [agora, 1, 0, None]
+                emitir = True
+            elif janela[1] < self.limite:
+                janela[1] += 1
+                emitir = True
+            else:
+                janela[2] += 1
+                if janela[3] is None:
+                    janela[3] = record
+                    # Resumo ao fim da janela, mesmo que não chegue outra mensagem
+                    temporizador = threading.Timer(
+                        max(0.0, janela[0] + self.janela_segundos - agora),
+                        self._fechar_janela,
+                        args=(chave, janela[0])
+                    )
+                    temporizador.daemon = True
+                    temporizador.start()
+                emitir = False
+        if resumo is not None:
+            self._emitir(resumo)
+        return emitir
+
+    def _encerrar_janela(self, chave: str) -> Optional[logging.LogRecord]:
+        """Remove a janela da chave e monta o resumo, se houve supressão (sob o lock)."""
+        janela = self._janelas.pop(chave, None)
+        if janela is None or not janela[2]:
+            return None
+        modelo = janela[3]
+        resumo = logging.LogRecord(
+            modelo.name, modelo.levelno, modelo.pathname, modelo.lineno,
+            f"{janela[2]} mensagem(ns) semelhante(s) a \"{modelo.getMessage()}\" "
+            f"suprimida(s) em {self.janela_segundos:g}s",
+            None, None
+        )
+        resumo.suprimidas = janela[2]
+        resumo.chave_amostragem = chave
+        return resumo
+
+    def _fechar_janela(self, chave: str, inicio: float):
+        with self._lock:
+            janela = self._janelas.get(chave)
+            resumo = self._encerrar_janela(chave) if janela is not None and janela[0] == inicio else None
+        if resumo is not None:
+            self._emitir(resumo)
+
+    def _emitir(self, resumo: logging.LogRecord):
+        if self.destino is not None:
+            self.destino.handle(resumo)
+
+    def descarregar(self):
+        """Emite o resumo de todas as janelas com mensagens suprimidas (ex: no encerramento)."""
+        with self._lock:
+            resumos = [self._encerrar_janela(chave) for chave in list(self._janelas)]
+        for resumo in resumos:
+            if resumo is not None:
+                self._emitir(resumo)
+
+    def reiniciar(self):
+        """Descarta as janelas (processo filho após fork: o pai emite os resumos)."""
+        with self._lock:
+            self._janelas.clear()
+
+
+def _criar_handlers() -> Tuple[logging.Handler, ...]:
     # Handler para arquivo com rotação
     log_file = log_dir / "api_fluig.log"
-    file_handler = RotatingFileHandler(
+    file_handler = RotatingFileHandlerMultiprocesso(
         log_file,
         maxBytes=10 * 1024 * 1024,  # 10MB
         backupCount=5,
         encoding='utf-8'
     )
-    file_handler.setLevel(logging.INFO)
     file_handler.setFormatter(log_format)
-    
+
     # Handler para console
     console_handler = logging.StreamHandler()
-    console_handler.setLevel(logging.INFO)
     console_handler.setFormatter(log_format)
-    
-    # Adicionar handlers ao logger
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
+
+    return file_handler, console_handler
+
+
+# Configurar logger raiz
+logger = logging.getLogger("api_fluig")
+logger.setLevel(ConfigEnvSetings.LOG_NIVEL.upper())
+
+_listener = None
+_filtro_amostragem: Optional[FiltroAmostragem] = None
+
+
+def _iniciar_listener(queue_handler: QueueHandler):
+    """Cria a fila e a thread que grava os registros enfileirados."""
+    global _listener
+    queue_handler.queue = queue.SimpleQueue()
+    _listener = QueueListener(queue_handler.queue, *_criar_handlers(), respect_handler_level=True)
+    _listener.start()
+
+
+# Evitar duplicação de handlers
+if not logger.handlers:
+    # O event loop só enfileira o registro; a escrita em arquivo/console
+    # (e a rotação) acontece na thread do QueueListener
+    queue_handler = QueueHandler(None)
+    _filtro_amostragem = FiltroAmostragem(
+        ConfigEnvSetings.LOG_AMOSTRAGEM_LIMITE,
+        ConfigEnvSetings.LOG_AMOSTRAGEM_JANELA_SEGUNDOS
+    )
+    _filtro_amostragem.destino = queue_handler
+    queue_handler.addFilter(_filtro_amostragem)
+    queue_handler.addFilter(FiltroCorrelacao())
+    logger.addHandler(queue_handler)
+    _iniciar_listener(queue_handler)
+
+    def _apos_fork():
+        _filtro_amostragem.reiniciar()
+        _iniciar_listener(queue_handler)
+
+    # Threads não sobrevivem ao fork: workers criados por fork recriam a fila e o listener
+    if hasattr(os, 'register_at_fork'):
+        os.register_at_fork(after_in_child=_apos_fork)
+
+
+def encerrar_logs():
+    """Grava os registros pendentes na fila e encerra a thread de logs."""
+    global _listener
+    if _filtro_amostragem is not None:
+        # Resumos das janelas ainda abertas antes de parar a thread de logs
+        _filtro_amostragem.descarregar()
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+atexit.register(encerrar_logs)
 
 # Desabilitar propagação para evitar logs duplicados
-logger.propagate = False
\ No newline at end of file
+logger.propagate = False
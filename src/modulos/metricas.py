@@ -0,0 +1,320 @@
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Buckets padrão de latência (segundos)
+BUCKETS_LATENCIA = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Buckets para operações longas (processamento de planilhas, lotes)
+BUCKETS_LONGOS = (0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1800.0)
+
+
+def _escapar(valor: str) -> str:
+    return str(valor).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _formatar_rotulos(nomes: Sequence[str], valores: Sequence[str], extra: str = '') -> str:
+    pares = [f'{nome}="{_escapar(valor)}"' for nome, valor in zip(nomes, valores)]
+    if extra:
+        pares.append(extra)
+    return '{' + ','.join(pares) + '}' if pares else ''
+
+
+def _formatar_numero(valor: float) -> str:
+    if valor == float('inf'):
+        return '+Inf'
+    if float(valor).is_integer():
+        return str(int(valor))
+    return repr(float(valor))
+
+
+class _Metrica:
+    tipo = ''
+
+    def __init__(self, nome: str, descricao: str, rotulos: Sequence[str] = ()):
+        self.nome = nome
+        self.descricao = descricao
+        self.rotulos = tuple(rotulos)
+        self._lock = threading.Lock()
+
+    def _chave(self, rotulos: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(rotulos.get(nome, '')) for nome in self.rotulos)
+
+    def _amostras(self) -> List[str]:
+        raise NotImplementedError
+
+    def exportar(self) -> str:
+        linhas = [
+            f'# HELP {self.nome} {self.descricao}',
+            f'# TYPE {self.nome} {self.tipo}',
+        ]
+        linhas.extend(self._amostras())
+        return '\n'.join(linhas)
+
+
+class _MetricaSimples(_Metrica):
+    def __init__(
+        self,
+        nome: str,
+        descricao: str,
+        rotulos: Sequence[str] = (),
+        funcao: Optional[Callable[[], Dict[Tuple[str, ...], float]]] = None
+    ):
+        """
+        Args:
+            nome: Nome da métrica
+            descricao: Texto de ajuda
+            rotulos: Nomes dos rótulos
+            funcao: Se informada, a métrica é lida desta função na exportação,
+                que retorna {valores dos rótulos: valor}
+        """
+        super().__init__(nome, descricao, rotulos)
+        self._valores: Dict[Tuple[str, ...], float] = {}
+        self._funcao = funcao
+
+    def _amostras(self) -> List[str]:
+        if self._funcao is not None:
+            valores = list(self._funcao().items())
+        else:
+            with self._lock:
+                valores = list(self._valores.items())
+        return [
+            f'{self.nome}{_formatar_rotulos(self.rotulos, chave)} {_formatar_numero(valor)}'
+            for chave, valor in valores
+        ]
+
+
+class Contador(_MetricaSimples):
+    """
+    Contador monotônico, opcionalmente separado por rótulos. Pode ser lido de
+    uma função na exportação (ex: contadores já mantidos pelo cache).
+    """
+
+    tipo = 'counter'
+
+    def incrementar(self, valor: float = 1, **rotulos):
+        """
+        Incrementa o contador.
+
+        Args:
+            valor: Quantidade a somar
+            **rotulos: Valores dos rótulos da série
+        """
+        chave = self._chave(rotulos)
+        with self._lock:
+            self._valores[chave] = self._valores.get(chave, 0) + valor
+
+
+class Medidor(_MetricaSimples):
+    """
+    Valor instantâneo (gauge). Pode ser definido diretamente ou lido de uma
+    função na exportação (ex: jobs em execução, taxa de acerto do cache).
+    """
+
+    tipo = 'gauge'
+
+    def definir(self, valor: float, **rotulos):
+        """Define o valor atual da série."""
+        chave = self._chave(rotulos)
+        with self._lock:
+            self._valores[chave] = valor
+
+
+class Histograma(_Metrica):
+    """Histograma de valores (ex: latência em segundos) com buckets fixos."""
+
+    tipo = 'histogram'
+
+    def __init__(
+        self,
+        nome: str,
+        descricao: str,
+        rotulos: Sequence[str] = (),
+        buckets: Sequence[float] = BUCKETS_LATENCIA
+    ):
+        super().__init__(nome, descricao, rotulos)
+        self.buckets = tuple(sorted(buckets))
+        # Por série: [contagem por bucket (não cumulativa) + bucket +Inf, soma]
+        self._series: Dict[Tuple[str, ...], Tuple[List[int], List[float]]] = {}
+
+    def observar(self, valor: float, **rotulos):
+        """
+        Registra uma observação.
+
+        Args:
+            valor: Valor observado
+            **rotulos: Valores dos rótulos da série
+        """
+        chave = self._chave(rotulos)
+        indice = bisect_left(self.buckets, valor)
+        with self._lock:
+            serie = self._series.get(chave)
+            if serie is None:
+                serie = self._series[chave] = ([0] * (len(self.buckets) + 1), [0.0])
+            serie[0][indice] += 1
+            serie[1][0] += valor
+
+    @contextmanager
+    def cronometrar(self, **rotulos) -> Iterator[Dict[str, str]]:
+        """
+        Mede a duração do bloco e registra ao final. Os rótulos podem ser
+        alterados dentro do bloco pelo dicionário retornado (ex: resultado).
+        """
+        inicio = time.perf_counter()
+        try:
+            yield rotulos
+        finally:
+            self.observar(time.perf_counter() - inicio, **rotulos)
+
+    def _amostras(self) -> List[str]:
+        with self._lock:
+            series = [(chave, list(contagens), soma[0]) for chave, (contagens, soma) in self._series.items()]
+        linhas = []
+        for chave, contagens, soma in series:
+            acumulado = 0
+            for limite, contagem in zip(self.buckets + (float('inf'),), contagens):
+                acumulado += contagem
+                rotulos = _formatar_rotulos(self.rotulos, chave, f'le="{_formatar_numero(limite)}"')
+                linhas.append(f'{self.nome}_bucket{rotulos} {acumulado}')
+            rotulos = _formatar_rotulos(self.rotulos, chave)
+            linhas.append(f'{self.nome}_sum{rotulos} {_formatar_numero(soma)}')
+            linhas.append(f'{self.nome}_count{rotulos} {acumulado}')
+        return linhas
+
+
+class RegistroMetricas:
+    """Registro das métricas da aplicação, exportadas no formato texto do Prometheus."""
+
+    def __init__(self):
+        self._metricas: Dict[str, _Metrica] = {}
+
+    def _registrar(self, metrica: _Metrica) -> _Metrica:
+        if metrica.nome in self._metricas:
+            raise ValueError(f"Métrica '{metrica.nome}' já registrada")
+        self._metricas[metrica.nome] = metrica
+        return metrica
+
+    def contador(
+        self,
+        nome: str,
+        descricao: str,
+        rotulos: Sequence[str] = (),
+        funcao: Optional[Callable[[], Dict[Tuple[str, ...], float]]] = None
+    ) -> Contador:
+        return self._registrar(Contador(nome, descricao, rotulos, funcao))
+
+    def medidor(
+        self,
+        nome: str,
+        descricao: str,
+        rotulos: Sequence[str] = (),
+        funcao: Optional[Callable[[], Dict[Tuple[str, ...], float]]] = None
+    ) -> Medidor:
+        return self._registrar(Medidor(nome, descricao, rotulos, funcao))
+
+    def histograma(
+        self,
+        nome: str,
+        descricao: str,
+        rotulos: Sequence[str] = (),
+        buckets: Sequence[float] = BUCKETS_LATENCIA
+    ) -> Histograma:
+        return self._registrar(Histograma(nome, descricao, rotulos, buckets))
+
+    def exportar(self) -> str:
+        """Exporta todas as métricas no formato texto do Prometheus (0.0.4)."""
+        return '\n'.join(metrica.exportar() for metrica in self._metricas.values()) + '\n'
+
+
+class MiddlewareMetricas:
+    """
+    Middleware ASGI que mede a latência (até o início da resposta) e conta as
+    respostas de cada rota, usando o caminho da rota (ex: /chamado/lote/{job_id})
+    como rótulo para não criar uma série por URL.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        inicio = time.perf_counter()
+        caminho = scope['path']
+        status = {'codigo': 500, 'medido': False}
+
+        def registrar():
+            if status['medido']:
+                return
+            status['medido'] = True
+            rota = _rota_da_requisicao(scope, caminho)
+            metodo = scope['method']
+            http_requisicao_duracao.observar(time.perf_counter() - inicio, metodo=metodo, rota=rota)
+            http_requisicoes.incrementar(metodo=metodo, rota=rota, status=status['codigo'])
+            if status['codigo'] >= 500:
+                http_requisicoes_erros.incrementar(metodo=metodo, rota=rota)
+
+        async def enviar(mensagem):
+            if mensagem['type'] == 'http.response.start':
+                status['codigo'] = mensagem['status']
+                registrar()
+            await send(mensagem)
+
+        try:
+            await self.app(scope, receive, enviar)
+        finally:
+            registrar()
+
+
+def _rota_da_requisicao(scope, caminho: str) -> str:
+    rota = scope.get('route')
+    if rota is not None and getattr(rota, 'path', None):
+        return rota.path
+    if caminho.startswith('/static/'):
+        return '/static'
+    return 'nao_encontrada'
+
+
+registro_metricas = RegistroMetricas()
+
+# Rotas HTTP
+http_requisicoes = registro_metricas.contador(
+    'http_requisicoes_total', 'Requisições HTTP atendidas', ('metodo', 'rota', 'status')
+)
+http_requisicoes_erros = registro_metricas.contador(
+    'http_requisicoes_erros_total', 'Requisições HTTP com erro (5xx ou exceção)', ('metodo', 'rota')
+)
+http_requisicao_duracao = registro_metricas.histograma(
+    'http_requisicao_duracao_segundos', 'Latência das requisições HTTP até o início da resposta', ('metodo', 'rota')
+)
+
+# APIs externas (funcionário, chamado Fluig, Google token/userinfo)
+api_externa_duracao = registro_metricas.histograma(
+    'api_externa_duracao_segundos', 'Latência das chamadas às APIs externas (por tentativa)', ('api', 'resultado')
+)
+
+# Processamento de planilhas
+planilha_duracao = registro_metricas.histograma(
+    'planilha_processamento_segundos', 'Tempo de processamento das planilhas', buckets=BUCKETS_LONGOS
+)
+planilha_linhas = registro_metricas.contador(
+    'planilha_linhas_total', 'Linhas de planilha processadas'
+)
+planilha_linhas_por_segundo = registro_metricas.medidor(
+    'planilha_linhas_por_segundo', 'Vazão do processamento da última planilha'
+)
+
+# Lotes de chamados
+lote_duracao = registro_metricas.histograma(
+    'lote_duracao_segundos', 'Tempo de envio dos lotes de chamados', buckets=BUCKETS_LONGOS
+)
+lote_linhas = registro_metricas.contador(
+    'lote_linhas_total', 'Linhas de lote processadas', ('status',)
+)
+lote_linhas_por_segundo = registro_metricas.medidor(
+    'lote_linhas_por_segundo', 'Vazão do envio do último lote'
+)
@@ -0,0 +1,7 @@
+from fastapi.templating import Jinja2Templates
+from src.modulos.estaticos import url_estatico
+
+# Templates HTML compartilhados pela aplicação e pelas rotas, com as funções
+# disponíveis em todas as páginas
+templates = Jinja2Templates(directory="src/templates")
+templates.env.globals['url_estatico'] = url_estatico
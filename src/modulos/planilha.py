@@ -1,92 +1,309 @@
 import openpyxl,logging,os
-import configparser
-import os
+import codecs
+import csv
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+from openpyxl.utils import get_column_letter
+from src.modulos.logger import logger
+from src.modulos.metricas import planilha_duracao, planilha_linhas, planilha_linhas_por_segundo
+from src.modulos.dataset import DadosPlanilha, LimiteDatasetExcedido, novo_dataset
 
-PATH_TO_TEMP = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'temp.txt')
+# Bytes lidos do início de arquivos de texto para detectar codificação e delimitador
+TAMANHO_AMOSTRA_TEXTO = 64 * 1024
 
-class Planilha:
-    def __init__(self, caminho_arquivo):
+# Codificações tentadas (nesta ordem) em arquivos de texto sem BOM;
+# cp1252 cobre exportações do Excel em português
+CODIFICACOES_TEXTO = ('utf-8', 'cp1252', 'latin-1')
+
+DELIMITADORES_CSV = ',;\t|'
+
+
+def _letras_colunas(letras: List[str], quantidade: int):
+    """Completa a lista de letras de coluna (A, B, ..., AA) até a quantidade informada."""
+    while len(letras) < quantidade:
+        letras.append(get_column_letter(len(letras) + 1))
+
+
+class LeitorPlanilha:
+    """
+    Interface dos leitores de planilha: abre o arquivo, percorre as linhas em
+    streaming e fecha. Cada linha é entregue como (número da linha, valores
+    preenchidos por letra de coluna), de modo que os placeholders <A>, <B>, ...
+    funcionam igual para qualquer formato.
+    """
+
+    extensoes: Tuple[str, ...] = ()
+
+    def __init__(self, caminho_arquivo: str):
         self.caminho_arquivo = caminho_arquivo
+
+    def abrir(self):
+        raise NotImplementedError
+
+    def iterar_linhas(self) -> Iterator[Tuple[int, Dict[str, str]]]:
+        raise NotImplementedError
+
+    def fechar(self):
+        pass
+
+
+class LeitorXlsx(LeitorPlanilha):
+    """Leitor de .xlsx via openpyxl em modo somente leitura."""
+
+    extensoes = ('.xlsx',)
+
+    def __init__(self, caminho_arquivo: str):
+        super().__init__(caminho_arquivo)
         self.workbook = None
         self.sheet = None
-        self.config = configparser.ConfigParser()
-        self.config_temp()
-
-    def config_temp(self):
-        temp_dir = os.path.dirname(PATH_TO_TEMP)
-        if not os.path.exists(temp_dir):
-            os.makedirs(temp_dir, exist_ok=True)
-        if os.path.exists(PATH_TO_TEMP):
+
+    def abrir(self):
+        # Modo somente leitura: as linhas são lidas do arquivo sob demanda
+        self.workbook = openpyxl.load_workbook(self.caminho_arquivo, read_only=True)
+        self.sheet = self.workbook.active
+        # Ignorar dimensões gravadas no arquivo (podem estar incorretas)
+        self.sheet.reset_dimensions()
+
+    def iterar_linhas(self) -> Iterator[Tuple[int, Dict[str, str]]]:
+        """
+        Percorre a planilha linha a linha, sem montar os objetos de célula.
+
+        Yields:
+            Tupla (número da linha, valores preenchidos por letra de coluna);
+            linhas vazias são ignoradas
+        """
+        letras: List[str] = []
+        for numero_linha, valores in enumerate(self.sheet.iter_rows(values_only=True), start=1):
+            if not any(valores):
+                continue
+            _letras_colunas(letras, len(valores))
+            yield numero_linha, {
+                letras[indice]: str(valor)
+                for indice, valor in enumerate(valores)
+                if valor is not None
+            }
+
+    def fechar(self):
+        # Em modo somente leitura o arquivo fica aberto até o fechamento explícito
+        if self.workbook is not None:
+            self.workbook.close()
+
+
+class LeitorCsv(LeitorPlanilha):
+    """
+    Leitor de CSV/TSV em streaming (módulo csv), com detecção de codificação
+    (BOM, UTF-8, cp1252) e de delimitador (csv.Sniffer). A coluna N recebe a
+    mesma letra que teria no Excel e cada registro conta como uma linha, mesmo
+    com quebras de linha dentro de campos entre aspas.
+    """
+
+    extensoes = ('.csv', '.tsv')
+
+    def __init__(self, caminho_arquivo: str):
+        super().__init__(caminho_arquivo)
+        self.arquivo = None
+        self.codificacao: Optional[str] = None
+        self.delimitador: Optional[str] = None
+
+    @staticmethod
+    def detectar_codificacao(amostra: bytes) -> str:
+        """
+        Detecta a codificação de um arquivo de texto pelos primeiros bytes.
+
+        Args:
+            amostra: Início do arquivo
+
+        Returns:
+            Nome da codificação
+        """
+        if amostra.startswith(codecs.BOM_UTF8):
+            return 'utf-8-sig'
+        if amostra.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+            return 'utf-16'
+        for codificacao in CODIFICACOES_TEXTO:
             try:
-                os.remove(PATH_TO_TEMP)
-            except Exception as e:
-                return False
+                # final=False: a amostra pode terminar no meio de um caractere
+                codecs.getincrementaldecoder(codificacao)().decode(amostra, final=False)
+                return codificacao
+            except UnicodeDecodeError:
+                continue
+        return CODIFICACOES_TEXTO[-1]
+
+    def detectar_delimitador(self, amostra: str) -> str:
+        """
+        Detecta o delimitador a partir das primeiras linhas completas do arquivo.
+
+        Args:
+            amostra: Início do arquivo já decodificado
+
+        Returns:
+            Delimitador (TAB para .tsv, ou o detectado; vírgula se indefinido)
+        """
+        if self.caminho_arquivo.lower().endswith('.tsv'):
+            return '\t'
+        if '\n' in amostra:
+            amostra = amostra[:amostra.rindex('\n')]
         try:
-            with open(PATH_TO_TEMP, 'w', encoding='utf-8') as f:
-                f.write('')
-        except Exception as e:
-            return False
-        self.config = configparser.ConfigParser()
-        
+            return csv.Sniffer().sniff(amostra, delimiters=DELIMITADORES_CSV).delimiter
+        except csv.Error:
+            return ','
+
+    def abrir(self):
+        with open(self.caminho_arquivo, 'rb') as arquivo:
+            amostra = arquivo.read(TAMANHO_AMOSTRA_TEXTO)
+        self.codificacao = self.detectar_codificacao(amostra)
+        texto = codecs.getincrementaldecoder(self.codificacao)(errors='replace').decode(amostra, final=False)
+        self.delimitador = self.detectar_delimitador(texto)
+        self.arquivo = open(self.caminho_arquivo, 'r', encoding=self.codificacao, errors='replace', newline='')
+        logger.debug(f"CSV: codificação {self.codificacao}, delimitador {self.delimitador!r}")
+
+    def iterar_linhas(self) -> Iterator[Tuple[int, Dict[str, str]]]:
+        """
+        Percorre o arquivo registro a registro.
+
+        Yields:
+            Tupla (número da linha, valores preenchidos por letra de coluna);
+            linhas vazias são ignoradas
+        """
+        letras: List[str] = []
+        leitor = csv.reader(self.arquivo, delimiter=self.delimitador)
+        for numero_linha, valores in enumerate(leitor, start=1):
+            if not any(valores):
+                continue
+            if len(letras) < len(valores):
+                _letras_colunas(letras, len(valores))
+            yield numero_linha, {
+                letras[indice]: valor
+                for indice, valor in enumerate(valores)
+                if valor
+            }
+
+    def fechar(self):
+        if self.arquivo is not None:
+            self.arquivo.close()
+
+
+# Leitores disponíveis por extensão de arquivo
+LEITORES: Dict[str, type] = {
+    extensao: leitor
+    for leitor in (LeitorXlsx, LeitorCsv)
+    for extensao in leitor.extensoes
+}
+
+
+def criar_leitor(caminho_arquivo: str) -> LeitorPlanilha:
+    """
+    Escolhe o leitor pela extensão do arquivo.
+
+    Args:
+        caminho_arquivo: Caminho da planilha
+
+    Returns:
+        Leitor para o formato do arquivo
+
+    Raises:
+        ValueError: Se a extensão não for suportada
+    """
+    extensao = os.path.splitext(caminho_arquivo)[1].lower()
+    leitor = LEITORES.get(extensao)
+    if leitor is None:
+        raise ValueError(f"Formato de planilha não suportado: {extensao or '(sem extensão)'}")
+    return leitor(caminho_arquivo)
+
+
+class Planilha:
+    def __init__(self, caminho_arquivo, leitor: Optional[LeitorPlanilha] = None):
+        self.caminho_arquivo = caminho_arquivo
+        self.leitor = leitor
+        self.dados: DadosPlanilha = novo_dataset()
+        self.linhas_processadas = 0
+        self.segundos_processamento = 0.0
+
     def carregar_planilha(self):
-        self.workbook = openpyxl.load_workbook(self.caminho_arquivo)
-        self.sheet = self.workbook.active
-        self.config_temp()
+        if self.leitor is None:
+            self.leitor = criar_leitor(self.caminho_arquivo)
+        self.leitor.abrir()
+
+    def iterar_linhas(self) -> Iterator[Tuple[int, Dict[str, str]]]:
+        """
+        Percorre a planilha linha a linha com o leitor do formato do arquivo.
+
+        Yields:
+            Tupla (número da linha, valores preenchidos por letra de coluna);
+            linhas vazias são ignoradas
+        """
+        return self.leitor.iterar_linhas()
 
     def criar_base_chamados(self):
-        self.config_temp()
+        """
+        Lê a planilha em streaming e monta o dataset colunar em self.dados.
+
+        Returns:
+            Quantidade de linhas processadas, ou False em caso de erro
+
+        Raises:
+            LimiteDatasetExcedido: Se a planilha exceder o limite de memória
+        """
+        inicio = time.perf_counter()
+        self.dados = novo_dataset()
         self.carregar_planilha()
-        linhas_processadas = 0
-        celulas_processadas = 0
         try:
-            for row in self.sheet.iter_rows():
-                if not any(cell.value for cell in row):
-                    continue
-                linha_num = str(row[0].row)
-                self.config.add_section(linha_num)
-                
-
-                for cell in row:
-                    if cell.value is not None:
-                        coluna_letra = str(cell.column_letter)
-                        valor_celula = str(cell.value)
-
-                        self.config.set(linha_num, coluna_letra, valor_celula)
-                        celulas_processadas += 1
-                linhas_processadas += 1
-            
-
-            with open(PATH_TO_TEMP, 'w', encoding='utf-8') as f:
-                self.config.write(f)
-            return len(self.config.sections())
-            
-        except Exception as e:
-            return False
-    
-    def limpar_arquivo_temporario(self):
-        try:
-            if os.path.exists(PATH_TO_TEMP):
-                os.remove(PATH_TO_TEMP)
-            self.config = configparser.ConfigParser()
+            for numero_linha, valores in self.iterar_linhas():
+                self.dados.adicionar_linha(numero_linha, valores)
+
+            self.linhas_processadas = len(self.dados)
+            self.segundos_processamento = time.perf_counter() - inicio
+            return self.linhas_processadas
+
+        except LimiteDatasetExcedido:
+            raise
         except Exception as e:
             return False
-    
-    def verificar_arquivo_temporario(self):
-        if os.path.exists(PATH_TO_TEMP):
-            try:
-                self.config.read(PATH_TO_TEMP)
-                secoes = len(self.config.sections())
-                return True
-            except Exception as e:
-                return False
-        else:
-            return False
-    
+        finally:
+            self.leitor.fechar()
+
+
+def processar_arquivo_planilha(caminho_arquivo: str) -> Tuple[DadosPlanilha, int, float]:
+    """
+    Lê a planilha e monta o dataset. Função de módulo para poder ser executada
+    em um processo do pool (ver pool_processos); o dataset volta serializado
+    em formato compacto (ver DadosPlanilha.__getstate__).
+
+    Args:
+        caminho_arquivo: Caminho da planilha
+
+    Returns:
+        Tupla (dataset, linhas processadas ou False em caso de erro, segundos de processamento)
+
+    Raises:
+        LimiteDatasetExcedido: Se a planilha exceder o limite de memória
+    """
+    planilha = Planilha(caminho_arquivo)
+    linhas_processadas = planilha.criar_base_chamados()
+    return planilha.dados, linhas_processadas, planilha.segundos_processamento
+
+
+def registrar_processamento_planilha(linhas_processadas: int, segundos: float):
+    """
+    Registra as métricas e o log de uma planilha processada (no processo da
+    aplicação, que é quem expõe /metrics).
+
+    Args:
+        linhas_processadas: Quantidade de linhas do dataset
+        segundos: Tempo de processamento
+    """
+    planilha_duracao.observar(segundos)
+    planilha_linhas.incrementar(linhas_processadas)
+    planilha_linhas_por_segundo.definir(linhas_processadas / max(segundos, 1e-9))
+    logger.info(
+        f"Planilha processada: {linhas_processadas} linha(s) em {segundos:.2f}s "
+        f"({linhas_processadas / max(segundos, 1e-9):.0f} linhas/s)"
+    )
+
 
 """
 path="C:\\Users\\8004717\\Documents\\12-GIT\\fluig-chamados-webapp-flask\\pln1.xlsx"
 planilha = Planilha(path)
-planilha.carregar_planilha()
 planilha.criar_base_chamados()
-planilha.verificar_arquivo_temporario()
-"""
\ No newline at end of file
+print(len(planilha.dados))
+"""
@@ -0,0 +1,105 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional
+from src.modulos.logger import logger
+from src.modulos.metricas import registro_metricas
+from src.classes.tipos import ConfigEnvSetings
+
+
+class FilaProcessamentoCheia(Exception):
+    """Erro lançado quando a fila do pool de processos atingiu o limite."""
+
+
+class PoolProcessos:
+    """
+    Pool de processos para tarefas de CPU (leitura de planilhas, renderização de
+    lotes grandes), mantendo o event loop livre para as demais requisições.
+
+    A fila é limitada: tarefas além de `fila_maxima` (em execução + aguardando)
+    são recusadas com FilaProcessamentoCheia em vez de acumular. As funções
+    executadas e seus argumentos/resultados precisam ser serializáveis (pickle).
+    """
+
+    def __init__(self, processos: int, fila_maxima: int):
+        """
+        Inicializa o pool (os processos só são criados em iniciar ou no primeiro uso).
+
+        Args:
+            processos: Quantidade de processos; 0 executa em uma thread do próprio processo
+            fila_maxima: Máximo de tarefas em execução + aguardando
+        """
+        self.processos = processos
+        self.fila_maxima = max(1, fila_maxima)
+        self.em_andamento = 0
+        self.recusadas = 0
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def iniciar(self):
+        """Cria os processos do pool (spawn: não herdam threads/conexões do processo atual)."""
+        if self.processos > 0 and self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.processos,
+                mp_context=multiprocessing.get_context('spawn')
+            )
+            logger.info(f"Pool de processamento iniciado com {self.processos} processo(s)")
+
+    def encerrar(self):
+        """Encerra os processos, cancelando as tarefas que ainda não começaram."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def executar(self, funcao: Callable[..., Any], *args) -> Any:
+        """
+        Executa a função em um processo do pool e aguarda o resultado.
+
+        Args:
+            funcao: Função de módulo (serializável)
+            *args: Argumentos da função
+
+        Returns:
+            Resultado da função
+
+        Raises:
+            FilaProcessamentoCheia: Se a fila estiver cheia
+            Exception: Erro lançado pela função
+        """
+        if self.em_andamento >= self.fila_maxima:
+            self.recusadas += 1
+            raise FilaProcessamentoCheia(
+                "Muitas planilhas em processamento no momento. Tente novamente em instantes."
+            )
+
+        self.em_andamento += 1
+        try:
+            loop = asyncio.get_running_loop()
+            if self.processos <= 0:
+                return await loop.run_in_executor(None, funcao, *args)
+
+            self.iniciar()
+            try:
+                return await loop.run_in_executor(self._executor, funcao, *args)
+            except BrokenProcessPool:
+                # Um processo morreu (ex: falta de memória): recriar o pool no próximo uso
+                logger.error("Processo do pool de processamento encerrado inesperadamente; o pool será recriado")
+                self.encerrar()
+                raise
+        finally:
+            self.em_andamento -= 1
+
+
+pool_processos = PoolProcessos(
+    processos=ConfigEnvSetings.PROCESSAMENTO_PROCESSOS,
+    fila_maxima=ConfigEnvSetings.PROCESSAMENTO_FILA_MAXIMA
+)
+
+registro_metricas.medidor(
+    'pool_processos_tarefas', 'Tarefas em execução ou aguardando no pool de processamento',
+    funcao=lambda: {(): pool_processos.em_andamento}
+)
+registro_metricas.contador(
+    'pool_processos_recusadas_total', 'Tarefas recusadas por fila cheia no pool de processamento',
+    funcao=lambda: {(): pool_processos.recusadas}
+)
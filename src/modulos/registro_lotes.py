@@ -0,0 +1,338 @@
+import os
+import time
+from typing import Dict, List, Optional, Tuple
+from src.modulos.logger import logger
+from src.modulos.banco_local import banco_local, executar_banco
+from src.classes.tipos import ConfigEnvSetings
+
+# Status de um lote
+LOTE_EXECUTANDO = 'executando'
+LOTE_CONCLUIDO = 'concluido'
+LOTE_INTERROMPIDO = 'interrompido'
+LOTE_ERRO = 'erro'
+
+
+def _processo_ativo(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except (PermissionError, OSError):
+        return True
+    return True
+
+
+class RegistroLotes:
+    """
+    Checkpoint local (SQLite) dos lotes de chamados: guarda os chamados já
+    renderizados de cada linha e o resultado de cada envio à medida que
+    acontece, permitindo retomar um lote interrompido ou reprocessar apenas
+    as linhas com erro sem reenviar/reprocessar a planilha.
+    """
+
+    def __init__(self):
+        self._tabelas_criadas = False
+
+    def _criar_tabelas(self, conexao):
+        if self._tabelas_criadas:
+            return
+        conexao.execute(
+            'CREATE TABLE IF NOT EXISTS lotes ('
+            ' lote_id TEXT PRIMARY KEY,'
+            ' usuario TEXT NOT NULL,'
+            ' status TEXT NOT NULL,'
+            ' titulo TEXT,'
+            ' descricao TEXT,'
+            ' total INTEGER NOT NULL,'
+            ' pid INTEGER,'
+            ' criado_em REAL NOT NULL,'
+            ' atualizado_em REAL NOT NULL)'
+        )
+        conexao.execute('CREATE INDEX IF NOT EXISTS idx_lotes_usuario ON lotes (usuario, criado_em)')
+        conexao.execute(
+            'CREATE TABLE IF NOT EXISTS linhas_lote ('
+            ' lote_id TEXT NOT NULL,'
+            ' posicao INTEGER NOT NULL,'
+            ' linha INTEGER NOT NULL,'
+            ' titulo TEXT,'
+            ' descricao TEXT,'
+            ' hash TEXT,'
+            ' status TEXT NOT NULL,'
+            ' mensagem TEXT,'
+            ' atualizado_em REAL NOT NULL,'
+            ' PRIMARY KEY (lote_id, posicao))'
+        )
+        conexao.execute('CREATE INDEX IF NOT EXISTS idx_linhas_lote_status ON linhas_lote (lote_id, status)')
+        self._tabelas_criadas = True
+
+    def criar_lote(self, lote_id: str, usuario: str, titulo: str, descricao: str, itens: List[Dict]):
+        """
+        Registra um novo lote com os chamados renderizados de cada linha.
+
+        Args:
+            lote_id: ID do lote (mesmo ID do job)
+            usuario: Email do usuário dono do lote
+            titulo: Template de título usado
+            descricao: Template de descrição usado
+            itens: Itens preparados (ver AbrirChamados.preparar_chamados)
+        """
+        agora = time.time()
+        with banco_local() as conexao:
+            self._criar_tabelas(conexao)
+            conexao.execute(
+                'INSERT OR REPLACE INTO lotes '
+                '(lote_id, usuario, status, titulo, descricao, total, pid, criado_em, atualizado_em) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (lote_id, usuario, LOTE_EXECUTANDO, titulo, descricao, len(itens), os.getpid(), agora, agora)
+            )
+            conexao.executemany(
+                'INSERT OR REPLACE INTO linhas_lote '
+                '(lote_id, posicao, linha, titulo, descricao, hash, status, mensagem, atualizado_em) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                [
+                    (lote_id, posicao, item['linha'], item['titulo'], item['descricao'],
+                     item['hash'], item['status'], item['mensagem'], agora)
+                    for posicao, item in enumerate(itens)
+                ]
+            )
+
+    def registrar_resultados(self, lote_id: str, resultados: List[Tuple[int, str, Optional[str]]]):
+        """
+        Registra o resultado do envio de várias linhas em uma única transação.
+
+        Args:
+            lote_id: ID do lote
+            resultados: Tuplas (posição da linha no lote, status, mensagem); status
+                'sucesso', 'erro', 'duplicado' ou 'indeterminado'
+        """
+        agora = time.time()
+        try:
+            with banco_local() as conexao:
+                self._criar_tabelas(conexao)
+                conexao.executemany(
+                    'UPDATE linhas_lote SET status = ?, mensagem = ?, atualizado_em = ? '
+                    'WHERE lote_id = ? AND posicao = ?',
+                    [(status, mensagem, agora, lote_id, posicao) for posicao, status, mensagem in resultados]
+                )
+        except Exception as e:
+            logger.error(
+                f"Erro ao gravar checkpoint de {len(resultados)} linha(s) do lote {lote_id}: {str(e)}"
+            )
+
+    def atualizar_status(self, lote_id: str, status: str):
+        """
+        Atualiza o status do lote e associa-o ao processo atual.
+
+        Args:
+            lote_id: ID do lote
+            status: Novo status
+        """
+        with banco_local() as conexao:
+            self._criar_tabelas(conexao)
+            conexao.execute(
+                'UPDATE lotes SET status = ?, pid = ?, atualizado_em = ? WHERE lote_id = ?',
+                (status, os.getpid(), time.time(), lote_id)
+            )
+
+    def obter_lote(self, lote_id: str, usuario: Optional[str] = None) -> Optional[Dict]:
+        """
+        Retorna o resumo de um lote com a contagem de linhas por status.
+
+        Args:
+            lote_id: ID do lote
+            usuario: Se informado, só retorna o lote se pertencer a este usuário
+
+        Returns:
+            Dicionário com os dados do lote ou None
+        """
+        with banco_local() as conexao:
+            self._criar_tabelas(conexao)
+            lote = conexao.execute('SELECT * FROM lotes WHERE lote_id = ?', (lote_id,)).fetchone()
+            if lote is None or (usuario is not None and lote['usuario'] != usuario):
+                return None
+            contagem = {
+                linha['status']: linha['quantidade']
+                for linha in conexao.execute(
+                    'SELECT status, COUNT(*) AS quantidade FROM linhas_lote WHERE lote_id = ? GROUP BY status',
+                    (lote_id,)
+                )
+            }
+        return self._resumo(lote, contagem)
+
+    @staticmethod
+    def _resumo(lote, contagem: Dict[str, int]) -> Dict:
+        """Monta o resumo de um lote a partir da linha da tabela e da contagem por status."""
+        return {
+            'lote_id': lote['lote_id'],
+            'usuario': lote['usuario'],
+            'status': lote['status'],
+            'titulo': lote['titulo'],
+            'descricao': lote['descricao'],
+            'total': lote['total'],
+            'pid': lote['pid'],
+            'pendentes': contagem.get('pendente', 0),
+            'sucessos': contagem.get('sucesso', 0),
+            'erros': contagem.get('erro', 0),
+            'duplicados': contagem.get('duplicado', 0),
+            'indeterminados': contagem.get('indeterminado', 0),
+            'criado_em': lote['criado_em'],
+            'atualizado_em': lote['atualizado_em'],
+        }
+
+    def itens(self, lote_id: str) -> List[Dict]:
+        """
+        Retorna os itens do lote, na ordem das linhas, no mesmo formato de
+        AbrirChamados.preparar_chamados.
+
+        Args:
+            lote_id: ID do lote
+
+        Returns:
+            Lista de itens
+        """
+        with banco_local() as conexao:
+            self._criar_tabelas(conexao)
+            return [
+                {
+                    'linha': linha['linha'],
+                    'titulo': linha['titulo'],
+                    'descricao': linha['descricao'],
+                    'hash': linha['hash'],
+                    'status': linha['status'],
+                    'mensagem': linha['mensagem'],
+                }
+                for linha in conexao.execute(
+                    'SELECT * FROM linhas_lote WHERE lote_id = ? ORDER BY posicao',
+                    (lote_id,)
+                )
+            ]
+
+    def reabrir_falhas(self, lote_id: str) -> int:
+        """
+        Marca como pendentes as linhas com erro de envio (que têm chamado renderizado),
+        para serem reprocessadas. Linhas 'indeterminado' (o chamado pode ter sido
+        criado) não são reabertas.
+
+        Args:
+            lote_id: ID do lote
+
+        Returns:
+            Quantidade de linhas reabertas
+        """
+        with banco_local() as conexao:
+            self._criar_tabelas(conexao)
+            cursor = conexao.execute(
+                "UPDATE linhas_lote SET status = 'pendente', mensagem = NULL, atualizado_em = ? "
+                "WHERE lote_id = ? AND status = 'erro' AND hash IS NOT NULL",
+                (time.time(), lote_id)
+            )
+            return cursor.rowcount
+
+    def em_execucao_em_outro_processo(self, lote: Dict) -> bool:
+        """Verifica se o lote está sendo executado por outro processo ativo."""
+        return (
+            lote['status'] == LOTE_EXECUTANDO
+            and lote['pid'] is not None
+            and lote['pid'] != os.getpid()
+            and _processo_ativo(lote['pid'])
+        )
+
+    def listar_lotes(self, usuario: str, status: Optional[str] = None, limite: int = 20) -> List[Dict]:
+        """
+        Lista os lotes mais recentes de um usuário.
+
+        Args:
+            usuario: Email do usuário
+            status: Se informado, filtra pelo status do lote
+            limite: Quantidade máxima de lotes
+
+        Returns:
+            Lista de lotes (mais recentes primeiro)
+        """
+        consulta = 'SELECT * FROM lotes WHERE usuario = ?'
+        parametros: list = [usuario]
+        if status:
+            consulta += ' AND status = ?'
+            parametros.append(status)
+        consulta += ' ORDER BY criado_em DESC LIMIT ?'
+        parametros.append(limite)
+        with banco_local() as conexao:
+            self._criar_tabelas(conexao)
+            lotes = conexao.execute(consulta, parametros).fetchall()
+            # Contagem por status de todos os lotes listados em uma única consulta
+            contagens: Dict[str, Dict[str, int]] = {lote['lote_id']: {} for lote in lotes}
+            if lotes:
+                for linha in conexao.execute(
+                    'SELECT lote_id, status, COUNT(*) AS quantidade FROM linhas_lote '
+                    f'WHERE lote_id IN ({", ".join("?" for _ in lotes)}) GROUP BY lote_id, status',
+                    list(contagens)
+                ):
+                    contagens[linha['lote_id']][linha['status']] = linha['quantidade']
+        return [self._resumo(lote, contagens[lote['lote_id']]) for lote in lotes]
+
+    def marcar_interrompidos(self) -> int:
+        """
+        Marca como interrompidos os lotes em execução cujo processo não está mais
+        ativo (ex: reinício da aplicação). Chamado na inicialização.
+
+        Returns:
+            Quantidade de lotes marcados
+        """
+        with banco_local() as conexao:
+            self._criar_tabelas(conexao)
+            orfaos = [
+                linha['lote_id']
+                for linha in conexao.execute(
+                    'SELECT lote_id, pid FROM lotes WHERE status = ?', (LOTE_EXECUTANDO,)
+                )
+                if linha['pid'] is None or linha['pid'] == os.getpid() or not _processo_ativo(linha['pid'])
+            ]
+            for lote_id in orfaos:
+                conexao.execute(
+                    'UPDATE lotes SET status = ?, atualizado_em = ? WHERE lote_id = ?',
+                    (LOTE_INTERROMPIDO, time.time(), lote_id)
+                )
+        if orfaos:
+            logger.warning(f"{len(orfaos)} lote(s) interrompido(s) encontrado(s); podem ser retomados")
+        return len(orfaos)
+
+
+registro_lotes = RegistroLotes()
+
+
+class CheckpointLote:
+    """
+    Acumula os resultados das linhas de um lote e os grava no registro em
+    blocos (a cada LOTE_CHECKPOINT_LINHAS linhas ou quando solicitado), em
+    uma thread, sem uma transação por linha no event loop.
+    """
+
+    def __init__(self, lote_id: str, linhas_por_gravacao: Optional[int] = None):
+        """
+        Inicializa o checkpoint.
+
+        Args:
+            lote_id: ID do lote
+            linhas_por_gravacao: Linhas acumuladas antes de gravar (padrão: LOTE_CHECKPOINT_LINHAS)
+        """
+        self.lote_id = lote_id
+        self.linhas_por_gravacao = max(1, linhas_por_gravacao or ConfigEnvSetings.LOTE_CHECKPOINT_LINHAS)
+        self._resultados: List[Tuple[int, str, Optional[str]]] = []
+
+    def adicionar(self, posicao: int, status: str, mensagem: Optional[str]):
+        """Acumula o resultado de uma linha (ver RegistroLotes.registrar_resultados)."""
+        self._resultados.append((posicao, status, mensagem))
+
+    @property
+    def cheio(self) -> bool:
+        return len(self._resultados) >= self.linhas_por_gravacao
+
+    def _retirar(self) -> List[Tuple[int, str, Optional[str]]]:
+        resultados, self._resultados = self._resultados, []
+        return resultados
+
+    async def gravar(self):
+        """Grava os resultados acumulados em uma thread."""
+        resultados = self._retirar()
+        if resultados:
+            await executar_banco(registro_lotes.registrar_resultados, self.lote_id, resultados)
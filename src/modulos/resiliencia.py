@@ -0,0 +1,339 @@
+import asyncio
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable, Dict, Optional, TypeVar
+import httpx
+from src.modulos.logger import logger
+from src.modulos.metricas import api_externa_duracao, registro_metricas
+from src.classes.tipos import ConfigEnvSetings
+
+T = TypeVar('T')
+
+# Status HTTP considerados falhas transitórias
+STATUS_RETENTAVEIS = {408, 425, 429, 500, 502, 503, 504}
+
+# Status em que o servidor recusou a requisição sem processá-la: podem ser
+# repetidos mesmo em chamadas não idempotentes (ex: criação de chamado)
+STATUS_NAO_PROCESSADOS = {429, 503}
+
+# Erros em que a requisição certamente não chegou ao servidor
+ERROS_SEM_ENVIO = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+# Status após os quais não se sabe se a requisição foi processada (ex: proxy
+# sem resposta do servidor de destino)
+STATUS_RESULTADO_INCERTO = {500, 502, 504}
+
+
+class CircuitoAberto(Exception):
+    """Erro lançado quando o disjuntor está aberto e a chamada não é feita."""
+
+
+class Disjuntor:
+    """
+    Disjuntor (circuit breaker) para uma API externa.
+
+    - fechado: chamadas liberadas; falhas consecutivas são contadas
+    - aberto: após `limite_falhas` falhas seguidas, as chamadas falham imediatamente
+    - meio_aberto: após `tempo_recuperacao` segundos, uma chamada de teste é liberada;
+      sucesso fecha o disjuntor, falha o abre novamente
+    """
+
+    FECHADO = 'fechado'
+    ABERTO = 'aberto'
+    MEIO_ABERTO = 'meio_aberto'
+
+    def __init__(self, nome: str, limite_falhas: int, tempo_recuperacao: float):
+        """
+        Inicializa o disjuntor.
+
+        Args:
+            nome: Nome da API protegida (usado nos logs)
+            limite_falhas: Falhas consecutivas que abrem o disjuntor
+            tempo_recuperacao: Segundos em aberto antes de liberar uma chamada de teste
+        """
+        self.nome = nome
+        self.limite_falhas = limite_falhas
+        self.tempo_recuperacao = tempo_recuperacao
+        self.falhas_consecutivas = 0
+        self._estado = self.FECHADO
+        self._aberto_em = 0.0
+        self._teste_em_andamento = False
+
+    @property
+    def estado(self) -> str:
+        if self._estado == self.ABERTO and time.monotonic() - self._aberto_em >= self.tempo_recuperacao:
+            self._estado = self.MEIO_ABERTO
+            self._teste_em_andamento = False
+        return self._estado
+
+    def permitir(self) -> bool:
+        """
+        Verifica se uma chamada pode ser feita agora.
+
+        Returns:
+            True se liberada, False se o disjuntor estiver aberto
+        """
+        estado = self.estado
+        if estado == self.FECHADO:
+            return True
+        if estado == self.MEIO_ABERTO and not self._teste_em_andamento:
+            self._teste_em_andamento = True
+            return True
+        return False
+
+    def registrar_sucesso(self):
+        """Registra uma chamada bem-sucedida (fecha o disjuntor)."""
+        if self._estado != self.FECHADO:
+            logger.info(f"Disjuntor '{self.nome}' fechado: API respondendo normalmente")
+        self._estado = self.FECHADO
+        self.falhas_consecutivas = 0
+        self._teste_em_andamento = False
+
+    def registrar_resposta(self):
+        """
+        Registra uma resposta de erro que não indica indisponibilidade (ex: 4xx):
+        não altera a contagem de falhas nem fecha o disjuntor, apenas libera uma
+        nova chamada de teste se ele estiver meio aberto.
+        """
+        self._teste_em_andamento = False
+
+    def registrar_falha(self):
+        """Registra uma falha transitória; abre o disjuntor se o limite for atingido."""
+        self.falhas_consecutivas += 1
+        if self._estado == self.MEIO_ABERTO or self.falhas_consecutivas >= self.limite_falhas:
+            if self._estado != self.ABERTO:
+                logger.warning(
+                    f"Disjuntor '{self.nome}' aberto após {self.falhas_consecutivas} falha(s) consecutiva(s). "
+                    f"Nova tentativa em {self.tempo_recuperacao:.0f}s"
+                )
+            self._estado = self.ABERTO
+            self._aberto_em = time.monotonic()
+            self._teste_em_andamento = False
+
+    def segundos_para_nova_tentativa(self) -> float:
+        """Segundos até o disjuntor liberar uma chamada de teste (0 se não estiver aberto)."""
+        if self.estado != self.ABERTO:
+            return 0.0
+        return max(0.0, self.tempo_recuperacao - (time.monotonic() - self._aberto_em))
+
+    def para_dict(self) -> Dict:
+        """Representação serializável do estado do disjuntor."""
+        return {
+            'nome': self.nome,
+            'estado': self.estado,
+            'falhas_consecutivas': self.falhas_consecutivas,
+            'segundos_para_nova_tentativa': round(self.segundos_para_nova_tentativa(), 1),
+        }
+
+
+class PoliticaRetentativa:
+    """Retentativas com backoff exponencial limitado e jitter (full jitter)."""
+
+    def __init__(self, max_tentativas: int, atraso_base: float, atraso_maximo: float):
+        """
+        Inicializa a política.
+
+        Args:
+            max_tentativas: Quantidade total de tentativas (incluindo a primeira)
+            atraso_base: Atraso base em segundos (dobrado a cada tentativa)
+            atraso_maximo: Atraso máximo em segundos entre tentativas
+        """
+        self.max_tentativas = max(1, max_tentativas)
+        self.atraso_base = atraso_base
+        self.atraso_maximo = atraso_maximo
+
+    def calcular_atraso(self, tentativa: int, retry_after: Optional[float] = None) -> float:
+        """
+        Calcula o atraso antes da próxima tentativa.
+
+        Args:
+            tentativa: Número da tentativa que falhou (0 = primeira)
+            retry_after: Atraso pedido pelo servidor (cabeçalho Retry-After), se houver
+
+        Returns:
+            Atraso em segundos
+        """
+        if retry_after is not None:
+            # O atraso pedido pelo servidor é respeitado integralmente (ver executar_com_resiliencia)
+            return max(retry_after, 0.0)
+        teto = min(self.atraso_maximo, self.atraso_base * (2 ** tentativa))
+        return random.uniform(0, teto)
+
+
+def erro_transitorio(erro: Exception) -> bool:
+    """
+    Classifica se um erro indica indisponibilidade da API (conta para o disjuntor).
+
+    Args:
+        erro: Exceção lançada pela chamada
+
+    Returns:
+        True para timeouts, falhas de conexão e status 408/425/429/5xx transitórios
+    """
+    if isinstance(erro, httpx.HTTPStatusError):
+        return erro.response.status_code in STATUS_RETENTAVEIS
+    return isinstance(erro, httpx.TransportError)
+
+
+def erro_retentavel(erro: Exception, idempotente: bool = True) -> bool:
+    """
+    Classifica se vale a pena tentar novamente a chamada.
+
+    Args:
+        erro: Exceção lançada pela chamada
+        idempotente: Se False (ex: criação de chamado), só repete quando a
+            requisição certamente não foi processada: falha ao conectar ou
+            obter conexão do pool e status 429/503. Após um timeout de leitura
+            ou um 500/502/504 o chamado pode ter sido criado, e repetir a
+            chamada o duplicaria.
+
+    Returns:
+        True se a chamada pode ser repetida
+    """
+    if idempotente:
+        return erro_transitorio(erro)
+    if isinstance(erro, httpx.HTTPStatusError):
+        return erro.response.status_code in STATUS_NAO_PROCESSADOS
+    return isinstance(erro, ERROS_SEM_ENVIO)
+
+
+def resultado_incerto(erro: Exception) -> bool:
+    """
+    Verifica se, após o erro, não é possível saber se a requisição foi
+    processada (ex: timeout de leitura, conexão encerrada durante a resposta, 502).
+
+    Args:
+        erro: Exceção lançada pela chamada
+
+    Returns:
+        True se a requisição pode ter sido processada pelo servidor
+    """
+    if isinstance(erro, httpx.HTTPStatusError):
+        return erro.response.status_code in STATUS_RESULTADO_INCERTO
+    return isinstance(erro, httpx.TransportError) and not isinstance(erro, ERROS_SEM_ENVIO)
+
+
+def obter_retry_after(erro: Exception) -> Optional[float]:
+    """
+    Lê o cabeçalho Retry-After (segundos ou data HTTP) de uma resposta de erro.
+
+    Args:
+        erro: Exceção lançada pela chamada
+
+    Returns:
+        Atraso em segundos, ou None se não informado
+    """
+    if not isinstance(erro, httpx.HTTPStatusError):
+        return None
+    valor = erro.response.headers.get('Retry-After')
+    if not valor:
+        return None
+    try:
+        return float(valor)
+    except ValueError:
+        pass
+    try:
+        data = parsedate_to_datetime(valor)
+        return (data - datetime.now(timezone.utc)).total_seconds()
+    except (TypeError, ValueError):
+        return None
+
+
+async def executar_com_resiliencia(
+    operacao: Callable[[], Awaitable[T]],
+    disjuntor: Disjuntor,
+    politica: Optional['PoliticaRetentativa'] = None,
+    idempotente: bool = False,
+    antes_de_tentar: Optional[Callable[[], Awaitable[None]]] = None
+) -> T:
+    """
+    Executa uma chamada a uma API externa com retentativas e disjuntor.
+
+    Args:
+        operacao: Função assíncrona sem argumentos que faz a chamada
+            (deve lançar httpx.HTTPStatusError para respostas de erro)
+        disjuntor: Disjuntor da API chamada
+        politica: Política de retentativas (padrão: configuração do ConfigEnv)
+        idempotente: Se a chamada pode ser repetida sem efeito duplicado
+            (ver erro_retentavel); padrão False
+        antes_de_tentar: Função assíncrona aguardada antes de cada tentativa,
+            inclusive as retentativas (ex: LimitadorTaxa.aguardar)
+
+    Returns:
+        Resultado da operação
+
+    Raises:
+        CircuitoAberto: Se o disjuntor estiver aberto
+        Exception: Último erro da operação, se não retentável ou após esgotar as tentativas
+    """
+    politica = politica or politica_padrao
+    for tentativa in range(politica.max_tentativas):
+        if not disjuntor.permitir():
+            raise CircuitoAberto(
+                f"API '{disjuntor.nome}' indisponível no momento. "
+                f"Nova tentativa em {disjuntor.segundos_para_nova_tentativa():.0f}s"
+            )
+        if antes_de_tentar is not None:
+            await antes_de_tentar()
+        inicio = time.perf_counter()
+        try:
+            resultado = await operacao()
+        except Exception as e:
+            api_externa_duracao.observar(time.perf_counter() - inicio, api=disjuntor.nome, resultado='erro')
+            if erro_transitorio(e):
+                disjuntor.registrar_falha()
+            else:
+                # A API respondeu (ex: 4xx): não indica indisponibilidade nem recuperação
+                disjuntor.registrar_resposta()
+            if not erro_retentavel(e, idempotente) or tentativa + 1 >= politica.max_tentativas:
+                raise
+            retry_after = obter_retry_after(e)
+            if retry_after is not None and retry_after > politica.atraso_maximo:
+                # Não repetir antes do pedido pelo servidor nem prender o envio por mais que o máximo
+                logger.warning(
+                    f"API '{disjuntor.nome}' pediu {retry_after:.0f}s antes de nova tentativa "
+                    f"(máximo {politica.atraso_maximo:.0f}s); sem nova tentativa",
+                    extra={'amostragem': f'retentativa_{disjuntor.nome}'}
+                )
+                raise
+            atraso = politica.calcular_atraso(tentativa, retry_after)
+            logger.warning(
+                f"Falha transitória na API '{disjuntor.nome}' (tentativa {tentativa + 1}/"
+                f"{politica.max_tentativas}): {str(e) or type(e).__name__}. "
+                f"Nova tentativa em {atraso:.1f}s",
+                extra={'amostragem': f'retentativa_{disjuntor.nome}'}
+            )
+            await asyncio.sleep(atraso)
+        else:
+            api_externa_duracao.observar(time.perf_counter() - inicio, api=disjuntor.nome, resultado='sucesso')
+            disjuntor.registrar_sucesso()
+            return resultado
+
+
+politica_padrao = PoliticaRetentativa(
+    max_tentativas=ConfigEnvSetings.RETENTATIVA_MAX_TENTATIVAS,
+    atraso_base=ConfigEnvSetings.RETENTATIVA_ATRASO_BASE,
+    atraso_maximo=ConfigEnvSetings.RETENTATIVA_ATRASO_MAXIMO
+)
+
+disjuntor_chamados = Disjuntor(
+    'api_chamado',
+    limite_falhas=ConfigEnvSetings.DISJUNTOR_LIMITE_FALHAS,
+    tempo_recuperacao=ConfigEnvSetings.DISJUNTOR_TEMPO_RECUPERACAO
+)
+
+disjuntor_funcionarios = Disjuntor(
+    'api_funcionario',
+    limite_falhas=ConfigEnvSetings.DISJUNTOR_LIMITE_FALHAS,
+    tempo_recuperacao=ConfigEnvSetings.DISJUNTOR_TEMPO_RECUPERACAO
+)
+
+registro_metricas.medidor(
+    'disjuntor_aberto', 'Disjuntor da API aberto (1) ou não (0)', ('api',),
+    funcao=lambda: {
+        (disjuntor.nome,): int(disjuntor.estado == Disjuntor.ABERTO)
+        for disjuntor in (disjuntor_chamados, disjuntor_funcionarios)
+    }
+)
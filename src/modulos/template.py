@@ -0,0 +1,100 @@
+import re
+from functools import lru_cache
+from typing import List, Optional, Tuple
+from src.modulos.dataset import DadosPlanilha
+
+# Placeholders no formato <LETRA> (case-insensitive: <a> = <A>)
+_PADRAO_PLACEHOLDER = re.compile(r'<([A-Za-z]+)>')
+
+# Templates compilados mantidos entre requisições (prévia, lotes)
+MAX_TEMPLATES_CACHE = 256
+
+
+class TemplateChamado:
+    """
+    Texto com placeholders (<A>, <B>, ...) compilado uma única vez em segmentos
+    literais e referências de coluna. A renderização de cada linha é apenas o
+    preenchimento das referências seguido de um join.
+    """
+
+    __slots__ = ('texto', 'partes', 'referencias', 'colunas')
+
+    def __init__(self, texto: str):
+        """
+        Compila o texto.
+
+        Args:
+            texto: Texto com placeholders (ex: "Chamado <A> - <B>")
+        """
+        self.texto = texto
+        self.partes: List[str] = []
+        # (índice em partes, letra da coluna, placeholder original)
+        self.referencias: List[Tuple[int, str, str]] = []
+
+        inicio = 0
+        for encontrado in _PADRAO_PLACEHOLDER.finditer(texto or ''):
+            if encontrado.start() > inicio:
+                self.partes.append(texto[inicio:encontrado.start()])
+            self.referencias.append((len(self.partes), encontrado.group(1).upper(), encontrado.group(0)))
+            self.partes.append(encontrado.group(0))
+            inicio = encontrado.end()
+        if texto and inicio < len(texto):
+            self.partes.append(texto[inicio:])
+
+        self.colunas = list(dict.fromkeys(coluna for _, coluna, _ in self.referencias))
+
+    def colunas_ausentes(self, dados: DadosPlanilha) -> List[str]:
+        """
+        Retorna as colunas referenciadas que não existem na planilha.
+
+        Args:
+            dados: Dataset da planilha
+
+        Returns:
+            Lista de letras de coluna ausentes
+        """
+        return [coluna for coluna in self.colunas if coluna not in dados.colunas]
+
+    def renderizar(self, dados: DadosPlanilha, numero_linha: int) -> Optional[str]:
+        """
+        Renderiza o texto para uma linha da planilha. Placeholders de células
+        vazias ou colunas ausentes são mantidos como estão.
+
+        Args:
+            dados: Dataset da planilha
+            numero_linha: Número da linha na planilha
+
+        Returns:
+            Texto com placeholders substituídos, ou None se a linha não existir
+        """
+        if not self.referencias:
+            return self.texto
+
+        posicao = dados.posicao(numero_linha)
+        if posicao is None:
+            return None
+
+        partes = self.partes.copy()
+        colunas = dados.colunas
+        for indice, coluna, _ in self.referencias:
+            valores = colunas.get(coluna)
+            if valores is not None:
+                valor = valores[posicao]
+                if valor is not None:
+                    partes[indice] = valor
+        return ''.join(partes)
+
+
+@lru_cache(maxsize=MAX_TEMPLATES_CACHE)
+def obter_template(texto: str) -> TemplateChamado:
+    """
+    Retorna o template compilado do texto, reaproveitando a compilação entre
+    chamadas (o template não guarda estado da planilha e pode ser compartilhado).
+
+    Args:
+        texto: Texto com placeholders (ex: "Chamado <A> - <B>")
+
+    Returns:
+        Template compilado
+    """
+    return TemplateChamado(texto)
@@ -0,0 +1,231 @@
+import asyncio
+import re
+import time
+from typing import Dict, Optional
+import jwt
+from cryptography.x509 import load_pem_x509_certificate
+from cryptography.hazmat.primitives.asymmetric.rsa import RSAPublicKey
+from src.modulos.logger import logger
+from src.modulos.http_client import obter_cliente_http
+from src.modulos.metricas import api_externa_duracao
+from src.classes.tipos import ConfigEnvSetings
+
+# Valores aceitos para o emissor (iss) de um id_token do Google
+EMISSORES_GOOGLE = ('accounts.google.com', 'https://accounts.google.com')
+
+# Diferença de relógio tolerada na validação de exp/iat
+TOLERANCIA_RELOGIO_SEGUNDOS = 60
+
+# Validade das chaves quando a resposta não traz Cache-Control max-age
+VALIDADE_PADRAO_CHAVES_SEGUNDOS = 3600
+
+# Fração final da validade em que as chaves são renovadas em segundo plano
+FRACAO_RENOVACAO_ANTECIPADA = 0.1
+
+# Intervalo mínimo entre buscas por uma chave (kid) desconhecida ou após uma falha
+INTERVALO_MINIMO_BUSCA_SEGUNDOS = 60
+
+_MAX_AGE = re.compile(r'max-age=(\d+)')
+
+
+class TokenInvalido(Exception):
+    """Erro lançado quando o id_token não passa na verificação."""
+
+
+class ChavesIndisponiveis(Exception):
+    """Erro lançado quando as chaves de assinatura não puderam ser obtidas."""
+
+
+def carregar_chaves(dados) -> Dict[str, RSAPublicKey]:
+    """
+    Converte a resposta do endpoint de chaves do Google em {kid: chave pública}.
+    Aceita os dois formatos publicados: certificados PEM por kid (oauth2/v1/certs)
+    e JWK Set (oauth2/v3/certs).
+
+    Raises:
+        ValueError: Se a resposta não estiver em nenhum dos formatos
+    """
+    try:
+        if isinstance(dados, dict) and 'keys' in dados:
+            return {
+                jwk['kid']: jwt.PyJWK(jwk, algorithm='RS256').key
+                for jwk in dados['keys']
+                if jwk.get('kty') == 'RSA'
+            }
+        return {
+            kid: load_pem_x509_certificate(pem.encode('ascii')).public_key()
+            for kid, pem in dados.items()
+        }
+    except (AttributeError, KeyError, TypeError, ValueError, jwt.PyJWKError) as e:
+        raise ValueError("Resposta de chaves do Google inválida") from e
+
+
+class ChavesGoogle:
+    """
+    Chaves públicas usadas pelo Google para assinar os id_tokens, buscadas de
+    GOOGLE_AUTH_PROVIDER_X509_CERT_URL e mantidas em memória pelo tempo
+    indicado no Cache-Control (max-age) da resposta.
+
+    Perto do vencimento, as chaves são renovadas em segundo plano sem atrasar
+    o login; uma chave (kid) desconhecida força nova busca (rotação antecipada).
+    Buscas por kid desconhecido e novas tentativas após uma falha acontecem no
+    máximo uma vez a cada INTERVALO_MINIMO_BUSCA_SEGUNDOS.
+    """
+
+    def __init__(self, url: str):
+        """
+        Inicializa o cache (vazio até a primeira busca).
+
+        Args:
+            url: Endpoint com as chaves (PEM ou JWK Set)
+        """
+        self.url = url
+        self._chaves: Dict[str, RSAPublicKey] = {}
+        self._obtidas_em = 0.0
+        self._expiram_em = 0.0
+        self._ultima_busca = 0.0
+        self._falha_em = float('-inf')
+        self._busca: Optional[asyncio.Task] = None
+
+    async def atualizar(self):
+        """
+        Busca as chaves e define a validade pelo Cache-Control (descontando Age).
+
+        Raises:
+            httpx.HTTPError: Erro na requisição
+            ValueError: Se a resposta não puder ser lida
+        """
+        self._ultima_busca = time.monotonic()
+        try:
+            cliente = obter_cliente_http()
+            with api_externa_duracao.cronometrar(api='google_certs', resultado='erro') as rotulos:
+                resposta = await cliente.get(self.url)
+                resposta.raise_for_status()
+                rotulos['resultado'] = 'sucesso'
+            chaves = carregar_chaves(resposta.json())
+        except Exception:
+            self._falha_em = time.monotonic()
+            raise
+
+        max_age = _MAX_AGE.search(resposta.headers.get('cache-control', ''))
+        validade = int(max_age.group(1)) if max_age else VALIDADE_PADRAO_CHAVES_SEGUNDOS
+        idade = resposta.headers.get('age', '')
+        if idade.isdigit():
+            validade -= int(idade)
+
+        agora = time.monotonic()
+        self._chaves = chaves
+        self._obtidas_em = agora
+        self._expiram_em = agora + max(validade, 0)
+        logger.info(f"Chaves de assinatura do Google atualizadas: {len(chaves)} chave(s), válidas por {validade}s")
+
+    def _iniciar_busca(self) -> asyncio.Task:
+        # Uma única busca por vez: requisições simultâneas aguardam a mesma tarefa
+        if self._busca is None or self._busca.done():
+            self._busca = asyncio.create_task(self.atualizar())
+        return self._busca
+
+    def renovar_em_segundo_plano(self):
+        """Inicia uma busca sem aguardá-la; falhas são apenas registradas no log."""
+        def registrar_falha(tarefa: asyncio.Task):
+            if not tarefa.cancelled() and tarefa.exception() is not None:
+                logger.warning(f"Falha ao renovar chaves de assinatura do Google: {tarefa.exception()}")
+
+        self._iniciar_busca().add_done_callback(registrar_falha)
+
+    async def _aguardar_busca(self):
+        try:
+            await asyncio.shield(self._iniciar_busca())
+        except Exception as e:
+            raise ChavesIndisponiveis(str(e)) from e
+
+    async def obter(self, kid: str) -> Optional[RSAPublicKey]:
+        """
+        Retorna a chave do kid informado, buscando ou renovando as chaves se preciso.
+
+        Args:
+            kid: Identificador da chave (cabeçalho do id_token)
+
+        Returns:
+            Chave pública ou None se o kid não existir
+
+        Raises:
+            ChavesIndisponiveis: Se a busca falhar (ou tiver falhado há pouco) sem chaves em cache
+        """
+        agora = time.monotonic()
+        if agora >= self._expiram_em:
+            if agora - self._falha_em < INTERVALO_MINIMO_BUSCA_SEGUNDOS:
+                if not self._chaves:
+                    raise ChavesIndisponiveis("Falha recente ao buscar as chaves de assinatura")
+            else:
+                try:
+                    await self._aguardar_busca()
+                except ChavesIndisponiveis as e:
+                    if not self._chaves:
+                        raise
+                    # Chaves vencidas continuam válidas no Google por algum tempo após a rotação
+                    logger.warning(f"Falha ao atualizar chaves do Google, usando as anteriores: {e}")
+        elif agora >= self._expiram_em - (self._expiram_em - self._obtidas_em) * FRACAO_RENOVACAO_ANTECIPADA:
+            self.renovar_em_segundo_plano()
+
+        chave = self._chaves.get(kid)
+        if chave is None and time.monotonic() - self._ultima_busca >= INTERVALO_MINIMO_BUSCA_SEGUNDOS:
+            await self._aguardar_busca()
+            chave = self._chaves.get(kid)
+        return chave
+
+
+chaves_google = ChavesGoogle(ConfigEnvSetings.GOOGLE_AUTH_PROVIDER_X509_CERT_URL)
+
+
+async def verificar_id_token(id_token: str, client_id: str) -> Dict:
+    """
+    Verifica localmente um id_token do Google (assinatura RS256, emissor,
+    audiência, validade e email verificado) com PyJWT, sem chamar o endpoint
+    userinfo.
+
+    Args:
+        id_token: Token recebido do endpoint de token
+        client_id: GOOGLE_CLIENT_ID (audiência esperada)
+
+    Returns:
+        Claims do token (email, name, picture, ...)
+
+    Raises:
+        TokenInvalido: Se o token não passar em alguma verificação
+        ChavesIndisponiveis: Se as chaves de assinatura não puderem ser obtidas
+    """
+    try:
+        cabecalho = jwt.get_unverified_header(id_token)
+    except jwt.InvalidTokenError as e:
+        raise TokenInvalido("id_token malformado") from e
+    if cabecalho.get('alg') != 'RS256':
+        raise TokenInvalido(f"Algoritmo não suportado: {cabecalho.get('alg')}")
+
+    chave = await chaves_google.obter(cabecalho.get('kid'))
+    if chave is None:
+        raise TokenInvalido(f"Chave de assinatura desconhecida: {cabecalho.get('kid')}")
+
+    try:
+        claims = jwt.decode(
+            id_token,
+            chave,
+            algorithms=['RS256'],
+            audience=client_id,
+            leeway=TOLERANCIA_RELOGIO_SEGUNDOS,
+            options={'require': ['exp', 'iat', 'iss', 'aud']}
+        )
+    except jwt.ExpiredSignatureError as e:
+        raise TokenInvalido("Token expirado") from e
+    except jwt.InvalidAudienceError as e:
+        raise TokenInvalido("Token emitido para outro cliente") from e
+    except jwt.InvalidTokenError as e:
+        raise TokenInvalido(f"id_token inválido: {str(e)}") from e
+
+    # O Google usa os dois formatos de emissor (PyJWT compara com um único valor)
+    if claims.get('iss') not in EMISSORES_GOOGLE:
+        raise TokenInvalido(f"Emissor inválido: {claims.get('iss')}")
+    if not claims.get('email') or claims.get('email_verified') not in (True, 'true'):
+        raise TokenInvalido("Email não verificado")
+
+    return claims
@@ -0,0 +1,133 @@
+import codecs
+import hashlib
+import os
+import tempfile
+from typing import Optional
+import aiofiles
+from fastapi import UploadFile
+from src.modulos.logger import logger
+from src.classes.tipos import ConfigEnvSetings
+
+# Arquivos .xlsx são pacotes ZIP: começam com a assinatura de cabeçalho local
+ASSINATURA_XLSX = b'PK\x03\x04'
+
+# Formatos aceitos no upload (ver LEITORES em planilha.py)
+EXTENSOES_PLANILHA = ('.xlsx', '.csv', '.tsv')
+
+# Tamanho dos blocos lidos do upload e gravados em disco
+TAMANHO_BLOCO = 1024 * 1024
+
+
+class UploadInvalido(Exception):
+    """Erro lançado quando o arquivo enviado é recusado (tamanho ou formato)."""
+
+    def __init__(self, mensagem: str, status_code: int = 400):
+        super().__init__(mensagem)
+        self.status_code = status_code
+
+
+class ArquivoRecebido:
+    """Arquivo enviado já gravado em disco, com tamanho e hash do conteúdo."""
+
+    def __init__(self, caminho: str, tamanho_bytes: int, sha256: str):
+        self.caminho = caminho
+        self.tamanho_bytes = tamanho_bytes
+        self.sha256 = sha256
+
+    def remover(self):
+        """Remove o arquivo temporário, se ainda existir."""
+        if os.path.exists(self.caminho):
+            os.unlink(self.caminho)
+
+
+def tamanho_maximo_upload() -> int:
+    """Tamanho máximo de upload em bytes (UPLOAD_TAMANHO_MAXIMO_MB)."""
+    return int(ConfigEnvSetings.UPLOAD_TAMANHO_MAXIMO_MB * 1024 * 1024)
+
+
+def validar_tamanho_declarado(content_length: Optional[str]):
+    """
+    Recusa a requisição antes de ler o corpo quando o Content-Length declarado
+    já ultrapassa o limite.
+
+    Args:
+        content_length: Valor do cabeçalho Content-Length (pode ser None)
+
+    Raises:
+        UploadInvalido: Se o tamanho declarado exceder o limite
+    """
+    if content_length and content_length.isdigit() and int(content_length) > tamanho_maximo_upload():
+        raise UploadInvalido(
+            f"Arquivo excede o tamanho máximo de {ConfigEnvSetings.UPLOAD_TAMANHO_MAXIMO_MB:g} MB.",
+            status_code=413
+        )
+
+
+def _validar_primeiro_bloco(extensao: str, bloco: bytes):
+    """
+    Confere se o início do arquivo condiz com a extensão: assinatura ZIP para
+    .xlsx; para CSV/TSV, recusa conteúdo binário (bytes nulos sem BOM UTF-16).
+
+    Raises:
+        UploadInvalido: Se o conteúdo não corresponder ao formato
+    """
+    if extensao == '.xlsx':
+        if not bloco.startswith(ASSINATURA_XLSX):
+            raise UploadInvalido("O arquivo enviado não é uma planilha .xlsx válida.")
+    elif b'\x00' in bloco[:4096] and not bloco.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        raise UploadInvalido(f"O arquivo enviado não é um {extensao} de texto válido.")
+
+
+async def salvar_upload_planilha(arquivo: UploadFile) -> ArquivoRecebido:
+    """
+    Grava o upload em um arquivo temporário em blocos, sem carregá-lo inteiro
+    em memória, calculando o SHA-256 durante a cópia. A gravação é interrompida
+    assim que o arquivo excede o tamanho máximo ou se os primeiros bytes não
+    corresponderem ao formato indicado pela extensão.
+
+    Args:
+        arquivo: Arquivo recebido no formulário
+
+    Returns:
+        Arquivo gravado com a mesma extensão do original (o chamador deve
+        removê-lo após o uso)
+
+    Raises:
+        UploadInvalido: Se o formato não for suportado ou o arquivo exceder o tamanho máximo
+    """
+    extensao = os.path.splitext(arquivo.filename or '')[1].lower()
+    if extensao not in EXTENSOES_PLANILHA:
+        raise UploadInvalido(f"Apenas arquivos {', '.join(EXTENSOES_PLANILHA)} são suportados.")
+
+    limite = tamanho_maximo_upload()
+    sha256 = hashlib.sha256()
+    tamanho = 0
+
+    descritor, caminho = tempfile.mkstemp(suffix=extensao)
+    os.close(descritor)
+    try:
+        async with aiofiles.open(caminho, 'wb') as destino:
+            while True:
+                bloco = await arquivo.read(TAMANHO_BLOCO)
+                if not bloco:
+                    break
+                if tamanho == 0:
+                    _validar_primeiro_bloco(extensao, bloco)
+                tamanho += len(bloco)
+                if tamanho > limite:
+                    raise UploadInvalido(
+                        f"Arquivo excede o tamanho máximo de {ConfigEnvSetings.UPLOAD_TAMANHO_MAXIMO_MB:g} MB.",
+                        status_code=413
+                    )
+                sha256.update(bloco)
+                await destino.write(bloco)
+
+        if tamanho == 0:
+            raise UploadInvalido("O arquivo enviado está vazio.")
+    except BaseException:
+        os.unlink(caminho)
+        raise
+
+    recebido = ArquivoRecebido(caminho, tamanho, sha256.hexdigest())
+    logger.info(f"Planilha recebida: {tamanho} bytes (sha256 {recebido.sha256[:12]})")
+    return recebido
@@ -0,0 +1,163 @@
+import asyncio
+from fastapi import APIRouter, Security
+from openpyxl.utils import get_column_letter
+from pydantic import BaseModel, EmailStr, Field, field_validator
+from typing import Any, Dict, List, Union
+from src.auth.auth_api import Auth_API_KEY
+from src.classes.tipos import ConfigEnvSetings, DadosChamado
+from src.modulos.logger import logger
+from src.modulos.compressao import RespostaJSON
+from src.modulos.abrir_chamados import AbrirChamados
+from src.modulos.limitador import LimitadorTaxa
+from src.modulos.dataset import DadosPlanilha
+from src.modulos.idempotencia import calcular_hash_chamado
+
+# Rotas para integrações (sem sessão): autenticadas pelo cabeçalho API_NAME
+router = APIRouter(prefix="/api/v1", dependencies=[Security(Auth_API_KEY)])
+
+
+class ChamadoAPI(DadosChamado):
+    """Chamado recebido pela API JSON, com o tamanho máximo de título e descrição"""
+    Titulo: str = Field(max_length=ConfigEnvSetings.CHAMADO_TITULO_MAX_CARACTERES)
+    Descricao: str = Field(max_length=ConfigEnvSetings.CHAMADO_DESCRICAO_MAX_CARACTERES)
+
+
+class ChamadosTemplate(BaseModel):
+    """Modelo para criação de chamados a partir de um template e das linhas informadas"""
+    Usuario: EmailStr
+    Titulo: str = Field(max_length=ConfigEnvSetings.CHAMADO_TITULO_MAX_CARACTERES)
+    Descricao: str = Field(max_length=ConfigEnvSetings.CHAMADO_DESCRICAO_MAX_CARACTERES)
+    # Cada linha: {"A": "valor", ...} ou lista de valores (1º = A, 2º = B, ...)
+    Linhas: List[Union[Dict[str, Any], List[Any]]] = Field(min_length=1)
+
+    @field_validator('Linhas')
+    @classmethod
+    def validar_colunas(cls, linhas):
+        maximo = ConfigEnvSetings.API_VALOR_MAX_CARACTERES
+        for posicao, linha in enumerate(linhas, start=1):
+            if isinstance(linha, dict) and not all(letra.isalpha() and letra.isascii() for letra in linha):
+                raise ValueError("As chaves das linhas devem ser letras de coluna (A, B, ..., AA)")
+            valores = linha.values() if isinstance(linha, dict) else linha
+            if any(valor is not None and len(str(valor)) > maximo for valor in valores):
+                raise ValueError(f"Linha {posicao}: valores devem ter no máximo {maximo} caracteres")
+        return linhas
+
+
+def _limite_excedido(quantidade: int) -> RespostaJSON:
+    return RespostaJSON(
+        status_code=413,
+        content={
+            "sucesso": False,
+            "erro": (
+                f"Máximo de {ConfigEnvSetings.API_MAX_CHAMADOS_POR_REQUISICAO} chamados por requisição "
+                f"({quantidade} recebido(s))"
+            )
+        }
+    )
+
+
+def _valores_linha(linha: Union[Dict[str, Any], List[Any]]) -> Dict[str, str]:
+    """Converte uma linha da requisição em valores por letra de coluna (somente preenchidos)."""
+    if isinstance(linha, list):
+        linha = {get_column_letter(indice + 1): valor for indice, valor in enumerate(linha)}
+    return {
+        letra.upper(): str(valor)
+        for letra, valor in linha.items()
+        if valor is not None and valor != ''
+    }
+
+
+def _resposta(itens: List[Dict]) -> Dict:
+    """
+    Resume o resultado: contadores e, para cada chamado, apenas a linha
+    (posição na requisição, a partir de 1), status, mensagem e os dados
+    devolvidos pela API (ex: ID).
+    """
+    resultados = []
+    for item in itens:
+        resultado = {'linha': item['linha'], 'status': item['status'], 'mensagem': item['mensagem']}
+        if item.get('dados'):
+            resultado['dados'] = item['dados']
+        resultados.append(resultado)
+    sucessos = sum(1 for item in itens if item['status'] == 'sucesso')
+    duplicados = sum(1 for item in itens if item['status'] == 'duplicado')
+    indeterminados = sum(1 for item in itens if item['status'] == 'indeterminado')
+    return {
+        'total': len(itens),
+        'sucessos': sucessos,
+        'erros': len(itens) - sucessos - duplicados - indeterminados,
+        'duplicados': duplicados,
+        'indeterminados': indeterminados,
+        'resultados': resultados
+    }
+
+
+@router.post("/chamados", response_class=RespostaJSON)
+async def criar_chamados(corpo: Union[ChamadoAPI, List[ChamadoAPI]]):
+    """
+    Cria um chamado ou uma lista de chamados já renderizados. Chamados
+    repetidos na requisição (mesmo usuário, título e descrição) ou já criados
+    dentro da janela de idempotência não são reenviados.
+    """
+    chamados = corpo if isinstance(corpo, list) else [corpo]
+    if not chamados:
+        return RespostaJSON(status_code=400, content={"sucesso": False, "erro": "Nenhum chamado informado"})
+    if len(chamados) > ConfigEnvSetings.API_MAX_CHAMADOS_POR_REQUISICAO:
+        return _limite_excedido(len(chamados))
+
+    # Itens no formato de AbrirChamados.preparar_chamados, agrupados por usuário
+    itens: List[Dict] = []
+    itens_por_usuario: Dict[str, List[Dict]] = {}
+    linha_por_hash: Dict[str, int] = {}
+    for numero_linha, chamado in enumerate(chamados, start=1):
+        hash_chamado = calcular_hash_chamado(chamado.Usuario, chamado.Titulo, chamado.Descricao)
+        item = {
+            'linha': numero_linha,
+            'titulo': chamado.Titulo,
+            'descricao': chamado.Descricao,
+            'hash': hash_chamado,
+            'status': 'pendente',
+            'mensagem': None
+        }
+        if hash_chamado in linha_por_hash:
+            item['status'] = 'duplicado'
+            item['mensagem'] = f'Chamado idêntico ao da linha {linha_por_hash[hash_chamado]}'
+        else:
+            linha_por_hash[hash_chamado] = numero_linha
+        itens.append(item)
+        itens_por_usuario.setdefault(chamado.Usuario, []).append(item)
+
+    logger.info(f"API: {len(itens)} chamado(s) recebido(s) de {len(itens_por_usuario)} usuário(s)")
+
+    # Usuários em paralelo, dividindo o mesmo limite de chamadas simultâneas
+    # (LOTE_MAX_SIMULTANEOS) e de requisições por segundo
+    semaforo = asyncio.Semaphore(max(1, ConfigEnvSetings.LOTE_MAX_SIMULTANEOS))
+    limitador = LimitadorTaxa(ConfigEnvSetings.LOTE_REQUISICOES_POR_SEGUNDO)
+    await asyncio.gather(*[
+        AbrirChamados(usuario).enviar_chamados(itens_usuario, semaforo=semaforo, limitador=limitador)
+        for usuario, itens_usuario in itens_por_usuario.items()
+    ])
+
+    return RespostaJSON(content=_resposta(itens))
+
+
+@router.post("/chamados/template", response_class=RespostaJSON)
+async def criar_chamados_template(corpo: ChamadosTemplate):
+    """
+    Cria um chamado por linha, substituindo os placeholders (<A>, <B>, ...) do
+    título e da descrição pelos valores da linha, como no envio por planilha.
+    """
+    if len(corpo.Linhas) > ConfigEnvSetings.API_MAX_CHAMADOS_POR_REQUISICAO:
+        return _limite_excedido(len(corpo.Linhas))
+
+    dados = DadosPlanilha()
+    for numero_linha, linha in enumerate(corpo.Linhas, start=1):
+        dados.adicionar_linha(numero_linha, _valores_linha(linha))
+
+    logger.info(f"API: {len(dados)} chamado(s) por template recebido(s) de {corpo.Usuario}")
+
+    abrir_chamados = AbrirChamados(corpo.Usuario, dados)
+    itens = await abrir_chamados.preparar_chamados_em_processo(corpo.Titulo, corpo.Descricao, list(dados.linhas))
+    await abrir_chamados.enviar_chamados(itens)
+
+    return RespostaJSON(content=_resposta(itens))
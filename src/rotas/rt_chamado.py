@@ -1,19 +1,110 @@
 from fastapi import APIRouter, Request, HTTPException, UploadFile, File, Form
-from fastapi.responses import HTMLResponse, RedirectResponse, JSONResponse
-from fastapi.templating import Jinja2Templates
+from fastapi.responses import HTMLResponse, RedirectResponse, StreamingResponse
 from pydantic import BaseModel
-from src.classes.tipos import ConfigEnvSetings, DadosFuncionario, DadosFuncionarioForm, DadosChamado, PayloadFuncionario
-import requests
+from typing import Optional, Tuple
+from src.classes.tipos import ConfigEnvSetings, DadosFuncionarioForm, DadosChamado
+import httpx
 from datetime import datetime
 from src.modulos.logger import logger
-from src.modulos.planilha import Planilha, PATH_TO_TEMP
-from src.modulos.abrir_chamados import AbrirChamados
-import os
-import tempfile
-import configparser
+from src.modulos.paginas import templates
+from src.modulos.compressao import RespostaJSON, serializar_json
+from src.modulos.planilha import processar_arquivo_planilha, registrar_processamento_planilha
+from src.modulos.pool_processos import FilaProcessamentoCheia, pool_processos
+from src.modulos.dataset import DadosPlanilha, LimiteDatasetExcedido, armazem_datasets
+from src.modulos.upload import UploadInvalido, salvar_upload_planilha, validar_tamanho_declarado
+from src.modulos.abrir_chamados import (
+    MENSAGEM_INDETERMINADO, AbrirChamados, erro_tamanho_chamado, mensagem_chamado_existente
+)
+from src.modulos.http_client import obter_cliente_http
+from src.modulos.jobs import gerenciador_jobs
+from src.modulos.registro_lotes import LOTE_INTERROMPIDO, registro_lotes
+from src.modulos.banco_local import executar_banco
+from src.modulos.funcionarios import obter_funcionario
+from src.modulos.resiliencia import CircuitoAberto, disjuntor_chamados, executar_com_resiliencia, resultado_incerto
+from src.modulos.idempotencia import calcular_hash_chamado, registro_idempotencia
+import asyncio
+import uuid
 
 router = APIRouter()
-templates = Jinja2Templates(directory="src/templates")
+
+
+# Quantidade de datasets recentes que a sessão pode referenciar pelo ID
+MAX_DATASETS_SESSAO = 5
+
+
+def registrar_dataset_sessao(request: Request, dataset_id: str):
+    """Associa um dataset carregado à sessão do usuário (o mais recente fica por último)"""
+    datasets = [d for d in request.session.get('datasets', []) if d != dataset_id]
+    datasets.append(dataset_id)
+    request.session['datasets'] = datasets[-MAX_DATASETS_SESSAO:]
+
+
+def obter_dataset_sessao(request: Request, dataset_id: Optional[str] = None) -> Optional[DadosPlanilha]:
+    """
+    Retorna um dataset carregado nesta sessão.
+    
+    Args:
+        request: Requisição com a sessão do usuário
+        dataset_id: ID do dataset; se None, usa o último carregado na sessão
+    
+    Returns:
+        Dataset ou None se não pertencer à sessão ou tiver expirado
+    """
+    datasets = request.session.get('datasets', [])
+    if dataset_id is None:
+        dataset_id = datasets[-1] if datasets else None
+    if dataset_id is None or dataset_id not in datasets:
+        return None
+    return armazem_datasets.obter(dataset_id)
+
+
+async def processar_upload_planilha(request: Request, planilha: UploadFile) -> Tuple[DadosPlanilha, float, bool]:
+    """
+    Recebe a planilha enviada e retorna seu dataset. O dataset é identificado
+    pelo SHA-256 do arquivo: se a mesma planilha já foi processada, o dataset
+    em cache é reutilizado sem processá-la novamente.
+    
+    Args:
+        request: Requisição (sessão e cabeçalhos)
+        planilha: Arquivo enviado
+    
+    Returns:
+        Tupla (dataset, segundos de processamento, veio do cache)
+    
+    Raises:
+        UploadInvalido: Se o arquivo for recusado ou não puder ser processado
+    """
+    # Gravar o upload em disco em blocos (limite de tamanho e verificação do formato)
+    validar_tamanho_declarado(request.headers.get('content-length'))
+    arquivo = await salvar_upload_planilha(planilha)
+    
+    try:
+        dados = armazem_datasets.obter(arquivo.sha256)
+        if dados is not None:
+            logger.info(f"Planilha já processada reutilizada do cache (sha256 {arquivo.sha256[:12]})")
+            registrar_dataset_sessao(request, arquivo.sha256)
+            return dados, 0.0, True
+        
+        # Leitura em um processo do pool: o event loop continua atendendo as demais requisições
+        try:
+            dados, linhas_processadas, segundos = await pool_processos.executar(
+                processar_arquivo_planilha, arquivo.caminho
+            )
+        except LimiteDatasetExcedido as e:
+            raise UploadInvalido(str(e), status_code=413)
+        except FilaProcessamentoCheia as e:
+            raise UploadInvalido(str(e), status_code=503)
+        if not linhas_processadas:
+            raise UploadInvalido("Erro ao processar planilha. Verifique o formato do arquivo.")
+    finally:
+        # A planilha já foi processada para o dataset em memória
+        arquivo.remover()
+    
+    registrar_processamento_planilha(linhas_processadas, segundos)
+    dados.sha256 = arquivo.sha256
+    armazem_datasets.salvar(arquivo.sha256, dados)
+    registrar_dataset_sessao(request, arquivo.sha256)
+    return dados, segundos, False
 
 
 @router.get("/chamado", response_class=HTMLResponse)
@@ -28,22 +119,8 @@ async def chamado(request: Request):
         return RedirectResponse(url="/login")
     
     try:
-        # Criar payload usando Pydantic
-        payload = PayloadFuncionario(Email=email)
-        headers = {
-            ConfigEnvSetings.API_NAME: ConfigEnvSetings.API_KEY
-        }
-        response = requests.post(
-            ConfigEnvSetings.API_ENDPOINT_FUNCIONARIO,
-            json=payload.model_dump(),
-            headers=headers,
-            timeout=10
-        )
-        response.raise_for_status()
-        funcionario_data = response.json()
-        
-        # Validar e criar instância Pydantic
-        funcionario = DadosFuncionario(**funcionario_data)
+        # Dados do funcionário (cache compartilhado)
+        funcionario = await obter_funcionario(email)
         
         # Criar dados formatados para o formulário
         dados_funcionario = DadosFuncionarioForm(
@@ -67,11 +144,12 @@ async def chamado(request: Request):
             {
                 "request": request,
                 "dados": dados_funcionario.model_dump(),
-                "user": user
+                "user": user,
+                "lotes_interrompidos": await listar_lotes_interrompidos(email)
             }
         )
         
-    except requests.RequestException as e:
+    except (httpx.HTTPError, CircuitoAberto) as e:
         logger.error(f"Erro ao buscar dados do funcionário: {str(e)}")
         return templates.TemplateResponse(
             "chamado.html",
@@ -95,6 +173,27 @@ async def chamado(request: Request):
         )
 
 
+async def listar_lotes_interrompidos(email: str) -> list:
+    """Lotes interrompidos do usuário que podem ser retomados"""
+    try:
+        lotes = await executar_banco(registro_lotes.listar_lotes, email, LOTE_INTERROMPIDO)
+        return [
+            {
+                'lote_id': lote['lote_id'],
+                'titulo': lote['titulo'],
+                'total': lote['total'],
+                'pendentes': lote['pendentes'],
+                'erros': lote['erros'],
+                'criado_em': datetime.fromtimestamp(lote['criado_em']).strftime('%d/%m/%Y %H:%M')
+            }
+            for lote in lotes
+            if not gerenciador_jobs.em_execucao(lote['lote_id'])
+        ]
+    except Exception as e:
+        logger.error(f"Erro ao listar lotes interrompidos: {str(e)}")
+        return []
+
+
 @router.post("/chamado", response_class=HTMLResponse)
 async def criar_chamado(
     request: Request,
@@ -104,6 +203,7 @@ async def criar_chamado(
     num_tel_contato: str = Form(None),
     sap_ibid: str = Form("Não"),
     planilha: UploadFile = File(None),
+    dataset_id: str = Form(None),
     qtd_chamados: int = Form(1),
     ignorar_primeira_linha: str = Form("1")
 ):
@@ -117,22 +217,12 @@ async def criar_chamado(
         return RedirectResponse(url="/login")
     
     try:
-        # Buscar dados do funcionário novamente para garantir que temos os dados atualizados
-        payload_func = PayloadFuncionario(Email=email)
+        # Dados do funcionário (cache compartilhado)
+        funcionario = await obter_funcionario(email)
         headers = {
-            ConfigEnvSetings.API_NAME: ConfigEnvSetings.API_KEY
+            ConfigEnvSetings.API_NAME: ConfigEnvSetings.API_KEY,
+            'Content-Type': 'application/json'
         }
-        response_func = requests.post(
-            ConfigEnvSetings.API_ENDPOINT_FUNCIONARIO,
-            json=payload_func.model_dump(),
-            headers=headers,
-            timeout=10
-        )
-        response_func.raise_for_status()
-        funcionario_data = response_func.json()
-        
-        # Validar e criar instância Pydantic
-        funcionario = DadosFuncionario(**funcionario_data)
         
         # Criar dados formatados para o formulário
         dados_funcionario = DadosFuncionarioForm(
@@ -149,107 +239,115 @@ async def criar_chamado(
             email=funcionario.Email or ''
         )
         
-        chamados_criados = 0
-        chamados_erro = 0
-        
-        # Se há planilha, processar em lote
-        if planilha and planilha.filename:
-            if not planilha.filename.endswith('.xlsx'):
+        # Se há planilha (nova ou já carregada nesta sessão), processar em lote
+        if (planilha and planilha.filename) or dataset_id:
+            try:
+                if planilha and planilha.filename:
+                    dados_planilha, _, _ = await processar_upload_planilha(request, planilha)
+                else:
+                    dados_planilha = obter_dataset_sessao(request, dataset_id)
+                    if dados_planilha is None:
+                        raise UploadInvalido("A planilha carregada expirou. Selecione o arquivo novamente.")
+            except UploadInvalido as e:
+                return templates.TemplateResponse(
+                    "chamado.html",
+                    {
+                        "request": request,
+                        "dados": dados_funcionario.model_dump(),
+                        "user": user,
+                        "error": str(e)
+                    }
+                )
+            except Exception as e:
+                logger.error(f"Erro ao processar planilha: {str(e)}")
                 return templates.TemplateResponse(
                     "chamado.html",
                     {
                         "request": request,
                         "dados": dados_funcionario.model_dump(),
                         "user": user,
-                        "error": "Apenas arquivos .xlsx são suportados."
+                        "error": f"Erro ao processar planilha: {str(e)}"
                     }
                 )
             
-            # Salvar arquivo temporário
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.xlsx') as tmp_file:
-                content = await planilha.read()
-                tmp_file.write(content)
-                tmp_path = tmp_file.name
+            # Abrir os chamados em segundo plano e devolver o ID do job imediatamente
+            ignorar_cabecalho = ignorar_primeira_linha == "1"
             
-            try:
-                # Processar planilha
-                planilha_obj = Planilha(tmp_path)
-                linhas_processadas = planilha_obj.criar_base_chamados()
-                
-                if not linhas_processadas:
-                    os.unlink(tmp_path)
-                    return templates.TemplateResponse(
-                        "chamado.html",
-                        {
-                            "request": request,
-                            "dados": dados_funcionario.model_dump(),
-                            "user": user,
-                            "error": "Erro ao processar planilha. Verifique o formato do arquivo."
-                        }
-                    )
-                
-                # Usar o novo módulo para abrir chamados em sequência
-                ignorar_cabecalho = ignorar_primeira_linha == "1"
-                abrir_chamados = AbrirChamados(email)
-                resultado = abrir_chamados.abrir_chamados_sequencia(
+            async def executar_lote(job):
+                abrir_chamados = AbrirChamados(email, dados_planilha)
+                return await abrir_chamados.abrir_chamados_sequencia(
                     titulo=ds_titulo,
                     descricao=ds_chamado,
                     qtd_chamados=qtd_chamados,
                     inicio_linha=1,
-                    ignorar_primeira_linha=ignorar_cabecalho
+                    ignorar_primeira_linha=ignorar_cabecalho,
+                    ao_iniciar=job.iniciar,
+                    ao_concluir_linha=job.registrar_linha,
+                    lote_id=job.id
                 )
-                
-                chamados_criados = resultado['sucessos']
-                chamados_erro = resultado['erros']
-                
-                # Limpar arquivos temporários
-                planilha_obj.limpar_arquivo_temporario()
-                os.unlink(tmp_path)
-                
-                mensagem = f"{chamados_criados} chamado(s) criado(s) com sucesso!"
-                if chamados_erro > 0:
-                    mensagem += f" {chamados_erro} chamado(s) falharam."
-                
+            
+            job = gerenciador_jobs.criar(email, executar_lote)
+            
+            return templates.TemplateResponse(
+                "chamado.html",
+                {
+                    "request": request,
+                    "dados": dados_funcionario.model_dump(),
+                    "user": user,
+                    "success": "Processamento do lote iniciado. Acompanhe o progresso abaixo.",
+                    "job_id": job.id
+                }
+            )
+        else:
+            erro_tamanho = erro_tamanho_chamado(ds_titulo, ds_chamado)
+            if erro_tamanho:
                 return templates.TemplateResponse(
                     "chamado.html",
                     {
                         "request": request,
                         "dados": dados_funcionario.model_dump(),
                         "user": user,
-                        "success": mensagem
+                        "error": erro_tamanho
                     }
                 )
-                
-            except Exception as e:
-                logger.error(f"Erro ao processar planilha: {str(e)}")
-                if os.path.exists(tmp_path):
-                    os.unlink(tmp_path)
+            
+            # Criar chamado único usando Pydantic
+            payload_chamado = DadosChamado(
+                Usuario=email,
+                Titulo=ds_titulo,
+                Descricao=ds_chamado
+            )
+            
+            # Reservar o chamado no registro de idempotência (ex: clique duplo no envio)
+            hash_chamado = calcular_hash_chamado(email, ds_titulo, ds_chamado)
+            dono = uuid.uuid4().hex
+            indisponiveis = await executar_banco(registro_idempotencia.reservar, [hash_chamado], email, dono)
+            if indisponiveis:
                 return templates.TemplateResponse(
                     "chamado.html",
                     {
                         "request": request,
                         "dados": dados_funcionario.model_dump(),
                         "user": user,
-                        "error": f"Erro ao processar planilha: {str(e)}"
+                        "error": mensagem_chamado_existente(*indisponiveis[hash_chamado])
                     }
                 )
-        else:
-            # Criar chamado único usando Pydantic
-            payload_chamado = DadosChamado(
-                Usuario=email,
-                Titulo=ds_titulo,
-                Descricao=ds_chamado
-            )
             
-            try:
-                response_chamado = requests.post(
+            corpo_chamado = serializar_json(payload_chamado.model_dump())
+            
+            async def enviar_chamado() -> httpx.Response:
+                response_chamado = await obter_cliente_http().post(
                     ConfigEnvSetings.API_ENDPOINT_CHAMADO,
-                    json=payload_chamado.model_dump(),
-                    headers=headers,
-                    timeout=10
+                    content=corpo_chamado,
+                    headers=headers
                 )
                 response_chamado.raise_for_status()
+                return response_chamado
+            
+            try:
+                await executar_com_resiliencia(enviar_chamado, disjuntor_chamados)
                 logger.info(f"Chamado único criado com sucesso: {ds_titulo}")
+                await executar_banco(registro_idempotencia.concluir, [hash_chamado], [], email, dono)
                 
                 return templates.TemplateResponse(
                     "chamado.html",
@@ -262,17 +360,23 @@ async def criar_chamado(
                 )
             except Exception as e:
                 logger.error(f"Erro ao criar chamado: {str(e)}")
+                if isinstance(e, httpx.HTTPError) and resultado_incerto(e):
+                    # Pode ter sido criado: a reserva fica até expirar
+                    mensagem = f"{MENSAGEM_INDETERMINADO} ({str(e) or type(e).__name__})"
+                else:
+                    await executar_banco(registro_idempotencia.concluir, [], [hash_chamado], email, dono)
+                    mensagem = f"Erro ao criar chamado: {str(e)}"
                 return templates.TemplateResponse(
                     "chamado.html",
                     {
                         "request": request,
                         "dados": dados_funcionario.model_dump(),
                         "user": user,
-                        "error": f"Erro ao criar chamado: {str(e)}"
+                        "error": mensagem
                     }
                 )
         
-    except requests.RequestException as e:
+    except (httpx.HTTPError, CircuitoAberto) as e:
         logger.error(f"Erro ao buscar dados do funcionário: {str(e)}")
         return templates.TemplateResponse(
             "chamado.html",
@@ -296,72 +400,188 @@ async def criar_chamado(
         )
 
 
-@router.post("/chamado/carregar-planilha", response_class=JSONResponse)
-async def carregar_planilha(request: Request, planilha: UploadFile = File(...)):
+@router.get("/chamado/lote/{job_id}", response_class=RespostaJSON)
+async def status_lote(request: Request, job_id: str):
     """
-    Carrega a planilha e cria o temp.txt imediatamente após o upload
+    Retorna o progresso de um lote em processamento
     """
     user = request.session.get('user')
     if not user:
-        return JSONResponse(
+        return RespostaJSON(
+            status_code=401,
+            content={"erro": "Usuário não autenticado"}
+        )
+    
+    job = gerenciador_jobs.obter(job_id, usuario=user.get('email'))
+    if not job:
+        # Job fora da memória (ex: após reinício): usar o checkpoint do lote
+        lote = await executar_banco(registro_lotes.obter_lote, job_id, user.get('email'))
+        if not lote:
+            return RespostaJSON(
+                status_code=404,
+                content={"erro": "Lote não encontrado"}
+            )
+        return RespostaJSON(content={
+            'job_id': lote['lote_id'],
+            'status': lote['status'],
+            'total': lote['total'],
+            'processados': lote['total'] - lote['pendentes'],
+            'sucessos': lote['sucessos'],
+            'erros': lote['erros'],
+            'duplicados': lote['duplicados'],
+            'indeterminados': lote['indeterminados'],
+            'eta_segundos': None,
+            'mensagem': '',
+            'circuito_api': disjuntor_chamados.para_dict()
+        })
+    
+    dados = job.para_dict()
+    dados['circuito_api'] = disjuntor_chamados.para_dict()
+    if job.finalizado and job.resultado:
+        dados['detalhes'] = job.resultado.get('detalhes', [])
+    return RespostaJSON(content=dados)
+
+
+async def _retomar_lote(request: Request, job_id: str, somente_falhas: bool) -> RespostaJSON:
+    user = request.session.get('user')
+    if not user:
+        return RespostaJSON(
             status_code=401,
             content={"erro": "Usuário não autenticado", "sucesso": False}
         )
     
-    if not planilha.filename.endswith('.xlsx'):
-        return JSONResponse(
+    email = user.get('email')
+    lote = await executar_banco(registro_lotes.obter_lote, job_id, email)
+    if not lote:
+        return RespostaJSON(
+            status_code=404,
+            content={"erro": "Lote não encontrado", "sucesso": False}
+        )
+    
+    if gerenciador_jobs.em_execucao(job_id) or registro_lotes.em_execucao_em_outro_processo(lote):
+        return RespostaJSON(
+            status_code=409,
+            content={"erro": "O lote já está em execução", "sucesso": False}
+        )
+    
+    if not lote['pendentes'] and not (somente_falhas and lote['erros']):
+        return RespostaJSON(
             status_code=400,
-            content={"erro": "Apenas arquivos .xlsx são suportados.", "sucesso": False}
+            content={"erro": "Não há linhas a reprocessar neste lote", "sucesso": False}
+        )
+    
+    async def executar_lote(job):
+        return await AbrirChamados(email).retomar_lote(
+            job.id,
+            somente_falhas=somente_falhas,
+            ao_iniciar=job.iniciar,
+            ao_concluir_linha=job.registrar_linha
+        )
+    
+    job = gerenciador_jobs.criar(email, executar_lote, job_id=job_id)
+    
+    return RespostaJSON(
+        content={
+            "sucesso": True,
+            "mensagem": "Processamento do lote retomado.",
+            "job_id": job.id
+        }
+    )
+
+
+@router.post("/chamado/lote/{job_id}/retomar", response_class=RespostaJSON)
+async def retomar_lote(request: Request, job_id: str):
+    """
+    Retoma um lote interrompido, enviando apenas as linhas ainda pendentes
+    """
+    return await _retomar_lote(request, job_id, somente_falhas=False)
+
+
+@router.post("/chamado/lote/{job_id}/reprocessar-falhas", response_class=RespostaJSON)
+async def reprocessar_falhas_lote(request: Request, job_id: str):
+    """
+    Reenvia apenas as linhas de um lote cujo envio à API falhou
+    """
+    return await _retomar_lote(request, job_id, somente_falhas=True)
+
+
+@router.get("/chamado/lote/{job_id}/eventos")
+async def eventos_lote(request: Request, job_id: str):
+    """
+    Stream (Server-Sent Events) com o progresso de um lote em processamento
+    """
+    user = request.session.get('user')
+    if not user:
+        return RespostaJSON(
+            status_code=401,
+            content={"erro": "Usuário não autenticado"}
+        )
+    
+    job = gerenciador_jobs.obter(job_id, usuario=user.get('email'))
+    if not job:
+        return RespostaJSON(
+            status_code=404,
+            content={"erro": "Lote não encontrado"}
+        )
+    
+    async def gerar_eventos():
+        while True:
+            if await request.is_disconnected():
+                break
+            evento = 'fim' if job.finalizado else 'progresso'
+            dados = job.para_dict()
+            dados['circuito_api'] = disjuntor_chamados.para_dict()
+            yield f"event: {evento}\ndata: {serializar_json(dados).decode()}\n\n"
+            if job.finalizado:
+                break
+            await job.aguardar_atualizacao(timeout=15)
+            # Agrupar atualizações próximas em um único evento
+            await asyncio.sleep(0.25)
+    
+    return StreamingResponse(
+        gerar_eventos(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.post("/chamado/carregar-planilha", response_class=RespostaJSON)
+async def carregar_planilha(request: Request, planilha: UploadFile = File(...)):
+    """
+    Carrega a planilha e guarda o dataset da sessão imediatamente após o upload.
+    O dataset_id retornado pode ser enviado no formulário no lugar do arquivo.
+    """
+    user = request.session.get('user')
+    if not user:
+        return RespostaJSON(
+            status_code=401,
+            content={"erro": "Usuário não autenticado", "sucesso": False}
         )
     
     try:
-        # Salvar arquivo temporário
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.xlsx') as tmp_file:
-            content = await planilha.read()
-            tmp_file.write(content)
-            tmp_path = tmp_file.name
-        
+        # Processar a planilha (ou reutilizar o dataset já processado) e associá-la à sessão
         try:
-            # Processar planilha e criar temp.txt
-            planilha_obj = Planilha(tmp_path)
-            planilha_obj.carregar_planilha()  # Isso já cria o temp.txt vazio
-            linhas_processadas = planilha_obj.criar_base_chamados()  # Isso preenche o temp.txt
-            
-            # Limpar arquivo temporário da planilha (mas manter temp.txt)
-            os.unlink(tmp_path)
-            
-            if not linhas_processadas:
-                return JSONResponse(
-                    status_code=400,
-                    content={
-                        "erro": "Erro ao processar planilha. Verifique o formato do arquivo.",
-                        "sucesso": False
-                    }
-                )
-            
-            return JSONResponse(
-                content={
-                    "sucesso": True,
-                    "mensagem": f"Planilha carregada com sucesso! {linhas_processadas} linha(s) processada(s).",
-                    "linhas_processadas": linhas_processadas
-                }
-            )
-            
-        except Exception as e:
-            logger.error(f"Erro ao processar planilha: {str(e)}")
-            if os.path.exists(tmp_path):
-                os.unlink(tmp_path)
-            return JSONResponse(
-                status_code=500,
-                content={
-                    "erro": f"Erro ao processar planilha: {str(e)}",
-                    "sucesso": False
-                }
+            dados, segundos_processamento, em_cache = await processar_upload_planilha(request, planilha)
+        except UploadInvalido as e:
+            return RespostaJSON(
+                status_code=e.status_code,
+                content={"erro": str(e), "sucesso": False}
             )
+        
+        return RespostaJSON(
+            content={
+                "sucesso": True,
+                "mensagem": f"Planilha carregada com sucesso! {len(dados)} linha(s) processada(s).",
+                "dataset_id": dados.sha256,
+                "linhas_processadas": len(dados),
+                "segundos_processamento": round(segundos_processamento, 3),
+                "em_cache": em_cache
+            }
+        )
             
     except Exception as e:
         logger.error(f"Erro ao carregar planilha: {str(e)}")
-        return JSONResponse(
+        return RespostaJSON(
             status_code=500,
             content={
                 "erro": f"Erro ao carregar planilha: {str(e)}",
@@ -370,89 +590,90 @@ async def carregar_planilha(request: Request, planilha: UploadFile = File(...)):
         )
 
 
+# Máximo de linhas renderizadas por página de prévia
+MAX_LINHAS_PREVIEW = 100
+
+
 class PreviewRequest(BaseModel):
     """Modelo para requisição de prévia"""
     titulo: str
     descricao: str
     qtd_chamados: int = 5
     ignorar_primeira_linha: bool = True
+    # Paginação sobre as qtd_chamados linhas que serão enviadas; sem limit, usa qtd_chamados
+    offset: int = 0
+    limit: Optional[int] = None
 
 
-@router.post("/chamado/preview", response_class=JSONResponse)
+@router.post("/chamado/preview", response_class=RespostaJSON)
 async def preview_chamados(request: Request, preview_data: PreviewRequest):
     """
-    Gera prévia dos chamados com placeholders substituídos
+    Gera prévia dos chamados com placeholders substituídos, uma página por vez
+    (offset/limit) sobre o dataset em cache da sessão
     """
     user = request.session.get('user')
     if not user:
-        return JSONResponse(
+        return RespostaJSON(
             status_code=401,
             content={"erro": "Usuário não autenticado"}
         )
     
     email = user.get('email')
     if not email:
-        return JSONResponse(
+        return RespostaJSON(
             status_code=401,
             content={"erro": "Email não encontrado na sessão"}
         )
     
     try:
-        # Verificar se temp.txt existe
-        if not os.path.exists(PATH_TO_TEMP):
-            return JSONResponse(
+        # Obter o dataset da planilha carregada nesta sessão
+        dados = obter_dataset_sessao(request)
+        if dados is None:
+            return RespostaJSON(
                 status_code=400,
                 content={
-                    "erro": "Arquivo temp.txt não encontrado. Faça upload da planilha primeiro.",
+                    "erro": "Nenhuma planilha carregada. Faça upload da planilha primeiro.",
                     "preview": []
                 }
             )
         
-        # Usar o módulo AbrirChamados para processar
-        abrir_chamados = AbrirChamados(email)
-        
-        if not abrir_chamados.carregar_dados_temp():
-            return JSONResponse(
+        if not len(dados):
+            return RespostaJSON(
                 status_code=400,
                 content={
-                    "erro": "Erro ao carregar dados do temp.txt",
+                    "erro": "Nenhuma linha válida encontrada na planilha",
                     "preview": []
                 }
             )
         
-        # Obter seções disponíveis
-        secoes = sorted(
-            [int(s) for s in abrir_chamados.config_planilha.sections() if s.isdigit()],
-            key=int
-        )
-        
-        if not secoes:
-            return JSONResponse(
-                status_code=400,
-                content={
-                    "erro": "Nenhuma linha válida encontrada no temp.txt",
-                    "preview": []
-                }
-            )
+        # Templates compilados são reaproveitados entre prévias (ver obter_template)
+        abrir_chamados = AbrirChamados(email, dados)
+        colunas_ausentes = list(dict.fromkeys(
+            abrir_chamados.compilar_template(preview_data.titulo).colunas_ausentes(dados)
+            + abrir_chamados.compilar_template(preview_data.descricao).colunas_ausentes(dados)
+        ))
         
-        # Se ignorar_primeira_linha for True, remover a primeira seção (cabeçalho)
-        if preview_data.ignorar_primeira_linha and secoes:
-            primeira_secao = min(secoes)
-            secoes = [s for s in secoes if s != primeira_secao]
+        # Linhas já estão em ordem crescente: o cabeçalho é a primeira e a
+        # página é um recorte direto da lista, sem copiar/filtrar o dataset
+        primeira = 1 if preview_data.ignorar_primeira_linha else 0
+        linhas_planilha = len(dados.linhas) - primeira
+        # Mesmo limite do envio (abrir_chamados_sequencia): só as primeiras qtd_chamados linhas
+        total_linhas = min(linhas_planilha, max(preview_data.qtd_chamados, 0))
         
-        # Limitar quantidade
-        qtd = min(preview_data.qtd_chamados, len(secoes))
-        secoes_processar = secoes[:qtd]
+        offset = max(preview_data.offset, 0)
+        limit = preview_data.limit if preview_data.limit is not None else preview_data.qtd_chamados
+        limit = min(max(limit, 0), MAX_LINHAS_PREVIEW)
+        fim = min(offset + limit, total_linhas)
+        secoes_processar = dados.linhas[primeira + offset:primeira + fim] if offset < fim else []
         
         preview_items = []
         
         # Processar cada linha
         for numero_linha in secoes_processar:
-            linha_str = str(numero_linha)
             resultado = abrir_chamados.processar_chamado(
                 preview_data.titulo,
                 preview_data.descricao,
-                linha_str
+                numero_linha
             )
             
             if 'erro' in resultado:
@@ -470,17 +691,23 @@ async def preview_chamados(request: Request, preview_data: PreviewRequest):
                     'erro': None
                 })
         
-        return JSONResponse(
+        proximo_offset = offset + len(secoes_processar)
+        return RespostaJSON(
             content={
                 "sucesso": True,
-                "total_linhas": len(secoes),
+                "total_linhas": total_linhas,
+                "linhas_planilha": linhas_planilha,
+                "offset": offset,
+                "limit": limit,
+                "proximo_offset": proximo_offset if proximo_offset < total_linhas else None,
+                "colunas_ausentes": colunas_ausentes,
                 "preview": preview_items
             }
         )
         
     except Exception as e:
         logger.error(f"Erro ao gerar prévia: {str(e)}")
-        return JSONResponse(
+        return RespostaJSON(
             status_code=500,
             content={
                 "erro": f"Erro ao gerar prévia: {str(e)}",
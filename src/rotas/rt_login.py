@@ -1,14 +1,17 @@
 from fastapi import APIRouter, Request, HTTPException
 from fastapi.responses import RedirectResponse, HTMLResponse
-from fastapi.templating import Jinja2Templates
-import requests
+import httpx
 import urllib.parse
 import json
 from src.modulos.logger import logger
+from src.modulos.paginas import templates
 from src.classes.tipos import ConfigEnvSetings
+from src.modulos.http_client import obter_cliente_http
+from src.modulos.funcionarios import cache_funcionarios
+from src.modulos.metricas import api_externa_duracao
+from src.modulos.token_google import ChavesIndisponiveis, TokenInvalido, verificar_id_token
 
 router = APIRouter()
-templates = Jinja2Templates(directory="src/templates")
 
 valid_domains = ['uisa.com.br']
 
@@ -83,8 +86,11 @@ async def google_callback(request: Request):
     }
     
     try:
-        response = requests.post(GOOGLE_TOKEN_URI, data=token_data)
-        response.raise_for_status()
+        cliente = obter_cliente_http()
+        with api_externa_duracao.cronometrar(api='google_token', resultado='erro') as rotulos:
+            response = await cliente.post(GOOGLE_TOKEN_URI, data=token_data)
+            response.raise_for_status()
+            rotulos['resultado'] = 'sucesso'
         token_info = response.json()
         
         if 'access_token' not in token_info:
@@ -94,11 +100,28 @@ async def google_callback(request: Request):
                 {"request": request, "error": "Falha na autenticação com Google"}
             )
         
-        # Obter informações do usuário
-        headers = {'Authorization': f"Bearer {token_info['access_token']}"}
-        user_response = requests.get('https://www.googleapis.com/oauth2/v2/userinfo', headers=headers)
-        user_response.raise_for_status()
-        user_data = user_response.json()
+        # Obter informações do usuário: validando o id_token localmente (chaves
+        # de assinatura em cache) ou, se não for possível, pelo endpoint userinfo
+        user_data = None
+        if token_info.get('id_token'):
+            try:
+                user_data = await verificar_id_token(token_info['id_token'], GOOGLE_CLIENT_ID)
+            except TokenInvalido as e:
+                logger.warning(f"Falha na autenticação: id_token recusado ({e})")
+                return templates.TemplateResponse(
+                    "login.html", 
+                    {"request": request, "error": "Falha na autenticação com Google"}
+                )
+            except ChavesIndisponiveis as e:
+                logger.warning(f"Chaves do Google indisponíveis ({e}); consultando userinfo", extra={'amostragem': 'chaves_google'})
+        
+        if user_data is None:
+            headers = {'Authorization': f"Bearer {token_info['access_token']}"}
+            with api_externa_duracao.cronometrar(api='google_userinfo', resultado='erro') as rotulos:
+                user_response = await cliente.get(ConfigEnvSetings.GOOGLE_USERINFO_URI, headers=headers)
+                user_response.raise_for_status()
+                rotulos['resultado'] = 'sucesso'
+            user_data = user_response.json()
         
         # Verificar domínio
         domain_user = user_data['email'].split('@')[-1]
@@ -116,10 +139,13 @@ async def google_callback(request: Request):
             'picture': user_data.get('picture', '')
         }
         
+        # Garantir dados de funcionário atualizados a cada novo login
+        cache_funcionarios.invalidar(user_data['email'])
+        
         logger.info(f"Usuário Google autenticado: {user_data['email']}")
         return RedirectResponse(url="/chamado", status_code=303)
         
-    except requests.RequestException as e:
+    except httpx.HTTPError as e:
         logger.error(f"Erro na autenticação Google: {str(e)}")
         return templates.TemplateResponse(
             "login.html", 
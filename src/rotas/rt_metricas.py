@@ -0,0 +1,16 @@
+from fastapi import APIRouter, Security
+from fastapi.responses import PlainTextResponse
+from src.auth.auth_api import Auth_API_KEY
+from src.modulos.metricas import registro_metricas
+
+# Autenticada pelo cabeçalho API_NAME, como as rotas de integração
+router = APIRouter(dependencies=[Security(Auth_API_KEY)])
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metricas():
+    """Métricas da aplicação no formato texto do Prometheus"""
+    return PlainTextResponse(
+        registro_metricas.exportar(),
+        media_type="text/plain; version=0.0.4"
+    )
@@ -2,6 +2,7 @@
 
 document.addEventListener('DOMContentLoaded', function() {
     const planilhaInput = document.getElementById('planilha');
+    const datasetIdInput = document.getElementById('dataset_id');
     const statusDiv = document.getElementById('status');
     const qtdGroup = document.getElementById('quantidade-group');
     const ignorarCabecalhoGroup = document.getElementById('ignorar-cabecalho-group');
@@ -26,6 +27,7 @@ document.addEventListener('DOMContentLoaded', function() {
                 statusDiv.style.background = 'var(--bg-section)';
                 statusDiv.style.border = '1px solid var(--border-primary)';
                 planilhaInput.disabled = true;
+                datasetIdInput.value = '';
                 
                 try {
                     // Criar FormData para enviar o arquivo
@@ -41,6 +43,8 @@ document.addEventListener('DOMContentLoaded', function() {
                     const data = await response.json();
                     
                     if (data.sucesso) {
+                        // Sucesso: o formulário passa a referenciar o dataset já processado
+                        datasetIdInput.value = data.dataset_id || '';
                         // Sucesso: mostrar mensagem de confirmação
                         statusDiv.textContent = '✓ ' + (data.mensagem || 'Arquivo selecionado: ' + file.name);
                         statusDiv.style.color = 'var(--success-text)';
@@ -76,6 +80,7 @@ document.addEventListener('DOMContentLoaded', function() {
                     planilhaInput.disabled = false;
                 }
             } else {
+                datasetIdInput.value = '';
                 statusDiv.textContent = '';
                 statusDiv.style.display = 'none';
                 qtdGroup.style.display = 'none';
@@ -87,6 +92,77 @@ document.addEventListener('DOMContentLoaded', function() {
 
     // Abrir modal de prévia
     if (btnPreview) {
+        // Requisição da prévia atual (repetida com novo offset em "Carregar mais")
+        let previewAtual = null;
+
+        function renderizarItemPreview(item) {
+            let html = `<div style="margin-bottom: 20px; padding: 16px; background: var(--bg-section); border-radius: var(--border-radius); border: 1px solid var(--border-primary);">`;
+            html += `<div style="display: flex; align-items: center; gap: 8px; margin-bottom: 12px;">`;
+            html += `<span style="color: var(--text-muted); font-size: 13px; font-weight: 600;">Linha ${item.linha}:</span>`;
+            if (item.erro) {
+                html += `<span style="color: var(--error-text); font-size: 13px;">⚠️ ${item.erro}</span>`;
+            } else {
+                html += `<span style="color: var(--success-text); font-size: 13px;">✓ Processado</span>`;
+            }
+            html += `</div>`;
+            html += `<div style="margin-bottom: 8px;">`;
+            html += `<strong style="color: var(--text-primary); font-size: 14px; display: block; margin-bottom: 4px;">Título:</strong>`;
+            html += `<div style="color: var(--text-secondary); padding: 10px; background: var(--bg-input); border-radius: var(--border-radius); border: 1px solid var(--border-primary);">${escapeHtml(item.titulo || '(vazio)')}</div>`;
+            html += `</div>`;
+            html += `<div>`;
+            html += `<strong style="color: var(--text-primary); font-size: 14px; display: block; margin-bottom: 4px;">Descrição:</strong>`;
+            html += `<div style="color: var(--text-secondary); padding: 10px; background: var(--bg-input); border-radius: var(--border-radius); border: 1px solid var(--border-primary); white-space: pre-wrap;">${escapeHtml(item.descricao || '(vazio)')}</div>`;
+            html += `</div>`;
+            html += `</div>`;
+            return html;
+        }
+
+        async function buscarPaginaPreview(offset) {
+            const response = await fetch('/chamado/preview', {
+                method: 'POST',
+                headers: {
+                    'Content-Type': 'application/json',
+                },
+                body: JSON.stringify(Object.assign({}, previewAtual, { offset: offset }))
+            });
+            const data = await response.json();
+            if (!response.ok || data.erro) {
+                throw new Error(data.erro || 'Erro ao gerar prévia');
+            }
+            return data;
+        }
+
+        function atualizarBotaoCarregarMais(proximoOffset) {
+            let botao = document.getElementById('btn-preview-mais');
+            if (proximoOffset === null || proximoOffset === undefined) {
+                if (botao) botao.remove();
+                return;
+            }
+            if (!botao) {
+                botao = document.createElement('button');
+                botao.type = 'button';
+                botao.id = 'btn-preview-mais';
+                botao.className = 'btn btn-secondary';
+                botao.textContent = 'Carregar mais';
+                botao.addEventListener('click', async function() {
+                    botao.disabled = true;
+                    try {
+                        const data = await buscarPaginaPreview(parseInt(botao.dataset.offset));
+                        const lista = document.getElementById('preview-itens');
+                        lista.insertAdjacentHTML('beforeend', (data.preview || []).map(renderizarItemPreview).join(''));
+                        atualizarBotaoCarregarMais(data.proximo_offset);
+                    } catch (error) {
+                        modalError.textContent = 'Erro ao carregar prévia: ' + error.message;
+                        modalError.style.display = 'block';
+                    } finally {
+                        botao.disabled = false;
+                    }
+                });
+                modalPreviewContent.appendChild(botao);
+            }
+            botao.dataset.offset = proximoOffset;
+        }
+
         btnPreview.addEventListener('click', async function() {
             const titulo = document.getElementById('ds_titulo').value;
             const descricao = document.getElementById('ds_chamado').value;
@@ -104,66 +180,44 @@ document.addEventListener('DOMContentLoaded', function() {
             modalError.style.display = 'none';
             modalPreviewContent.style.display = 'none';
 
-            try {
-                const response = await fetch('/chamado/preview', {
-                    method: 'POST',
-                    headers: {
-                        'Content-Type': 'application/json',
-                    },
-                    body: JSON.stringify({
-                        titulo: titulo,
-                        descricao: descricao,
-                        qtd_chamados: qtdChamados,
-                        ignorar_primeira_linha: ignorarPrimeiraLinha
-                    })
-                });
+            previewAtual = {
+                titulo: titulo,
+                descricao: descricao,
+                qtd_chamados: qtdChamados,
+                ignorar_primeira_linha: ignorarPrimeiraLinha,
+                limit: Math.min(qtdChamados, 20)
+            };
 
-                const data = await response.json();
+            try {
+                const data = await buscarPaginaPreview(0);
 
                 modalLoading.style.display = 'none';
 
-                if (!response.ok || data.erro) {
-                    modalError.textContent = data.erro || 'Erro ao gerar prévia';
-                    modalError.style.display = 'block';
-                    return;
-                }
-
                 // Exibir prévia
                 let html = '';
                 if (data.total_linhas) {
                     html += `<div style="margin-bottom: 16px; padding: 12px; background: var(--bg-section); border-radius: var(--border-radius); border: 1px solid var(--border-primary);">
-                        <strong style="color: var(--text-primary);">Total de linhas disponíveis:</strong> 
-                        <span style="color: var(--text-secondary);">${data.total_linhas}</span>
+                        <strong style="color: var(--text-primary);">Chamados a criar:</strong> 
+                        <span style="color: var(--text-secondary);">${data.total_linhas} de ${data.linhas_planilha} linha(s) disponíveis</span>
+                    </div>`;
+                }
+
+                if (data.colunas_ausentes && data.colunas_ausentes.length > 0) {
+                    const colunas = data.colunas_ausentes.map(function(c) { return '<' + c + '>'; }).join(', ');
+                    html += `<div style="margin-bottom: 16px; padding: 12px; background: var(--error-bg); color: var(--error-text); border-radius: var(--border-radius); border: 1px solid var(--error-border);">
+                        ⚠️ Coluna(s) não encontrada(s) na planilha: ${escapeHtml(colunas)}
                     </div>`;
                 }
 
                 if (data.preview && data.preview.length > 0) {
-                    data.preview.forEach(function(item) {
-                        html += `<div style="margin-bottom: 20px; padding: 16px; background: var(--bg-section); border-radius: var(--border-radius); border: 1px solid var(--border-primary);">`;
-                        html += `<div style="display: flex; align-items: center; gap: 8px; margin-bottom: 12px;">`;
-                        html += `<span style="color: var(--text-muted); font-size: 13px; font-weight: 600;">Linha ${item.linha}:</span>`;
-                        if (item.erro) {
-                            html += `<span style="color: var(--error-text); font-size: 13px;">⚠️ ${item.erro}</span>`;
-                        } else {
-                            html += `<span style="color: var(--success-text); font-size: 13px;">✓ Processado</span>`;
-                        }
-                        html += `</div>`;
-                        html += `<div style="margin-bottom: 8px;">`;
-                        html += `<strong style="color: var(--text-primary); font-size: 14px; display: block; margin-bottom: 4px;">Título:</strong>`;
-                        html += `<div style="color: var(--text-secondary); padding: 10px; background: var(--bg-input); border-radius: var(--border-radius); border: 1px solid var(--border-primary);">${escapeHtml(item.titulo || '(vazio)')}</div>`;
-                        html += `</div>`;
-                        html += `<div>`;
-                        html += `<strong style="color: var(--text-primary); font-size: 14px; display: block; margin-bottom: 4px;">Descrição:</strong>`;
-                        html += `<div style="color: var(--text-secondary); padding: 10px; background: var(--bg-input); border-radius: var(--border-radius); border: 1px solid var(--border-primary); white-space: pre-wrap;">${escapeHtml(item.descricao || '(vazio)')}</div>`;
-                        html += `</div>`;
-                        html += `</div>`;
-                    });
+                    html += `<div id="preview-itens">${data.preview.map(renderizarItemPreview).join('')}</div>`;
                 } else {
                     html += `<div style="text-align: center; padding: 40px; color: var(--text-muted);">Nenhuma prévia disponível</div>`;
                 }
 
                 modalPreviewContent.innerHTML = html;
                 modalPreviewContent.style.display = 'block';
+                atualizarBotaoCarregarMais(data.preview && data.preview.length > 0 ? data.proximo_offset : null);
             } catch (error) {
                 modalLoading.style.display = 'none';
                 modalError.textContent = 'Erro ao carregar prévia: ' + error.message;
@@ -195,6 +249,26 @@ document.addEventListener('DOMContentLoaded', function() {
         }
     });
 
+    // Acompanhar progresso do lote em segundo plano (Server-Sent Events)
+    const loteProgresso = document.getElementById('lote-progresso');
+    if (loteProgresso) {
+        acompanharLote(loteProgresso.dataset.jobId);
+    }
+
+    // Retomar lotes interrompidos
+    document.querySelectorAll('.btn-retomar-lote').forEach(function(botao) {
+        botao.addEventListener('click', function() {
+            botao.disabled = true;
+            retomarLote(botao.dataset.jobId, botao.dataset.acao).then(function(ok) {
+                if (ok) {
+                    botao.closest('.lote-interrompido').remove();
+                } else {
+                    botao.disabled = false;
+                }
+            });
+        });
+    });
+
     // Validação do formulário
     if (formChamado) {
         formChamado.addEventListener('submit', function(e) {
@@ -206,10 +280,135 @@ document.addEventListener('DOMContentLoaded', function() {
                 alert('Por favor, preencha o título e a descrição do chamado.');
                 return false;
             }
+
+            // Planilha já processada: enviar apenas o ID do dataset, sem reenviar o arquivo
+            if (planilhaInput && datasetIdInput && datasetIdInput.value) {
+                planilhaInput.disabled = true;
+            }
         });
     }
 });
 
+// Acompanha o progresso de um lote, criando o painel de progresso se necessário
+function acompanharLote(jobId) {
+    let container = document.getElementById('lote-progresso');
+    if (!container) {
+        container = document.createElement('div');
+        container.id = 'lote-progresso';
+        container.className = 'lote-progresso';
+        container.innerHTML =
+            '<div class="lote-progresso-barra">' +
+            '<div id="lote-progresso-preenchimento" class="lote-progresso-preenchimento"></div>' +
+            '</div>' +
+            '<div id="lote-progresso-texto" class="lote-progresso-texto">Aguardando início do processamento...</div>';
+        const formChamado = document.getElementById('formChamado');
+        formChamado.parentNode.insertBefore(container, formChamado);
+    }
+    container.dataset.jobId = jobId;
+    container.classList.remove('concluido', 'erro');
+    const acoes = container.querySelector('.lote-progresso-acoes');
+    if (acoes) {
+        acoes.remove();
+    }
+
+    if (!window.EventSource) {
+        return;
+    }
+    const fonteEventos = new EventSource('/chamado/lote/' + encodeURIComponent(jobId) + '/eventos');
+
+    fonteEventos.addEventListener('progresso', function(e) {
+        atualizarProgressoLote(container, JSON.parse(e.data));
+    });
+
+    fonteEventos.addEventListener('fim', function(e) {
+        const data = JSON.parse(e.data);
+        atualizarProgressoLote(container, data);
+        fonteEventos.close();
+        if (data.status === 'concluido' && data.erros > 0) {
+            adicionarAcaoLote(container, jobId, 'reprocessar-falhas', 'Reprocessar falhas');
+        } else if (data.status === 'erro' && data.processados < data.total) {
+            adicionarAcaoLote(container, jobId, 'retomar', 'Retomar');
+        }
+    });
+}
+
+// Adiciona ao painel de progresso um botão para retomar/reprocessar o lote
+function adicionarAcaoLote(container, jobId, acao, rotulo) {
+    const acoes = document.createElement('div');
+    acoes.className = 'lote-progresso-acoes';
+    const botao = document.createElement('button');
+    botao.type = 'button';
+    botao.className = 'btn-secondary';
+    botao.textContent = rotulo;
+    botao.addEventListener('click', function() {
+        botao.disabled = true;
+        retomarLote(jobId, acao).then(function(ok) {
+            botao.disabled = ok;
+        });
+    });
+    acoes.appendChild(botao);
+    container.appendChild(acoes);
+}
+
+// Retoma um lote (acao: 'retomar' ou 'reprocessar-falhas') e acompanha o novo processamento
+async function retomarLote(jobId, acao) {
+    try {
+        const response = await fetch('/chamado/lote/' + encodeURIComponent(jobId) + '/' + acao, {
+            method: 'POST'
+        });
+        const data = await response.json();
+        if (!response.ok || !data.sucesso) {
+            alert(data.erro || 'Erro ao retomar o lote.');
+            return false;
+        }
+        acompanharLote(data.job_id);
+        return true;
+    } catch (error) {
+        alert('Erro ao retomar o lote: ' + error.message);
+        return false;
+    }
+}
+
+// Atualiza a barra e o texto de progresso do lote
+function atualizarProgressoLote(container, data) {
+    const preenchimento = document.getElementById('lote-progresso-preenchimento');
+    const texto = document.getElementById('lote-progresso-texto');
+    const percentual = data.total ? Math.round((data.processados / data.total) * 100) : 0;
+
+    preenchimento.style.width = (data.status === 'concluido' ? 100 : percentual) + '%';
+
+    if (data.status === 'concluido' || data.status === 'erro') {
+        container.classList.add(data.status);
+        texto.textContent = data.mensagem;
+        return;
+    }
+
+    let mensagem = `${data.processados} de ${data.total || '?'} linha(s) processada(s) - ` +
+        `${data.sucessos} sucesso(s), ${data.erros} erro(s)`;
+    if (data.duplicados) {
+        mensagem += `, ${data.duplicados} duplicado(s)`;
+    }
+    if (data.indeterminados) {
+        mensagem += `, ${data.indeterminados} sem confirmação`;
+    }
+    if (data.eta_segundos !== null && data.eta_segundos !== undefined) {
+        mensagem += ` - tempo restante estimado: ${formatarDuracao(data.eta_segundos)}`;
+    }
+    if (data.circuito_api && data.circuito_api.estado === 'aberto') {
+        mensagem += ` - API do Fluig indisponível, novas tentativas em ` +
+            `${formatarDuracao(data.circuito_api.segundos_para_nova_tentativa)}`;
+    }
+    texto.textContent = mensagem;
+}
+
+// Formata uma duração em segundos como "1min 05s"
+function formatarDuracao(segundos) {
+    const total = Math.max(0, Math.round(segundos));
+    const minutos = Math.floor(total / 60);
+    const resto = String(total % 60).padStart(2, '0');
+    return minutos > 0 ? `${minutos}min ${resto}s` : `${total}s`;
+}
+
 // Função auxiliar para escapar HTML e prevenir XSS
 function escapeHtml(text) {
     const map = {
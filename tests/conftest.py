@@ -0,0 +1,134 @@
+"""
+Configuração dos testes: variáveis de ambiente da aplicação (lidas na
+importação de `src`), banco local temporário e uma API de chamados simulada
+com httpx.MockTransport no lugar do cliente HTTP compartilhado.
+"""
+import os
+import sys
+import tempfile
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Configuração usada pelos testes (antes de qualquer import de `src`)
+os.environ.update(
+    API_ENDPOINT_CHAMADO='http://fluig.teste/chamado',
+    API_ENDPOINT_CHAMADO_LOTE='',
+    API_KEY='chave-teste',
+    API_NAME='X-API-Key',
+    BANCO_LOCAL_CAMINHO=os.path.join(tempfile.mkdtemp(prefix='testes_chamados_'), 'chamados.db'),
+    LOTE_REQUISICOES_POR_SEGUNDO='0',
+    LOTE_ENVIO_AGRUPADO_TAMANHO='50',
+    RETENTATIVA_MAX_TENTATIVAS='3',
+    RETENTATIVA_ATRASO_BASE='0',
+    RETENTATIVA_ATRASO_MAXIMO='1',
+    DISJUNTOR_LIMITE_FALHAS='5',
+    IDEMPOTENCIA_JANELA_SEGUNDOS='86400',
+    LOG_FORMATO='texto',
+)
+
+# Variáveis obrigatórias do ConfigEnv que os testes não utilizam
+for _variavel in (
+    'GOOGLE_CLIENT_ID', 'GOOGLE_CLIENT_PROJECT_ID', 'GOOGLE_AUTH_URI', 'GOOGLE_TOKEN_URI',
+    'GOOGLE_AUTH_PROVIDER_X509_CERT_URL', 'GOOGLE_REDIRECT_URIS', 'GOOGLE_CLIENT_SECRET',
+    'API_ENDPOINT_FUNCIONARIO',
+):
+    os.environ.setdefault(_variavel, 'teste')
+
+if RAIZ not in sys.path:
+    sys.path.insert(0, RAIZ)
+
+import json
+from typing import Callable, List, Optional
+import httpx
+import pytest
+from src.classes.tipos import ConfigEnvSetings
+from src.modulos import abrir_chamados, http_client
+from src.modulos.banco_local import banco_local
+from src.modulos.dataset import DadosPlanilha
+from src.modulos.resiliencia import Disjuntor, disjuntor_chamados
+
+EMAIL = 'usuario@uisa.com.br'
+
+
+class APISimulada:
+    """
+    API de chamados simulada: registra as requisições recebidas e responde com
+    o `responder` do teste (padrão: sucesso para qualquer chamado).
+    """
+
+    def __init__(self):
+        self.requisicoes: List[httpx.Request] = []
+        self.responder: Optional[Callable[[httpx.Request], object]] = None
+
+    async def _tratar(self, requisicao: httpx.Request) -> httpx.Response:
+        self.requisicoes.append(requisicao)
+        if self.responder is not None:
+            resposta = self.responder(requisicao)
+            # Respostas assíncronas (ex: aguardar um evento antes de responder)
+            if hasattr(resposta, '__await__'):
+                resposta = await resposta
+            return resposta
+        corpo = json.loads(requisicao.content)
+        if 'chamados' in corpo:
+            return httpx.Response(200, json={'resultados': [
+                {'sucesso': True, 'mensagem': 'ok', 'dados': {'id': indice}}
+                for indice, _ in enumerate(corpo['chamados'])
+            ]})
+        return httpx.Response(200, json={'id': len(self.requisicoes)})
+
+    def caminhos(self) -> List[str]:
+        return [requisicao.url.path for requisicao in self.requisicoes]
+
+    def titulos(self) -> List[str]:
+        """Títulos dos chamados enviados, na ordem (unitários e agrupados)."""
+        titulos = []
+        for requisicao in self.requisicoes:
+            corpo = json.loads(requisicao.content)
+            titulos.extend(chamado['Titulo'] for chamado in corpo.get('chamados', [corpo]))
+        return titulos
+
+
+@pytest.fixture
+def api():
+    """Substitui o cliente HTTP compartilhado por um ligado à API simulada."""
+    simulada = APISimulada()
+    anterior = http_client._cliente
+    http_client._cliente = httpx.AsyncClient(transport=httpx.MockTransport(simulada._tratar))
+    yield simulada
+    http_client._cliente = anterior
+
+
+@pytest.fixture
+def envio_agrupado(monkeypatch):
+    """Ativa o envio agrupado (endpoint /chamado/lote da API simulada)."""
+    monkeypatch.setattr(ConfigEnvSetings, 'API_ENDPOINT_CHAMADO_LOTE', 'http://fluig.teste/chamado/lote')
+
+
+@pytest.fixture(autouse=True)
+def estado_limpo():
+    """Disjuntor fechado, envio agrupado não recusado e banco local vazio em cada teste."""
+    novo = Disjuntor(disjuntor_chamados.nome, disjuntor_chamados.limite_falhas, disjuntor_chamados.tempo_recuperacao)
+    disjuntor_chamados.__dict__.update(novo.__dict__)
+    abrir_chamados._envio_agrupado_indisponivel.clear()
+    with banco_local() as conexao:
+        tabelas = [
+            linha['name']
+            for linha in conexao.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+        ]
+        for tabela in tabelas:
+            conexao.execute(f'DELETE FROM {tabela}')
+    yield
+
+
+def criar_dados(*valores: str) -> DadosPlanilha:
+    """Dataset com cabeçalho na linha 1 e um valor na coluna A por linha (a partir da 2)."""
+    dados = DadosPlanilha()
+    dados.adicionar_linha(1, {'A': 'Nome'})
+    for numero_linha, valor in enumerate(valores, start=2):
+        dados.adicionar_linha(numero_linha, {'A': valor})
+    return dados
+
+
+def timeout_leitura(requisicao: httpx.Request) -> httpx.Response:
+    """Resposta da API simulada: timeout de leitura (a requisição pode ter sido processada)."""
+    raise httpx.ReadTimeout('timeout', request=requisicao)
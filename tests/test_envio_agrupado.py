@@ -0,0 +1,91 @@
+import asyncio
+import httpx
+import pytest
+from conftest import EMAIL, criar_dados, timeout_leitura
+from src.modulos.abrir_chamados import MENSAGEM_INDETERMINADO, AbrirChamados
+
+TITULO = 'Chamado <A>'
+DESCRICAO = 'Descrição de <A>'
+
+
+def abrir(*valores: str, **kwargs) -> dict:
+    chamados = AbrirChamados(EMAIL, criar_dados(*valores))
+    return asyncio.run(chamados.abrir_chamados_sequencia(TITULO, DESCRICAO, len(valores), **kwargs))
+
+
+def status(resultado: dict) -> list:
+    return [detalhe['status'] for detalhe in resultado['detalhes']]
+
+
+def test_resultados_sao_associados_pela_posicao(api, envio_agrupado):
+    api.responder = lambda requisicao: httpx.Response(200, json={'resultados': [
+        {'sucesso': True, 'dados': {'id': 1}},
+        {'sucesso': False, 'mensagem': 'Usuário sem permissão'},
+        {'sucesso': True, 'dados': {'id': 3}},
+    ]})
+
+    resultado = abrir('a', 'b', 'c')
+
+    assert api.caminhos() == ['/chamado/lote']
+    assert api.titulos() == ['Chamado a', 'Chamado b', 'Chamado c']
+    assert status(resultado) == ['sucesso', 'erro', 'sucesso']
+    assert resultado['detalhes'][1]['mensagem'] == 'Usuário sem permissão'
+
+
+@pytest.mark.parametrize('corpo', [
+    [{'sucesso': True}, {'sucesso': True}],
+    'ok',
+    {'id': 10},
+    {'resultados': [{'sucesso': True}]},
+    {'resultados': {'sucesso': True}},
+], ids=['lista', 'texto', 'sem_resultados', 'quantidade_diferente', 'resultados_objeto'])
+def test_resposta_com_formato_inesperado_fica_indeterminada(api, envio_agrupado, corpo):
+    api.responder = lambda requisicao: httpx.Response(200, json=corpo)
+
+    resultado = abrir('a', 'b')
+
+    assert len(api.requisicoes) == 1
+    assert status(resultado) == ['indeterminado', 'indeterminado']
+    assert all(MENSAGEM_INDETERMINADO in detalhe['mensagem'] for detalhe in resultado['detalhes'])
+
+
+def test_resposta_sem_json_fica_indeterminada(api, envio_agrupado):
+    api.responder = lambda requisicao: httpx.Response(200, text='<html>ok</html>')
+
+    assert status(abrir('a', 'b')) == ['indeterminado', 'indeterminado']
+
+
+def test_resultado_sem_sucesso_fica_indeterminado(api, envio_agrupado):
+    api.responder = lambda requisicao: httpx.Response(200, json={'resultados': [
+        {'sucesso': True}, {'mensagem': 'processado'},
+    ]})
+
+    assert status(abrir('a', 'b')) == ['sucesso', 'indeterminado']
+
+
+def test_timeout_no_grupo_nao_reenvia(api, envio_agrupado):
+    api.responder = timeout_leitura
+
+    resultado = abrir('a', 'b', 'c')
+
+    assert len(api.requisicoes) == 1
+    assert status(resultado) == ['indeterminado'] * 3
+
+
+def test_endpoint_sem_suporte_usa_envio_unitario(api, envio_agrupado):
+    def responder(requisicao):
+        if requisicao.url.path == '/chamado/lote':
+            return httpx.Response(404)
+        return httpx.Response(200, json={'id': 1})
+
+    api.responder = responder
+
+    resultado = abrir('a', 'b', 'c')
+
+    assert status(resultado) == ['sucesso'] * 3
+    assert api.caminhos().count('/chamado/lote') == 1
+    assert api.caminhos().count('/chamado') == 3
+
+    # O endpoint recusado não é tentado de novo
+    assert status(abrir('d', 'e')) == ['sucesso'] * 2
+    assert api.caminhos().count('/chamado/lote') == 1
@@ -0,0 +1,129 @@
+import asyncio
+import httpx
+import pytest
+from conftest import EMAIL, criar_dados
+from src.modulos.abrir_chamados import AbrirChamados
+from src.modulos.registro_lotes import LOTE_CONCLUIDO, LOTE_INTERROMPIDO, registro_lotes
+
+TITULO = 'Chamado <A>'
+DESCRICAO = 'Descrição de <A>'
+
+
+def status(resultado: dict) -> list:
+    return [detalhe['status'] for detalhe in resultado['detalhes']]
+
+
+def test_lote_cancelado_e_retomado_envia_apenas_as_linhas_restantes(api):
+    valores = ('a', 'b', 'c', 'd', 'e')
+    liberar = None
+
+    async def responder(requisicao):
+        # Os dois primeiros chamados são criados; o terceiro fica preso até o cancelamento
+        if len(api.requisicoes) == 3:
+            await liberar.wait()
+        return httpx.Response(200, json={'id': len(api.requisicoes)})
+
+    async def executar():
+        nonlocal liberar
+        liberar = asyncio.Event()
+        chamados = AbrirChamados(EMAIL, criar_dados(*valores))
+        tarefa = asyncio.create_task(chamados.abrir_chamados_sequencia(
+            TITULO, DESCRICAO, len(valores), max_simultaneos=1, lote_id='lote-1'
+        ))
+        while len(api.requisicoes) < 3:
+            await asyncio.sleep(0.01)
+        tarefa.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await tarefa
+
+    api.responder = responder
+    asyncio.run(executar())
+
+    lote = registro_lotes.obter_lote('lote-1', EMAIL)
+    assert lote['status'] == LOTE_INTERROMPIDO
+    assert lote['sucessos'] == 2
+    assert lote['pendentes'] == 3
+
+    api.requisicoes.clear()
+    api.responder = None
+    resultado = asyncio.run(AbrirChamados(EMAIL).retomar_lote('lote-1'))
+
+    # O chamado em envio no cancelamento continua reservado pelo lote e é reenviado ao retomá-lo
+    assert api.titulos() == ['Chamado c', 'Chamado d', 'Chamado e']
+    assert status(resultado) == ['sucesso'] * 5
+    lote = registro_lotes.obter_lote('lote-1', EMAIL)
+    assert lote['status'] == LOTE_CONCLUIDO
+    assert lote['sucessos'] == 5
+
+
+def test_reprocessar_falhas_nao_reenvia_indeterminados(api):
+    def responder(requisicao):
+        if b'Chamado b' in requisicao.content:
+            return httpx.Response(400, json={'erro': 'inválido'})
+        if b'Chamado c' in requisicao.content:
+            return httpx.Response(502)
+        return httpx.Response(200, json={})
+
+    api.responder = responder
+    resultado = asyncio.run(AbrirChamados(EMAIL, criar_dados('a', 'b', 'c')).abrir_chamados_sequencia(
+        TITULO, DESCRICAO, 3, lote_id='lote-2'
+    ))
+    assert status(resultado) == ['sucesso', 'erro', 'indeterminado']
+
+    api.requisicoes.clear()
+    api.responder = None
+    resultado = asyncio.run(AbrirChamados(EMAIL).retomar_lote('lote-2', somente_falhas=True))
+
+    assert api.titulos() == ['Chamado b']
+    assert status(resultado) == ['sucesso', 'sucesso', 'indeterminado']
+    assert registro_lotes.obter_lote('lote-2', EMAIL)['indeterminados'] == 1
+
+
+def test_resubmissao_identica_nao_e_reenviada(api):
+    def abrir(*valores):
+        chamados = AbrirChamados(EMAIL, criar_dados(*valores))
+        return asyncio.run(chamados.abrir_chamados_sequencia(TITULO, DESCRICAO, len(valores)))
+
+    assert status(abrir('a', 'b')) == ['sucesso', 'sucesso']
+
+    resultado = abrir('a', 'b', 'c')
+
+    assert status(resultado) == ['duplicado', 'duplicado', 'sucesso']
+    assert 'já criado' in resultado['detalhes'][0]['mensagem']
+    assert api.titulos() == ['Chamado a', 'Chamado b', 'Chamado c']
+
+
+def test_chamado_com_erro_definitivo_pode_ser_reenviado(api):
+    def abrir():
+        chamados = AbrirChamados(EMAIL, criar_dados('a'))
+        return asyncio.run(chamados.abrir_chamados_sequencia(TITULO, DESCRICAO, 1))
+
+    api.responder = lambda requisicao: httpx.Response(400, json={'erro': 'inválido'})
+    assert status(abrir()) == ['erro']
+
+    api.responder = None
+    assert status(abrir()) == ['sucesso']
+    assert len(api.requisicoes) == 2
+
+
+def test_submissoes_simultaneas_criam_cada_chamado_uma_vez(api):
+    valores = ('a', 'b', 'c', 'd')
+
+    async def responder(requisicao):
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, json={})
+
+    async def executar():
+        return await asyncio.gather(*[
+            AbrirChamados(EMAIL, criar_dados(*valores)).abrir_chamados_sequencia(
+                TITULO, DESCRICAO, len(valores)
+            )
+            for _ in range(2)
+        ])
+
+    api.responder = responder
+    resultados = asyncio.run(executar())
+
+    assert sorted(api.titulos()) == [f'Chamado {valor}' for valor in valores]
+    assert sum(resultado['sucessos'] for resultado in resultados) == len(valores)
+    assert sum(resultado['duplicados'] for resultado in resultados) == len(valores)
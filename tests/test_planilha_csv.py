@@ -0,0 +1,82 @@
+import pytest
+from src.modulos.planilha import LeitorCsv, criar_leitor, processar_arquivo_planilha
+
+
+def gravar(tmp_path, nome: str, conteudo: bytes) -> str:
+    caminho = tmp_path / nome
+    caminho.write_bytes(conteudo)
+    return str(caminho)
+
+
+def ler(caminho: str):
+    dados, linhas, _ = processar_arquivo_planilha(caminho)
+    assert linhas == len(dados)
+    return dados
+
+
+def test_ponto_e_virgula_em_cp1252(tmp_path):
+    caminho = gravar(tmp_path, 'dados.csv', 'Nome;Descrição\nJoão;Manutenção\nJosé;Ação\n'.encode('cp1252'))
+
+    dados = ler(caminho)
+
+    assert dados.linhas == [1, 2, 3]
+    assert dados.obter_linha(2) == {'A': 'João', 'B': 'Manutenção'}
+    assert dados.valor(3, 'B') == 'Ação'
+
+
+def test_utf8_com_bom(tmp_path):
+    caminho = gravar(tmp_path, 'dados.csv', '﻿Nome,Setor\nAna,Manutenção\n'.encode('utf-8'))
+
+    leitor = LeitorCsv(caminho)
+    leitor.abrir()
+    try:
+        linhas = list(leitor.iterar_linhas())
+    finally:
+        leitor.fechar()
+
+    assert leitor.codificacao == 'utf-8-sig'
+    assert linhas == [(1, {'A': 'Nome', 'B': 'Setor'}), (2, {'A': 'Ana', 'B': 'Manutenção'})]
+
+
+def test_tsv_usa_tabulacao(tmp_path):
+    # Vírgulas nos valores não são tratadas como delimitador
+    caminho = gravar(tmp_path, 'dados.tsv', 'Nome\tEndereço\nAna\tRua A, 10\n'.encode('utf-8'))
+
+    assert ler(caminho).obter_linha(2) == {'A': 'Ana', 'B': 'Rua A, 10'}
+
+
+def test_quebra_de_linha_entre_aspas_e_um_registro(tmp_path):
+    caminho = gravar(tmp_path, 'dados.csv', 'Nome,Obs\nAna,"linha 1\nlinha 2"\nBia,ok\n'.encode('utf-8'))
+
+    dados = ler(caminho)
+
+    assert dados.linhas == [1, 2, 3]
+    assert dados.valor(2, 'B') == 'linha 1\nlinha 2'
+    assert dados.valor(3, 'A') == 'Bia'
+
+
+def test_linhas_vazias_e_celulas_vazias(tmp_path):
+    caminho = gravar(tmp_path, 'dados.csv', 'Nome,Setor,Ramal\n\nAna,,123\n,,\nBia,TI,\n'.encode('utf-8'))
+
+    dados = ler(caminho)
+
+    # Os números das linhas seguem o arquivo, como no Excel
+    assert dados.linhas == [1, 3, 5]
+    assert dados.obter_linha(3) == {'A': 'Ana', 'C': '123'}
+    assert dados.obter_linha(5) == {'A': 'Bia', 'B': 'TI'}
+
+
+def test_colunas_apos_z(tmp_path):
+    valores = [str(indice) for indice in range(28)]
+    caminho = gravar(tmp_path, 'dados.csv', (','.join(valores) + '\n').encode('utf-8'))
+
+    linha = ler(caminho).obter_linha(1)
+
+    assert linha['Z'] == '25'
+    assert linha['AA'] == '26'
+    assert linha['AB'] == '27'
+
+
+def test_extensao_nao_suportada(tmp_path):
+    with pytest.raises(ValueError):
+        criar_leitor(str(tmp_path / 'dados.txt'))
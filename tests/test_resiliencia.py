@@ -0,0 +1,150 @@
+import asyncio
+import httpx
+import pytest
+from conftest import EMAIL, timeout_leitura
+from src.modulos import resiliencia
+from src.modulos.abrir_chamados import AbrirChamados
+from src.modulos.resiliencia import (
+    CircuitoAberto, Disjuntor, PoliticaRetentativa, disjuntor_chamados, executar_com_resiliencia
+)
+
+
+@pytest.fixture
+def atrasos(monkeypatch):
+    """Atrasos entre tentativas pedidos por executar_com_resiliencia (sem esperar)."""
+    registrados = []
+
+    async def dormir(segundos):
+        registrados.append(segundos)
+
+    monkeypatch.setattr(resiliencia.asyncio, 'sleep', dormir)
+    return registrados
+
+
+def criar_chamado(titulo: str = 'Chamado') -> dict:
+    return asyncio.run(AbrirChamados(EMAIL).criar_chamado_api(titulo, 'Descrição', 2))
+
+
+def test_disjuntor_abre_apos_limite_e_libera_uma_chamada_de_teste(monkeypatch):
+    agora = [1000.0]
+    monkeypatch.setattr(resiliencia.time, 'monotonic', lambda: agora[0])
+    disjuntor = Disjuntor('teste', limite_falhas=2, tempo_recuperacao=30)
+
+    disjuntor.registrar_falha()
+    assert disjuntor.permitir()
+    disjuntor.registrar_falha()
+    assert disjuntor.estado == Disjuntor.ABERTO
+    assert not disjuntor.permitir()
+
+    agora[0] += 30
+    assert disjuntor.estado == Disjuntor.MEIO_ABERTO
+    assert disjuntor.permitir()
+    assert not disjuntor.permitir()
+
+    # Falha na chamada de teste: abre novamente; sucesso: fecha
+    disjuntor.registrar_falha()
+    assert disjuntor.estado == Disjuntor.ABERTO
+    agora[0] += 30
+    assert disjuntor.permitir()
+    disjuntor.registrar_sucesso()
+    assert disjuntor.estado == Disjuntor.FECHADO
+    assert disjuntor.falhas_consecutivas == 0
+
+
+def test_disjuntor_aberto_nao_chama_a_api(api):
+    for _ in range(disjuntor_chamados.limite_falhas):
+        disjuntor_chamados.registrar_falha()
+
+    resultado = criar_chamado()
+
+    assert not resultado['sucesso']
+    assert 'indisponível' in resultado['mensagem']
+    assert api.requisicoes == []
+
+
+def test_erro_4xx_nao_conta_como_falha_do_disjuntor(api):
+    api.responder = lambda requisicao: httpx.Response(400, json={'erro': 'inválido'})
+
+    for _ in range(disjuntor_chamados.limite_falhas + 1):
+        assert not criar_chamado()['sucesso']
+
+    assert disjuntor_chamados.estado == Disjuntor.FECHADO
+    assert disjuntor_chamados.falhas_consecutivas == 0
+    # 4xx não é repetido
+    assert len(api.requisicoes) == disjuntor_chamados.limite_falhas + 1
+
+
+def test_503_e_repetido_na_criacao_de_chamado(api, atrasos):
+    respostas = iter([httpx.Response(503), httpx.Response(503), httpx.Response(200, json={'id': 7})])
+    api.responder = lambda requisicao: next(respostas)
+
+    resultado = criar_chamado()
+
+    assert resultado['sucesso']
+    assert resultado['dados'] == {'id': 7}
+    assert len(api.requisicoes) == 3
+    assert len(atrasos) == 2
+    assert disjuntor_chamados.falhas_consecutivas == 0
+
+
+@pytest.mark.parametrize('resposta', [
+    lambda requisicao: httpx.Response(502),
+    timeout_leitura,
+], ids=['502', 'timeout_leitura'])
+def test_resultado_incerto_nao_e_repetido_e_fica_indeterminado(api, atrasos, resposta):
+    api.responder = resposta
+
+    resultado = criar_chamado()
+
+    assert not resultado['sucesso']
+    assert resultado['indeterminado']
+    assert len(api.requisicoes) == 1
+    assert atrasos == []
+
+
+def test_timeout_de_leitura_e_repetido_em_chamada_idempotente(atrasos):
+    tentativas = []
+
+    async def operacao():
+        tentativas.append(1)
+        if len(tentativas) < 3:
+            raise httpx.ReadTimeout('timeout')
+        return 'ok'
+
+    politica = PoliticaRetentativa(max_tentativas=3, atraso_base=0, atraso_maximo=1)
+    disjuntor = Disjuntor('teste', limite_falhas=5, tempo_recuperacao=30)
+
+    assert asyncio.run(executar_com_resiliencia(operacao, disjuntor, politica, idempotente=True)) == 'ok'
+    assert len(tentativas) == 3
+
+
+def test_retry_after_e_respeitado(api, atrasos):
+    respostas = iter([httpx.Response(429, headers={'Retry-After': '0.5'}), httpx.Response(200, json={})])
+    api.responder = lambda requisicao: next(respostas)
+
+    assert criar_chamado()['sucesso']
+    assert atrasos == [0.5]
+
+
+def test_retry_after_acima_do_maximo_nao_e_repetido(api, atrasos):
+    # RETENTATIVA_ATRASO_MAXIMO=1 nos testes (ver conftest)
+    api.responder = lambda requisicao: httpx.Response(503, headers={'Retry-After': '120'})
+
+    resultado = criar_chamado()
+
+    assert not resultado['sucesso']
+    assert not resultado.get('indeterminado')
+    assert len(api.requisicoes) == 1
+    assert atrasos == []
+
+
+def test_tentativas_esgotadas_abrem_o_disjuntor(api, atrasos):
+    api.responder = lambda requisicao: httpx.Response(503)
+
+    for _ in range(2):
+        assert not criar_chamado()['sucesso']
+    # 2 chamados x 3 tentativas; o disjuntor abre na 5ª falha e recusa a 6ª sem chamar a API
+    assert len(api.requisicoes) == disjuntor_chamados.limite_falhas
+    assert disjuntor_chamados.estado == Disjuntor.ABERTO
+    with pytest.raises(CircuitoAberto):
+        asyncio.run(executar_com_resiliencia(lambda: None, disjuntor_chamados))